@@ -1,3 +1,15 @@
-from icsv.base import Row, Col, Cell
+from icsv.base import Row, Rows, RowMapping, Col, ColumnView, Cell
+from icsv.cache import FileCache
+from icsv.follow import TailReader
+from icsv.groupBy import GroupBy
+from icsv.index import HashIndex, SortedIndex
 from icsv.instantCsv import icsv
+from icsv.join import joinFiles
+from icsv.mapped import MappedCsv
+from icsv.reader import Reader
+from icsv.schema import HeaderSchema
+from icsv.sort import sortFile
 from icsv.writer import Writer
+from icsv.asyncWriter import AsyncWriter
+from icsv.concurrentWriter import ConcurrentWriter
+from icsv.rotatingWriter import RotatingWriter
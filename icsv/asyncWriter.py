@@ -0,0 +1,231 @@
+from asyncio import Queue, get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+
+from icsv.schema import HeaderSchema
+from icsv.writer import Writer
+
+
+class AsyncWriter:
+    '''The AsyncWriter class provides an interface for writing a CSV file
+    from an asyncio event loop without blocking it.
+
+    Rows are placed on a bounded queue, and a background task writes them to
+    the file in batches from a separate thread. When the queue is full,
+    :func:`icsv.AsyncWriter.writeRow` waits until there is room, which slows
+    down producers rather than buffering an unlimited number of rows.
+
+    The AsyncWriter can be used as an asynchronous context manager::
+
+        async with AsyncWriter("/tmp/test.csv", headers) as writer:
+            await writer.writeRow([0, 1, 2])
+
+    '''
+
+    def __init__(self, filename, headers, delimiter=',', useHeaders=True,
+                 overwrite=True, maxQueueSize=10000, batchSize=1000):
+        '''
+        :param filename: The filename for the CSV file to write
+        :type filename: string
+        :param headers: The list of column headers for this CSV file
+        :type headers: list of string
+        :param delimiter: The CSV delimiter to use
+        :type delimiter: string
+        :param useHeaders: True will write the headers to the first line of the
+                           created CSV file, False will not
+        :type useHeaders: bool
+        :param overwrite: True will overwrite existing files, False will not
+        :type overwrite: bool
+        :param maxQueueSize: The maximum number of rows waiting to be written
+        :type maxQueueSize: int
+        :param batchSize: The maximum number of rows written at once
+        :type batchSize: int
+
+        :raises Exception: If ``overwrite`` is False, and the file already
+                           exists
+
+        '''
+        self.__writer = Writer(filename, headers, delimiter, useHeaders,
+                               overwrite, flushRows=None, keepRows=False)
+        self.__headerSchema = HeaderSchema(headers)
+        self.__batchSize = batchSize
+
+        self.__queue = Queue(maxQueueSize)
+
+        # All file operations happen in order on a single thread
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+
+        # The task writing queued rows is started by the first write
+        self.__task = None
+        self.__error = None
+        self.__closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.aclose()
+
+    def headers(self):
+        '''Get the list of headers for this CSV file.
+
+        :rtype: list of strings
+
+        '''
+        return self.__writer.headers()
+
+    def delimiter(self):
+        '''Get the delimiter used for this CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__writer.delimiter()
+
+    async def writeRow(self, items):
+        '''Queue a new row of data to be written to the CSV.
+
+        ``items`` can be a list of values, or a dictionary of values.
+
+        :param items: The list, or dictionary of row items
+
+        :raises Exception: If ``items`` is a list and is not equal to the
+                           number of headers
+        :raises Exception: If ``items`` is a dictionary and contains entries
+                           for unknown headers
+        :raises Exception: If ``items`` is not a list or a dictionary
+        :raises Exception: If the writer has been closed
+        :raises Exception: If writing previously queued rows failed
+
+        '''
+        self.__checkWritable()
+        self.__headerSchema.validate(items)
+        self.__start()
+
+        await self.__queue.put(items)
+
+    async def writeRows(self, rows):
+        '''Queue several rows of data to be written to the CSV.
+
+        ``rows`` can be any iterable of rows, where each row can be a list,
+        tuple, or dictionary of values. All rows are validated before any of
+        them are queued.
+
+        :param rows: The iterable of rows
+        :type rows: iterable of lists, tuples, or dictionaries
+
+        :raises Exception: If any of the rows are invalid
+        :raises Exception: If the writer has been closed
+        :raises Exception: If writing previously queued rows failed
+
+        '''
+        self.__checkWritable()
+
+        rows = list(rows)
+        for items in rows:
+            self.__headerSchema.validate(items)
+        self.__start()
+
+        for items in rows:
+            await self.__queue.put(items)
+
+    async def flush(self):
+        '''Wait until all queued rows have been written, and flush them to
+        the CSV file.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        await self.__queue.join()
+        await self.__run(self.__writer.flush)
+        self.__raiseError()
+
+    async def aclose(self):
+        '''Write all queued rows and close the CSV file.
+
+        No more rows can be written once the writer has been closed.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        if self.__closed:
+            return
+
+        try:
+            await self.__queue.join()
+        finally:
+            self.__closed = True
+
+            if self.__task is not None:
+                self.__task.cancel()
+                self.__task = None
+
+            await self.__run(self.__writer.close)
+            self.__executor.shutdown()
+
+        self.__raiseError()
+
+    def closed(self):
+        '''Determine if this writer has been closed.
+
+        :rtype: bool
+
+        '''
+        return self.__closed
+
+    ##### Private functions
+
+    def __start(self):
+        '''Start the task which writes queued rows, if it is not running.'''
+        if self.__task is None:
+            self.__task = get_running_loop().create_task(self.__drain())
+
+    async def __drain(self):
+        '''Write batches of queued rows until the writer is closed.'''
+        queue = self.__queue
+
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.__batchSize and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                await self.__run(self.__writer.writeRows, batch)
+            except Exception as error:
+                self.__error = error
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def __run(self, fn, *args):
+        '''Run a function on the file thread.
+
+        :param fn: The function
+        :type fn: function
+
+        '''
+        return await get_running_loop().run_in_executor(self.__executor,
+                                                        fn, *args)
+
+    def __checkWritable(self):
+        '''Make sure that rows can be written.
+
+        :raises Exception: If the writer has been closed
+        :raises Exception: If writing previously queued rows failed
+
+        '''
+        if self.__closed:
+            raise Exception("Cannot write to closed file: %s" %
+                            self.__writer.filename())
+
+        self.__raiseError()
+
+    def __raiseError(self):
+        '''Raise the error that occurred while writing queued rows, if any.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        error = self.__error
+        if error is not None:
+            self.__error = None
+            raise error
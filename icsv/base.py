@@ -1,4 +1,6 @@
-from copy import deepcopy
+from collections.abc import Mapping, Sequence
+
+from icsv.schema import HeaderSchema
 
 
 class Cell:
@@ -7,6 +9,8 @@ class Cell:
 
     '''
 
+    __slots__ = ("__row", "__header", "__value")
+
     def __init__(self, row, header, value):
         '''
         :param row: The row index where this cell is located
@@ -47,18 +51,28 @@ class Row:
 
     '''
 
-    def __init__(self, headers, dataMap, delimiter=','):
+    __slots__ = ("__schema", "__values", "__delimiter")
+
+    def __init__(self, headers, data, delimiter=','):
         '''
-        :param headers: The list of column headers
+        :param headers: The list of column headers, or the
+                        :class:`icsv.HeaderSchema` shared by all rows
         :type headers: list of strings
-        :param dataMap: A dictionary mapping headers to corresponding values
-        :type dataMap: dict
+        :param data: The list of values in order of the headers, or a
+                     dictionary mapping headers to corresponding values
+        :type data: list or dict
         :param delimiter: The CSV delimiter
         :type delimiter: string
 
         '''
-        self.__headers = headers
-        self.__dataMap = dataMap
+        if not isinstance(headers, HeaderSchema):
+            headers = HeaderSchema(headers)
+
+        if isinstance(data, dict):
+            data = headers.toList(data)
+
+        self.__schema = headers
+        self.__values = data
         self.__delimiter = delimiter
 
     def getCell(self, header):
@@ -73,13 +87,16 @@ class Row:
         return self[header]
 
     def dict(self):
-        '''Return the row as a dictionary mapping column header values to
+        '''Return the row as a read only mapping of column header values to
         cell values.
 
-        :rtype: dict
+        The mapping is a view of the row, and does not copy its values. Use
+        ``dict(row.dict())`` to create a modifiable copy.
+
+        :rtype: :class:`icsv.RowMapping`
 
         '''
-        return deepcopy(self.__dataMap)
+        return RowMapping(self.__schema, self.__values)
 
     def list(self):
         '''Return the row as a list of cell values in order of the
@@ -88,7 +105,7 @@ class Row:
         :rtype: list
 
         '''
-        return [self.__dataMap.get(header, '') for header in self.__headers]
+        return list(self.__values)
 
     def numCols(self):
         '''Get the number of columns in this row.
@@ -96,11 +113,11 @@ class Row:
         :rtype: int
 
         '''
-        return len(self.__headers)
+        return len(self.__schema)
 
     def __str__(self):
         '''Convert the row to a CSV string.'''
-        return self.__delimiter.join(map(str, self.list()))
+        return self.__delimiter.join(map(str, self.__values))
 
     def __getitem__(self, header):
         '''Get the cell value for the given column header.
@@ -111,9 +128,137 @@ class Row:
         :raises Exception: Due to an unknown header value
 
         '''
-        if header not in self.__headers:
-            raise Exception("Invalid header: %s" % header)
-        return self.__dataMap.get(header, '')
+        return self.__values[self.__schema.index(header)]
+
+
+class RowMapping(Mapping):
+    '''The RowMapping class is a read only view of a single row, which maps
+    column headers to cell values.
+
+    '''
+
+    __slots__ = ("__schema", "__values")
+
+    def __init__(self, schema, values):
+        '''
+        :param schema: The schema for the column headers
+        :type schema: :class:`icsv.HeaderSchema`
+        :param values: The list of values in order of the headers
+        :type values: list
+
+        '''
+        self.__schema = schema
+        self.__values = values
+
+    def __getitem__(self, header):
+        if header not in self.__schema:
+            raise KeyError(header)
+        return self.__values[self.__schema.index(header)]
+
+    def __iter__(self):
+        return iter(self.__schema.headers())
+
+    def __len__(self):
+        return len(self.__schema)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Rows(Sequence):
+    '''The Rows class is a lazy sequence of the rows in a CSV.
+
+    :class:`icsv.Row` objects are only created when they are accessed, so
+    iterating over the rows does not create a copy of the entire CSV. The
+    sequence supports ``len``, indexing, iteration and slicing, where
+    slicing creates another lazy sequence.
+
+    '''
+
+    def __init__(self, csv, indexes=None):
+        '''
+        :param csv: The CSV containing the rows
+        :type csv: An :class:`icsv.icsv` object
+        :param indexes: The indexes of the rows in the sequence, or None for
+                        all rows of the CSV (including rows added later)
+        :type indexes: sequence of ints
+
+        '''
+        self.__csv = csv
+        self.__indexes = indexes
+
+    def __len__(self):
+        return len(self.__rowIndexes())
+
+    def __getitem__(self, index):
+        indexes = self.__rowIndexes()
+
+        if isinstance(index, slice):
+            return Rows(self.__csv, indexes[index])
+
+        return self.__csv.getRow(indexes[index])
+
+    def __iter__(self):
+        for index in self.__rowIndexes():
+            yield self.__csv.getRow(index)
+
+    def __rowIndexes(self):
+        '''Get the indexes of the rows in the sequence.
+
+        :rtype: sequence of ints
+
+        '''
+        if self.__indexes is None:
+            return range(self.__csv.numRows())
+
+        return self.__indexes
+
+
+class ColumnView(Sequence):
+    '''The ColumnView class is a read only view of the values in a column
+    of a CSV.
+
+    The values are not copied, so a column stored by column storage is
+    fetched in constant time. The sequence supports ``len``, indexing,
+    iteration and slicing, where slicing creates a copy of the selected
+    values. It is equal to any other sequence with the same values.
+
+    A view should not be used once its CSV has been changed. Get the column
+    again instead.
+
+    '''
+
+    __slots__ = ("__values",)
+
+    def __init__(self, values):
+        '''
+        :param values: The list (or array) of values in the column
+        :type values: list
+
+        '''
+        self.__values = values
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __getitem__(self, index):
+        return self.__values[index]
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and \
+            all(value == otherValue for value, otherValue in zip(self, other))
+
+    # Views are not hashable, like the lists they wrap
+    __hash__ = None
+
+    def __repr__(self):
+        return "ColumnView(%r)" % (list(self.__values),)
 
 
 class Col:
@@ -126,8 +271,8 @@ class Col:
         '''
         :param header: The column header
         :type header: string
-        :param data: The list of row values in this column
-        :type data: list
+        :param data: The sequence of row values in this column
+        :type data: sequence
 
         '''
         self.__header = header
@@ -142,9 +287,9 @@ class Col:
         return self.__header
 
     def data(self):
-        '''Get the list of data values in this column.
+        '''Get the sequence of data values in this column.
 
-        :rtype: list
+        :rtype: sequence
 
         '''
         return self.__data
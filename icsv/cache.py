@@ -0,0 +1,414 @@
+from array import array
+from datetime import date, datetime
+from hashlib import sha1
+from itertools import accumulate
+from os import listdir, makedirs, replace, stat, unlink, utime
+from os.path import abspath, exists, join
+from struct import calcsize, error, pack, unpack_from
+
+
+# Kinds of cached columns
+StringColumn = b's'     # Strings joined by a NUL character
+LengthColumn = b'S'     # Strings which contain a NUL, prefixed by lengths
+IntColumn = b'i'        # A 64-bit int array, with missing value positions
+FloatColumn = b'f'      # A 64-bit float array, with missing value positions
+MixedColumn = b'm'      # A type code per value, followed by their strings
+
+# Map of array type codes to the kinds of columns which store them
+ArrayKinds = {
+    'q': IntColumn,
+    'd': FloatColumn,
+    }
+
+# Map of number column kinds to their array type code, and value type
+NumberKinds = {
+    IntColumn: ('q', int),
+    FloatColumn: ('d', float),
+    }
+
+# Map of the types of values in mixed columns to their type codes, and the
+# functions which convert them to strings and back again
+MixedTypes = {
+    str: ('s', str, str),
+    int: ('i', str, int),
+    float: ('f', repr, float),
+    bool: ('b', lambda value: '1' if value else '', bool),
+    date: ('d', date.isoformat, date.fromisoformat),
+    datetime: ('t', datetime.isoformat, datetime.fromisoformat),
+    }
+MixedParsers = dict((code, parse) for code, _, parse in MixedTypes.values())
+
+
+def encodeStrings(values):
+    '''Encode a column of strings.
+
+    :param values: The list of strings
+    :type values: list of strings
+
+    :returns: The kind of column, and its encoded values
+    :rtype: tuple
+
+    '''
+    text = '\0'.join(values)
+    if text.count('\0') == max(len(values) - 1, 0):
+        return StringColumn, text.encode('utf-8')
+
+    # Values which contain the separator are stored after their lengths
+    lengths = array('q', map(len, values))
+    return LengthColumn, lengths.tobytes() + ''.join(values).encode('utf-8')
+
+
+def decodeStrings(kind, data, numRows):
+    '''Decode a column of strings.
+
+    :param kind: The kind of column
+    :type kind: bytes
+    :param data: The encoded values
+    :type data: bytes
+    :param numRows: The number of values
+    :type numRows: int
+
+    :rtype: list of strings
+
+    '''
+    if kind == StringColumn:
+        return data.decode('utf-8').split('\0') if numRows > 0 else []
+
+    lengths = array('q')
+    lengths.frombytes(data[:numRows * lengths.itemsize])
+    text = data[numRows * lengths.itemsize:].decode('utf-8')
+
+    ends = list(accumulate(lengths))
+    return [text[end - length:end] for end, length in zip(ends, lengths)]
+
+
+def encodeColumn(values):
+    '''Encode a column of values into bytes.
+
+    Columns of strings, and of numbers with missing values, are stored in
+    bulk. Other columns store a type code for every value.
+
+    :param values: The list (or array) of values
+    :type values: list
+
+    :returns: The kind of column, and its encoded values
+    :rtype: tuple
+
+    :raises TypeError: If the column contains an unsupported type of value
+
+    '''
+    if isinstance(values, array) and values.typecode in ArrayKinds:
+        return ArrayKinds[values.typecode], pack("<Q", 0) + values.tobytes()
+
+    types = set(map(type, values))
+    if types <= {str}:
+        return encodeStrings(values)
+
+    for kind, (code, valueType) in NumberKinds.items():
+        if not types <= {valueType, str}:
+            continue
+
+        missing = array('q', (row for row, value in enumerate(values)
+                              if type(value) is str))
+        if any(values[row] != '' for row in missing):
+            break
+
+        numbers = list(values)
+        for row in missing:
+            numbers[row] = 0
+
+        try:
+            numbers = array(code, numbers)
+        except OverflowError:
+            break  # Ints which are too large are stored as strings
+
+        return kind, pack("<Q", len(missing)) + missing.tobytes() + \
+            numbers.tobytes()
+
+    codes = []
+    strings = []
+    for value in values:
+        if type(value) not in MixedTypes:
+            raise TypeError("Cannot cache value: %r" % (value,))
+
+        code, toString, _ = MixedTypes[type(value)]
+        codes.append(code)
+        strings.append(toString(value))
+
+    kind, data = encodeStrings(strings)
+    return MixedColumn, ''.join(codes).encode('ascii') + kind + data
+
+
+def decodeColumn(kind, data, numRows):
+    '''Decode a column of values from bytes.
+
+    Number columns without missing values are returned as an
+    :class:`array.array`, all other columns are returned as a list.
+
+    :param kind: The kind of column
+    :type kind: bytes
+    :param data: The encoded values
+    :type data: bytes
+    :param numRows: The number of values
+    :type numRows: int
+
+    :rtype: list or array
+
+    :raises ValueError: If the column is invalid
+
+    '''
+    if kind in (StringColumn, LengthColumn):
+        values = decodeStrings(kind, data, numRows)
+    elif kind in NumberKinds:
+        code, _ = NumberKinds[kind]
+        numMissing = unpack_from("<Q", data)[0]
+        offset = calcsize("<Q") + numMissing * calcsize("<q")
+
+        missing = array('q')
+        missing.frombytes(data[calcsize("<Q"):offset])
+        values = array(code)
+        values.frombytes(data[offset:])
+
+        if numMissing > 0:
+            values = values.tolist()
+            for row in missing:
+                values[row] = ''
+    elif kind == MixedColumn:
+        codes = data[:numRows].decode('ascii')
+        strings = decodeStrings(data[numRows:numRows + 1],
+                                data[numRows + 1:], numRows)
+        values = [MixedParsers[code](string)
+                  for code, string in zip(codes, strings)]
+    else:
+        raise ValueError("Unknown column kind: %r" % kind)
+
+    if len(values) != numRows:
+        raise ValueError("Invalid column length")
+
+    return values
+
+
+class FileCache:
+    '''The FileCache class stores the parsed rows of CSV files in a
+    directory, so that unchanged files can be loaded without parsing them
+    again.
+
+    Each cached file is stored in a binary cache file, whose name is derived
+    from the path of the CSV file and the options used to parse it. The
+    cache file records the size and modification time of the CSV file, and
+    is ignored once the CSV file changes.
+
+    When ``maxSize`` is given, the least recently used cache files are
+    removed whenever the total size of the cache directory exceeds it.
+
+    Rows are cached one column at a time. Columns of strings are stored as
+    a single block of UTF-8 text, and columns of ints or floats are stored
+    as the raw bytes of an :class:`array.array`, so loading a cached file
+    is much faster than parsing it. Loading a cache file never runs code.
+    The cache directory is created so that only its owner can access it. A
+    cache file that anyone else can write to could still contain made up
+    rows, so a shared cache directory should not be used.
+
+    A cache is used by passing it to :func:`icsv.icsv.fromFile`::
+
+        cache = FileCache("/home/user/.cache/icsv", maxSize=1024 ** 3)
+        csv = icsv.fromFile("/tmp/test.csv", cache=cache)
+
+    '''
+
+    # Identifies a cache file, and the format of its header
+    CacheMagic = b"ICSVCCH3"
+    CacheHeader = "<8sQQQQ"
+
+    # The format of the header of each column
+    ColumnHeader = "<cQ"
+
+    # Extension of cache files within the cache directory
+    Extension = ".icsvc"
+
+    def __init__(self, directory, maxSize=None):
+        '''
+        :param directory: The path to the cache directory, which is created
+                          if it does not exist
+        :type directory: string
+        :param maxSize: The maximum total size (in bytes) of the cache files,
+                        or None for no limit
+        :type maxSize: int
+
+        '''
+        if not exists(directory):
+            makedirs(directory, 0o700)
+
+        self.__directory = directory
+        self.__maxSize = maxSize
+
+    def directory(self):
+        '''Get the path to the cache directory.
+
+        :rtype: string
+
+        '''
+        return self.__directory
+
+    def maxSize(self):
+        '''Get the maximum total size (in bytes) of the cache files.
+
+        :rtype: int
+
+        '''
+        return self.__maxSize
+
+    def size(self):
+        '''Get the total size (in bytes) of the cache files.
+
+        :rtype: int
+
+        '''
+        return sum(info.st_size for _, info in self.__cacheFiles())
+
+    def load(self, filename, key):
+        '''Load the cached columns of a CSV file.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param key: The options used to parse the file
+        :type key: tuple
+
+        :returns: The list of columns in order of the column headers, where
+                  each column is a list (or array) of values, or None if the
+                  file is not cached, or has changed since it was cached
+        :rtype: list of lists
+
+        '''
+        cacheFilename = self.__cacheFilename(filename, key)
+        if not exists(cacheFilename):
+            return None
+
+        info = stat(filename)
+
+        with open(cacheFilename, 'rb') as fd:
+            content = fd.read()
+
+        try:
+            magic, size, mtime, numColumns, numRows = \
+                unpack_from(self.CacheHeader, content)
+
+            # The CSV file has changed since it was cached
+            if magic != self.CacheMagic or size != info.st_size or \
+                    mtime != info.st_mtime_ns:
+                return None
+
+            offset = calcsize(self.CacheHeader)
+            columnSize = calcsize(self.ColumnHeader)
+
+            columns = []
+            for _ in range(numColumns):
+                kind, length = unpack_from(self.ColumnHeader, content, offset)
+                offset += columnSize
+
+                data = content[offset:offset + length]
+                offset += length
+
+                columns.append(decodeColumn(kind, data, numRows))
+        except (error, ValueError, KeyError, IndexError):
+            return None  # The cache file is corrupt
+
+        # Mark the cache file as recently used
+        utime(cacheFilename)
+
+        return columns
+
+    def store(self, filename, key, columns, info=None):
+        '''Store the parsed columns of a CSV file.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param key: The options used to parse the file
+        :type key: tuple
+        :param columns: The list of columns in order of the column headers,
+                        where each column is a list (or array) of strings,
+                        numbers, bools, dates, or datetimes
+        :type columns: list of lists
+        :param info: The result of calling :func:`os.stat` on the CSV file
+                     before it was parsed, or None to use its current state
+        :type info: :class:`os.stat_result`
+
+        :raises TypeError: If a column contains any other type of value
+
+        '''
+        if info is None:
+            info = stat(filename)
+
+        numRows = len(columns[0]) if len(columns) > 0 else 0
+        content = [pack(self.CacheHeader, self.CacheMagic, info.st_size,
+                        info.st_mtime_ns, len(columns), numRows)]
+
+        for values in columns:
+            kind, data = encodeColumn(values)
+            content.append(pack(self.ColumnHeader, kind, len(data)))
+            content.append(data)
+
+        cacheFilename = self.__cacheFilename(filename, key)
+
+        # Write to a temporary file so that a partially written cache file
+        # is never loaded
+        tempFilename = cacheFilename + ".tmp"
+        with open(tempFilename, 'wb') as fd:
+            fd.writelines(content)
+        replace(tempFilename, cacheFilename)
+
+        self.__evict()
+
+    def clear(self):
+        '''Remove all of the cache files.'''
+        for cacheFilename, _ in self.__cacheFiles():
+            unlink(cacheFilename)
+
+    ##### Private functions
+
+    def __cacheFilename(self, filename, key):
+        '''Get the path to the cache file for a CSV file.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param key: The options used to parse the file
+        :type key: tuple
+
+        :rtype: string
+
+        '''
+        digest = sha1(repr((abspath(filename), key)).encode('utf-8'))
+        return join(self.__directory, digest.hexdigest() + self.Extension)
+
+    def __cacheFiles(self):
+        '''Get the cache files in the cache directory.
+
+        :rtype: list of (path, :class:`os.stat_result`) tuples
+
+        '''
+        cacheFiles = []
+        for name in listdir(self.__directory):
+            if name.endswith(self.Extension):
+                path = join(self.__directory, name)
+                cacheFiles.append((path, stat(path)))
+
+        return cacheFiles
+
+    def __evict(self):
+        '''Remove the least recently used cache files until the cache is
+        no larger than its maximum size.
+
+        '''
+        if self.__maxSize is None:
+            return
+
+        cacheFiles = sorted(self.__cacheFiles(),
+                            key=lambda item: item[1].st_mtime_ns)
+        total = sum(info.st_size for _, info in cacheFiles)
+
+        for cacheFilename, info in cacheFiles:
+            if total <= self.__maxSize:
+                break
+
+            unlink(cacheFilename)
+            total -= info.st_size
@@ -0,0 +1,114 @@
+import bz2
+import gzip
+import lzma
+from os.path import exists
+
+
+# Maps compression names to the file extension, the magic bytes at the
+# start of a compressed file, and the function which opens it
+Compressions = {
+    "gz": (".gz", b"\x1f\x8b", gzip.open),
+    "bz2": (".bz2", b"BZh", bz2.open),
+    "xz": (".xz", b"\xfd7zXZ\x00", lzma.open),
+}
+
+
+def validateCompression(compression):
+    '''Make sure that a compression is known.
+
+    :param compression: The compression name ("gz", "bz2", or "xz"), or
+                        None for no compression
+    :type compression: string
+
+    :raises Exception: If an unknown compression is given
+
+    '''
+    if compression is not None and compression not in Compressions:
+        raise Exception("Unknown compression: %s" % compression)
+
+
+def compressionFromFilename(filename):
+    '''Get the compression of a file from its extension.
+
+    :param filename: The path to the file
+    :type filename: string
+
+    :returns: The compression name, or None if the file is not compressed
+    :rtype: string
+
+    '''
+    for compression, (extension, _, _) in Compressions.items():
+        if filename.endswith(extension):
+            return compression
+
+    return None
+
+
+def detectCompression(filename):
+    '''Get the compression of a file from its extension, or from the magic
+    bytes at the start of the file.
+
+    :param filename: The path to the file
+    :type filename: string
+
+    :returns: The compression name, or None if the file is not compressed
+    :rtype: string
+
+    '''
+    compression = compressionFromFilename(filename)
+    if compression is not None or not exists(filename):
+        return compression
+
+    with open(filename, 'rb') as fd:
+        start = fd.read(8)
+
+    for compression, (_, magic, _) in Compressions.items():
+        if start.startswith(magic):
+            return compression
+
+    return None
+
+
+def openFile(filename, mode, compression=None, compressionLevel=None,
+             bufferSize=-1):
+    '''Open a file, compressing or decompressing its content.
+
+    Files are opened in text mode, unless the mode contains 'b'.
+
+    :param filename: The path to the file
+    :type filename: string
+    :param mode: The mode to open the file with ('r', 'w', or 'a', and
+                 optionally 'b')
+    :type mode: string
+    :param compression: The compression name ("gz", "bz2", or "xz"), or None
+                        for no compression
+    :type compression: string
+    :param compressionLevel: The compression level used when writing, or
+                             None for the default level
+    :type compressionLevel: int
+    :param bufferSize: The size (in bytes) of the file buffer for
+                       uncompressed files
+    :type bufferSize: int
+
+    :rtype: file
+
+    :raises Exception: If an unknown compression is given
+
+    '''
+    validateCompression(compression)
+
+    if compression is None:
+        return open(filename, mode, buffering=bufferSize)
+
+    _, _, openCompressed = Compressions[compression]
+
+    kwargs = {}
+    if compressionLevel is not None and not mode.startswith('r'):
+        # The lzma module calls the compression level a preset
+        key = "preset" if compression == "xz" else "compresslevel"
+        kwargs[key] = compressionLevel
+
+    if 'b' not in mode:
+        mode += 't'
+
+    return openCompressed(filename, mode, **kwargs)
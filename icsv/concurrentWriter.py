@@ -0,0 +1,252 @@
+from queue import Queue
+from threading import Lock, Thread
+
+from icsv.schema import HeaderSchema
+from icsv.writer import Writer
+
+
+class ConcurrentWriter:
+    '''The ConcurrentWriter class provides an interface for writing a CSV
+    file from many threads at once.
+
+    Any thread can call :func:`icsv.ConcurrentWriter.writeRow`, which
+    validates the row and places it on a thread safe queue. A single
+    background thread takes rows off the queue in batches, writes them to
+    the file, and flushes the file whenever it has caught up with the
+    producers. Rows written by the same thread are written in order.
+
+    When the queue is full, writing waits until there is room, which slows
+    down producers rather than buffering an unlimited number of rows.
+
+    Closing the writer waits until every row which has been accepted is
+    written and flushed. The ConcurrentWriter can be used as a context
+    manager which closes the file on exit::
+
+        with ConcurrentWriter("/tmp/test.csv", headers) as writer:
+            writer.writeRow([0, 1, 2])
+
+    '''
+
+    # Queued after the last row to stop the background thread
+    __Stop = object()
+
+    def __init__(self, filename, headers, delimiter=',', useHeaders=True,
+                 overwrite=True, maxQueueSize=10000, batchSize=1000,
+                 bufferSize=65536):
+        '''
+        :param filename: The filename for the CSV file to write
+        :type filename: string
+        :param headers: The list of column headers for this CSV file
+        :type headers: list of string
+        :param delimiter: The CSV delimiter to use
+        :type delimiter: string
+        :param useHeaders: True will write the headers to the first line of the
+                           created CSV file, False will not
+        :type useHeaders: bool
+        :param overwrite: True will overwrite existing files, False will not
+        :type overwrite: bool
+        :param maxQueueSize: The maximum number of rows waiting to be written
+        :type maxQueueSize: int
+        :param batchSize: The maximum number of rows written at once
+        :type batchSize: int
+        :param bufferSize: The size (in bytes) of the file write buffer
+        :type bufferSize: int
+
+        :raises Exception: If ``overwrite`` is False, and the file already
+                           exists
+
+        '''
+        self.__writer = Writer(filename, headers, delimiter, useHeaders,
+                               overwrite, flushRows=None,
+                               bufferSize=bufferSize, keepRows=False)
+        self.__headerSchema = HeaderSchema(headers)
+        self.__batchSize = batchSize
+
+        self.__queue = Queue(maxQueueSize)
+
+        # Guards checking for, and marking the writer as closed, so that no
+        # rows can be queued after the background thread has been stopped
+        self.__acceptLock = Lock()
+
+        # Guards all access to the file
+        self.__fileLock = Lock()
+
+        self.__error = None
+        self.__closed = False
+
+        self.__thread = Thread(target=self.__drain, daemon=True)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def filename(self):
+        '''Get the path to the CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__writer.filename()
+
+    def headers(self):
+        '''Get the list of headers for this CSV file.
+
+        :rtype: list of strings
+
+        '''
+        return self.__writer.headers()
+
+    def delimiter(self):
+        '''Get the delimiter used for this CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__writer.delimiter()
+
+    def writeRow(self, items):
+        '''Queue a new row of data to be written to the CSV.
+
+        ``items`` can be a list of values, or a dictionary of values.
+
+        :param items: The list, or dictionary of row items
+
+        :raises Exception: If ``items`` is a list and is not equal to the
+                           number of headers
+        :raises Exception: If ``items`` is a dictionary and contains entries
+                           for unknown headers
+        :raises Exception: If ``items`` is not a list or a dictionary
+        :raises Exception: If the writer has been closed
+        :raises Exception: If writing previously queued rows failed
+
+        '''
+        self.__raiseError()
+        self.__headerSchema.validate(items)
+
+        with self.__acceptLock:
+            self.__checkOpen()
+            self.__queue.put(items)
+
+    def writeRows(self, rows):
+        '''Queue several rows of data to be written to the CSV.
+
+        ``rows`` can be any iterable of rows, where each row can be a list,
+        tuple, or dictionary of values. All rows are validated before any of
+        them are queued, and they are written in order.
+
+        :param rows: The iterable of rows
+        :type rows: iterable of lists, tuples, or dictionaries
+
+        :raises Exception: If any of the rows are invalid
+        :raises Exception: If the writer has been closed
+        :raises Exception: If writing previously queued rows failed
+
+        '''
+        self.__raiseError()
+
+        rows = list(rows)
+        for items in rows:
+            self.__headerSchema.validate(items)
+
+        with self.__acceptLock:
+            self.__checkOpen()
+            for items in rows:
+                self.__queue.put(items)
+
+    def flush(self):
+        '''Wait until all queued rows have been written, and flush them to
+        the CSV file.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        self.__queue.join()
+
+        with self.__fileLock:
+            self.__writer.flush()
+
+        self.__raiseError()
+
+    def close(self):
+        '''Write all queued rows, and close the CSV file.
+
+        No more rows can be written once the writer has been closed.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        with self.__acceptLock:
+            if self.__closed:
+                return
+
+            self.__closed = True
+            self.__queue.put(self.__Stop)
+
+        self.__thread.join()
+
+        with self.__fileLock:
+            self.__writer.close()
+
+        self.__raiseError()
+
+    def closed(self):
+        '''Determine if this writer has been closed.
+
+        :rtype: bool
+
+        '''
+        return self.__closed
+
+    ##### Private functions
+
+    def __drain(self):
+        '''Write batches of queued rows until the writer is closed.'''
+        queue = self.__queue
+        stop = False
+
+        while not stop:
+            batch = [queue.get()]
+            while len(batch) < self.__batchSize and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            numQueued = len(batch)
+            if batch[-1] is self.__Stop:
+                batch.pop()
+                stop = True
+
+            try:
+                with self.__fileLock:
+                    self.__writer.writeRows(batch)
+
+                    # Flush once all of the queued rows have been written
+                    if queue.empty():
+                        self.__writer.flush()
+            except Exception as error:
+                self.__error = error
+            finally:
+                for _ in range(numQueued):
+                    queue.task_done()
+
+    def __checkOpen(self):
+        '''Make sure that the writer has not been closed.
+
+        :raises Exception: If the writer has been closed
+
+        '''
+        if self.__closed:
+            raise Exception("Cannot write to closed file: %s" %
+                            self.__writer.filename())
+
+    def __raiseError(self):
+        '''Raise the error that occurred while writing queued rows, if any.
+
+        :raises Exception: If writing queued rows failed
+
+        '''
+        error = self.__error
+        if error is not None:
+            self.__error = None
+            raise error
@@ -0,0 +1,325 @@
+from locale import getpreferredencoding
+from os import fstat, stat
+from time import monotonic, sleep
+
+from icsv.base import Row
+from icsv.schema import HeaderSchema
+
+
+class TailReader:
+    '''The TailReader class provides an interface for reading the rows
+    appended to a CSV file while it is being written, similar to
+    ``tail -F``.
+
+    The reader remembers the byte offset it has read up to, so each call to
+    :func:`icsv.TailReader.poll` only reads, and returns, the rows which
+    have been appended since the previous call. A trailing line which has
+    not been completely written yet is kept until the rest of it has
+    been written. Each poll reads at most ``ReadSize`` bytes (unless a
+    single line is longer), so a large file is returned in batches of rows
+    rather than being read into memory at once.
+
+    If the file is truncated, it is read again from the start. If the file
+    is replaced (rotated), the rest of the old file is read, and then the
+    new file is read from the start. The headers line at the start of each
+    file is never returned as a row.
+
+    Rows can be polled for, or read with a blocking generator::
+
+        with TailReader("/tmp/test.csv") as reader:
+            for row in reader.follow():
+                print row
+
+    '''
+
+    # The size (in bytes) of the blocks read when searching for the end of
+    # the last complete line
+    BlockSize = 65536
+
+    # The maximum number of bytes read by a single poll
+    ReadSize = 16 * 1024 * 1024
+
+    def __init__(self, filename, headers=None, delimiter=',',
+                 containsHeaders=True, fromStart=True, pollInterval=0.5):
+        '''
+        :param filename: The path to the CSV file. The file does not need
+                         to exist yet
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param fromStart: True to read the rows already in the file, False
+                          to only read rows appended after the file is
+                          first opened
+        :type fromStart: bool
+        :param pollInterval: The number of seconds :func:`follow` waits
+                             before checking the file for new rows again
+        :type pollInterval: float
+
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+
+        '''
+        # Must be able to determine the headers
+        if headers is None and not containsHeaders:
+            raise Exception("Could not determine headers. If 'headers' is " \
+                                "None, then 'containsHeaders' must be True")
+
+        self.__filename = filename
+        self.__delimiter = delimiter
+        self.__containsHeaders = containsHeaders
+        self.__fromStart = fromStart
+        self.__pollInterval = pollInterval
+        self.__encoding = getpreferredencoding(False)
+
+        self.__headers = headers
+        self.__headerSchema = None
+        if headers is not None:
+            self.__headerSchema = HeaderSchema(headers)
+
+        # The file is opened by the first poll
+        self.__fd = None
+        self.__offset = 0
+        self.__partial = b''
+        self.__headersPending = containsHeaders
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        '''Close the CSV file.'''
+        if self.__fd is not None:
+            self.__fd.close()
+            self.__fd = None
+
+    def filename(self):
+        '''Get the path to the CSV file being read.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
+    def headers(self):
+        '''Get the list of column headers for this CSV, or None if they have
+        not been read from the file yet.
+
+        :rtype: list of strings
+
+        '''
+        return self.__headers
+
+    def delimiter(self):
+        '''Get the delimiter value for this CSV.
+
+        :rtype: string
+
+        '''
+        return self.__delimiter
+
+    def offset(self):
+        '''Get the byte offset in the file that has been read up to.
+
+        :rtype: int
+
+        '''
+        return self.__offset
+
+    def poll(self):
+        '''Read the rows which have been appended to the file since the last
+        poll, up to ``ReadSize`` bytes of them.
+
+        :rtype: list of :class:`icsv.Row` objects
+
+        '''
+        if self.__fd is None and not self.__open(self.__fromStart):
+            return []
+
+        # The file was truncated, so read it again from the start
+        if fstat(self.__fd.fileno()).st_size < self.__offset:
+            self.__reset()
+
+        rows = self.__readRows()
+
+        # The file was replaced, so read the new file from the start once
+        # the rest of the old file has been read
+        readAll = self.__offset >= fstat(self.__fd.fileno()).st_size
+        if readAll and self.__rotated():
+            self.close()
+            if self.__open(True):
+                rows.extend(self.__readRows())
+
+        return rows
+
+    def follow(self, timeout=None):
+        '''Iterate over the rows appended to the file, waiting for new rows
+        to be written.
+
+        :param timeout: Stop once no rows have been appended for this many
+                        seconds, or None to never stop
+        :type timeout: float
+
+        :rtype: generator of :class:`icsv.Row` objects
+
+        '''
+        lastRow = monotonic()
+
+        while True:
+            rows = self.poll()
+            for row in rows:
+                yield row
+
+            if len(rows) > 0:
+                lastRow = monotonic()
+            elif timeout is not None and monotonic() - lastRow >= timeout:
+                return
+            else:
+                sleep(self.__pollInterval)
+
+    def __iter__(self):
+        '''Iterate over the rows appended to the file, waiting for new rows
+        to be written.
+
+        :rtype: generator of :class:`icsv.Row` objects
+
+        '''
+        return self.follow()
+
+    ##### Private functions
+
+    def __open(self, fromStart):
+        '''Open the file, if it exists.
+
+        :param fromStart: True to read the file from the start, False to
+                          read from the end of its last complete line
+        :type fromStart: bool
+
+        :rtype: bool
+
+        '''
+        try:
+            self.__fd = open(self.__filename, 'rb')
+        except FileNotFoundError:
+            return False
+
+        self.__reset()
+
+        if not fromStart:
+            self.__offset = self.__lastLineEnd()
+
+            # The headers line is before the end of the file, unless the
+            # file is empty
+            if self.__offset > 0:
+                self.__readHeaders()
+
+        return True
+
+    def __reset(self):
+        '''Read the file from the start again.'''
+        self.__offset = 0
+        self.__partial = b''
+        self.__headersPending = self.__containsHeaders
+
+    def __rotated(self):
+        '''Determine if the file has been replaced by a different file.
+
+        :rtype: bool
+
+        '''
+        try:
+            info = stat(self.__filename)
+        except FileNotFoundError:
+            return False
+
+        return info.st_ino != fstat(self.__fd.fileno()).st_ino
+
+    def __readRows(self):
+        '''Read the complete lines appended to the file.
+
+        :rtype: list of :class:`icsv.Row` objects
+
+        '''
+        self.__fd.seek(self.__offset)
+
+        blocks = [self.__partial]
+        while True:
+            block = self.__fd.read(self.ReadSize)
+            self.__offset += len(block)
+            blocks.append(block)
+
+            # Keep reading until a complete line, or the end of the file,
+            # has been read
+            if len(block) < self.ReadSize or b'\n' in block:
+                break
+
+        content = b''.join(blocks)
+        end = content.rfind(b'\n') + 1
+        self.__partial = content[end:]
+
+        rows = []
+        for line in content[:end].decode(self.__encoding).split('\n'):
+            line = line.strip()
+            if len(line) == 0:
+                continue
+
+            values = line.split(self.__delimiter)
+
+            # Skip past the headers line
+            if self.__headersPending:
+                self.__headersPending = False
+                if self.__headerSchema is None:
+                    self.__setHeaders(values)
+                continue
+
+            values = self.__headerSchema.normalize(values)
+            rows.append(Row(self.__headerSchema, values, self.__delimiter))
+
+        return rows
+
+    def __readHeaders(self):
+        '''Read the headers line from the start of the file.'''
+        self.__fd.seek(0)
+        for line in iter(self.__fd.readline, b''):
+            line = line.decode(self.__encoding).strip()
+            if len(line) > 0:
+                if self.__headerSchema is None:
+                    self.__setHeaders(line.split(self.__delimiter))
+                break
+
+        self.__headersPending = False
+
+    def __setHeaders(self, headers):
+        '''Set the headers read from the file.
+
+        :param headers: The list of column headers
+        :type headers: list of strings
+
+        '''
+        self.__headers = headers
+        self.__headerSchema = HeaderSchema(headers)
+
+    def __lastLineEnd(self):
+        '''Get the byte offset of the end of the last complete line.
+
+        :rtype: int
+
+        '''
+        end = fstat(self.__fd.fileno()).st_size
+        while end > 0:
+            start = max(0, end - self.BlockSize)
+            self.__fd.seek(start)
+            position = self.__fd.read(end - start).rfind(b'\n')
+            if position != -1:
+                return start + position + 1
+
+            end = start
+
+        return 0
@@ -0,0 +1,312 @@
+from icsv.schema import HeaderSchema, validateSchema, convertValue
+
+
+class Count:
+    '''Counts the values of a group.'''
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class Sum:
+    '''Adds up the values of a group.'''
+
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = None
+
+    def add(self, value):
+        self.total = value if self.total is None else self.total + value
+
+    def result(self):
+        return '' if self.total is None else self.total
+
+
+class Min:
+    '''Finds the smallest value of a group.'''
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def add(self, value):
+        if self.value is None or value < self.value:
+            self.value = value
+
+    def result(self):
+        return '' if self.value is None else self.value
+
+
+class Max:
+    '''Finds the largest value of a group.'''
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def add(self, value):
+        if self.value is None or value > self.value:
+            self.value = value
+
+    def result(self):
+        return '' if self.value is None else self.value
+
+
+class Mean:
+    '''Finds the mean of the values of a group.'''
+
+    __slots__ = ("total", "count")
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+
+    def add(self, value):
+        self.total += value
+        self.count += 1
+
+    def result(self):
+        return '' if self.count == 0 else self.total / self.count
+
+
+# Map of aggregate names to the classes which compute them
+Aggregates = {
+    "count": Count,
+    "sum": Sum,
+    "min": Min,
+    "max": Max,
+    "mean": Mean,
+    }
+
+# Aggregates whose values must be numbers
+NumericAggregates = ("sum", "mean")
+
+
+class GroupBy:
+    '''The GroupBy class groups rows by the values of one or more key
+    columns, and computes aggregates of the values of other columns for
+    each group.
+
+    Aggregates are computed in a single pass over the rows, and only the
+    running state of the aggregates of each group is kept in memory, so
+    the memory used depends on the number of groups rather than the number
+    of rows. Grouping the rows of an :class:`icsv.Reader` never loads the
+    whole file into memory::
+
+        reader = icsv.iterFile("/tmp/sales.csv")
+        totals = reader.groupBy("region").agg({"price": ["sum", "mean"]})
+
+    The supported aggregates are "count", "sum", "min", "max", and "mean".
+    Missing values (empty strings) are ignored by all aggregates, and the
+    aggregate of a group without any values is missing, except for "count"
+    which is zero. The values of untyped columns are converted to floats
+    for "sum" and "mean", and are compared as strings for "min" and "max".
+
+    GroupBy objects are created by :func:`icsv.icsv.groupBy` and
+    :func:`icsv.Reader.groupBy`.
+
+    '''
+
+    def __init__(self, headers, keys, rows, schema=None, delimiter=',',
+                 storage="row"):
+        '''
+        :param headers: The list of column headers of the rows
+        :type headers: list of strings
+        :param keys: The column header, or list of column headers, to group by
+        :type keys: string or list of strings
+        :param rows: The function which returns an iterator over the rows,
+                     where each row is a list of values in order of the
+                     column headers
+        :type rows: function
+        :param schema: The dictionary mapping column headers to column types
+        :type schema: dict
+        :param delimiter: The delimiter of the grouped CSV
+        :type delimiter: string
+        :param storage: The type of storage used for the grouped CSV ("row"
+                        or "column")
+        :type storage: string
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If the schema contains unknown headers or types
+
+        '''
+        if isinstance(keys, str):
+            keys = [keys]
+
+        self.__headerSchema = HeaderSchema(headers)
+        self.__schema = {} if schema is None else schema
+        validateSchema(self.__headerSchema, self.__schema)
+
+        self.__keys = list(keys)
+        self.__keyPositions = [self.__headerSchema.index(key) for key in keys]
+        self.__rows = rows
+        self.__delimiter = delimiter
+        self.__storage = storage
+
+    def keys(self):
+        '''Get the list of column headers the rows are grouped by.
+
+        :rtype: list of strings
+
+        '''
+        return self.__keys
+
+    def agg(self, aggregates):
+        '''Compute aggregates of the values of each group.
+
+        Aggregates are given as a dictionary mapping column headers to an
+        aggregate name, or a list of aggregate names::
+
+            groups.agg({"price": ["min", "max"], "quantity": "sum"})
+
+        The result contains a row for each group, in the order each group
+        first appears in the rows. Its columns are the key columns, followed
+        by a column for each aggregate named after the aggregate and the
+        aggregated column, such as "sum(quantity)".
+
+        :param aggregates: The dictionary mapping column headers to
+                           aggregate names
+        :type aggregates: dict
+
+        :returns: An :class:`icsv.icsv` object containing the aggregates
+        :rtype: An :class:`icsv.icsv` object
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If an unknown aggregate is given
+        :raises Exception: If a value cannot be converted to a number, or
+                           its column type
+
+        '''
+        # Imported here since the icsv module depends on this one
+        from icsv.instantCsv import icsv
+
+        columns = self.__columns(aggregates)
+        keyConverters = [self.__converter(self.__schema.get(key))
+                         for key in self.__keys]
+
+        groups = {}
+        for values in self.__rows():
+            key = tuple(convert(values[p]) for convert, p in
+                        zip(keyConverters, self.__keyPositions))
+
+            states = groups.get(key)
+            if states is None:
+                states = [aggregate() for _, _, aggregate, _ in columns]
+                groups[key] = states
+
+            for state, (position, convert, _, _) in zip(states, columns):
+                value = values[position]
+                if value != '':
+                    state.add(convert(value))
+
+        headers = self.__keys + [header for _, _, _, header in columns]
+
+        schema = dict((key, self.__schema[key]) for key in self.__keys
+                      if key in self.__schema)
+        schema.update(self.__resultSchema(aggregates))
+
+        csv = icsv(headers, self.__delimiter, self.__storage, schema)
+        csv.addRows(list(key) + [state.result() for state in states]
+                    for key, states in groups.items())
+
+        return csv
+
+    ##### Private functions
+
+    def __columns(self, aggregates):
+        '''Get the aggregated columns.
+
+        :param aggregates: The dictionary mapping column headers to
+                           aggregate names
+        :type aggregates: dict
+
+        :returns: A list containing the position of the column, the function
+                  which converts its values, the aggregate class, and the
+                  result column header, for each aggregate
+        :rtype: list of tuples
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If an unknown aggregate is given
+
+        '''
+        columns = []
+        for header, names in aggregates.items():
+            position = self.__headerSchema.index(header)
+            valueType = self.__schema.get(header)
+
+            if isinstance(names, str):
+                names = [names]
+
+            for name in names:
+                if name not in Aggregates:
+                    raise Exception("Unknown aggregate: %s" % name)
+
+                # Untyped values must be numbers to be added together
+                if name in NumericAggregates and valueType in (None, str):
+                    convert = self.__converter(float)
+                else:
+                    convert = self.__converter(valueType)
+
+                columns.append((position, convert, Aggregates[name],
+                                "%s(%s)" % (name, header)))
+
+        return columns
+
+    def __converter(self, valueType):
+        '''Get the function which converts the values of a column.
+
+        :param valueType: The column type, or None
+        :type valueType: type
+
+        :rtype: function
+
+        '''
+        if valueType is None:
+            return lambda value: value
+
+        return lambda value: convertValue(value, valueType)
+
+    def __resultSchema(self, aggregates):
+        '''Get the schema of the aggregate columns.
+
+        :param aggregates: The dictionary mapping column headers to
+                           aggregate names
+        :type aggregates: dict
+
+        :rtype: dict
+
+        '''
+        schema = {}
+        for header, names in aggregates.items():
+            valueType = self.__schema.get(header)
+
+            if isinstance(names, str):
+                names = [names]
+
+            for name in names:
+                resultType = None
+                if name == "count":
+                    resultType = int
+                elif name == "mean":
+                    resultType = float
+                elif name == "sum":
+                    resultType = valueType if valueType in (int, float) \
+                        else float
+                elif valueType is not None:
+                    resultType = valueType
+
+                if resultType is not None:
+                    schema["%s(%s)" % (name, header)] = resultType
+
+        return schema
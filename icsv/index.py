@@ -0,0 +1,374 @@
+from bisect import bisect_left, bisect_right, insort
+
+from icsv.schema import convertValue
+
+
+class HashIndex:
+    '''The HashIndex class maps the values of a single column to the indexes
+    of the rows which contain that value, which allows rows to be found by
+    value without scanning the column.
+
+    Indexes are created by, and kept up to date by the :class:`icsv.icsv`
+    class as rows are added, changed, and removed.
+
+    '''
+
+    def __init__(self, header, values):
+        '''
+        :param header: The column header
+        :type header: string
+        :param values: The list of values in the column
+        :type values: list
+
+        '''
+        self.__header = header
+        self.__rows = {}
+        self.rebuild(values)
+
+    def header(self):
+        '''Get the header of the indexed column.
+
+        :rtype: string
+
+        '''
+        return self.__header
+
+    def find(self, value):
+        '''Get the indexes of the rows containing the given value.
+
+        :param value: The cell value
+
+        :rtype: list of ints
+
+        '''
+        return list(self.__rows.get(value, []))
+
+    def values(self):
+        '''Get the list of distinct values in the column.
+
+        :rtype: list
+
+        '''
+        return list(self.__rows.keys())
+
+    def rebuild(self, values):
+        '''Rebuild the entire index.
+
+        :param values: The list of values in the column
+        :type values: list
+
+        '''
+        self.__rows = {}
+        for row, value in enumerate(values):
+            self.__rows.setdefault(value, []).append(row)
+
+    def add(self, row, value):
+        '''Add a row to the end of the index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value
+
+        '''
+        self.__rows.setdefault(value, []).append(row)
+
+    def set(self, row, oldValue, newValue):
+        '''Change the value of a row in the index.
+
+        :param row: The row index
+        :type row: int
+        :param oldValue: The previous cell value
+        :param newValue: The new cell value
+
+        '''
+        self.__discard(row, oldValue)
+        insort(self.__rows.setdefault(newValue, []), row)
+
+    def remove(self, row, value):
+        '''Remove a row from the index.
+
+        The indexes of all rows after the removed row are shifted down, which
+        requires updating the entire index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value of the removed row
+
+        '''
+        self.__discard(row, value)
+
+        # Row lists are sorted, so only the end of each list changes
+        for rows in self.__rows.values():
+            for position in range(bisect_right(rows, row), len(rows)):
+                rows[position] -= 1
+
+    ##### Private functions
+
+    def __discard(self, row, value):
+        '''Discard a row from the list of rows for a value.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value
+
+        '''
+        rows = self.__rows[value]
+        rows.remove(row)
+
+        if len(rows) == 0:
+            del self.__rows[value]
+
+
+class SortedIndex:
+    '''The SortedIndex class keeps the values of a single column in sorted
+    order, which allows finding the rows whose values fall within a range,
+    or start with a prefix, without scanning the column.
+
+    Queries take O(log n + k) time, where k is the number of matching rows,
+    and return the matching row indexes in order of their values.
+
+    Empty cells (missing values) are not included in the index. When the
+    column has a type, query values given as strings are converted to the
+    column type.
+
+    Indexes are created by, and kept up to date by the :class:`icsv.icsv`
+    class as rows are added, changed, and removed.
+
+    '''
+
+    def __init__(self, header, values, valueType=None):
+        '''
+        :param header: The column header
+        :type header: string
+        :param values: The list of values in the column
+        :type values: list
+        :param valueType: The type of the column, or None if it is untyped
+        :type valueType: type
+
+        '''
+        self.__header = header
+        self.__valueType = valueType
+
+        # Parallel lists of values, and the rows containing them, sorted
+        # by value and then by row
+        self.__keys = []
+        self.__rows = []
+
+        self.rebuild(values)
+
+    def header(self):
+        '''Get the header of the indexed column.
+
+        :rtype: string
+
+        '''
+        return self.__header
+
+    def between(self, low, high):
+        '''Get the rows whose values are within a range (inclusive).
+
+        :param low: The lowest value
+        :param high: The highest value
+
+        :rtype: list of ints
+
+        :raises Exception: If the values cannot be compared with the values
+                           of the column
+
+        '''
+        start = self.__search(bisect_left, self.__convert(low))
+        end = self.__search(bisect_right, self.__convert(high))
+        return self.__rows[start:end]
+
+    def lessThan(self, value, inclusive=False):
+        '''Get the rows whose values are less than a value.
+
+        :param value: The value
+        :param inclusive: True to include rows equal to the value
+        :type inclusive: bool
+
+        :rtype: list of ints
+
+        :raises Exception: If the value cannot be compared with the values
+                           of the column
+
+        '''
+        search = bisect_right if inclusive else bisect_left
+        end = self.__search(search, self.__convert(value))
+        return self.__rows[:end]
+
+    def greaterThan(self, value, inclusive=False):
+        '''Get the rows whose values are greater than a value.
+
+        :param value: The value
+        :param inclusive: True to include rows equal to the value
+        :type inclusive: bool
+
+        :rtype: list of ints
+
+        :raises Exception: If the value cannot be compared with the values
+                           of the column
+
+        '''
+        search = bisect_left if inclusive else bisect_right
+        start = self.__search(search, self.__convert(value))
+        return self.__rows[start:]
+
+    def prefix(self, prefix):
+        '''Get the rows whose string values start with a prefix.
+
+        :param prefix: The prefix
+        :type prefix: string
+
+        :rtype: list of ints
+
+        :raises Exception: If the prefix is not a string
+        :raises Exception: If the column is typed, and its type is not str
+        :raises Exception: If the column contains values which are not
+                           strings
+
+        '''
+        if self.__valueType not in (None, str):
+            raise Exception("Cannot find a prefix in column %s of type %s" %
+                            (self.__header, self.__valueType.__name__))
+        if not isinstance(prefix, str):
+            raise Exception("Prefix must be a string: %r" % (prefix,))
+
+        start = self.__search(bisect_left, prefix)
+
+        end = start
+        while end < len(self.__keys) and \
+                self.__keys[end].startswith(prefix):
+            end += 1
+
+        return self.__rows[start:end]
+
+    def rebuild(self, values):
+        '''Rebuild the entire index.
+
+        :param values: The list of values in the column
+        :type values: list
+
+        :raises Exception: If the values cannot be compared with each other
+
+        '''
+        try:
+            pairs = sorted((value, row) for row, value in enumerate(values)
+                           if value != '')
+        except TypeError:
+            raise Exception("Cannot index column %s, since its values cannot "
+                            "be compared with each other" % self.__header)
+
+        self.__keys = [value for value, _ in pairs]
+        self.__rows = [row for _, row in pairs]
+
+    def add(self, row, value):
+        '''Add a row to the end of the index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value
+
+        :raises Exception: If the value cannot be compared with the values
+                           of the column
+
+        '''
+        if value != '':
+            # The row is after all existing rows with the same value
+            position = self.__search(bisect_right, value)
+            self.__keys.insert(position, value)
+            self.__rows.insert(position, row)
+
+    def set(self, row, oldValue, newValue):
+        '''Change the value of a row in the index.
+
+        :param row: The row index
+        :type row: int
+        :param oldValue: The previous cell value
+        :param newValue: The new cell value
+
+        '''
+        self.__discard(row, oldValue)
+
+        if newValue != '':
+            position = self.__position(row, newValue)
+            self.__keys.insert(position, newValue)
+            self.__rows.insert(position, row)
+
+    def remove(self, row, value):
+        '''Remove a row from the index.
+
+        The indexes of all rows after the removed row are shifted down, which
+        requires updating the entire index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value of the removed row
+
+        '''
+        self.__discard(row, value)
+
+        rows = self.__rows
+        for position in range(len(rows)):
+            if rows[position] > row:
+                rows[position] -= 1
+
+    ##### Private functions
+
+    def __convert(self, value):
+        '''Convert a query value to the type of the column.
+
+        :param value: The query value
+
+        '''
+        if self.__valueType is None:
+            return value
+
+        return convertValue(value, self.__valueType)
+
+    def __search(self, search, value):
+        '''Find the position of a value within the sorted values.
+
+        :param search: The bisect function used to search
+        :type search: function
+        :param value: The value
+
+        :rtype: int
+
+        :raises Exception: If the value cannot be compared with the values
+                           of the column
+
+        '''
+        try:
+            return search(self.__keys, value)
+        except TypeError:
+            raise Exception("Cannot compare %r with the values of column %s" %
+                            (value, self.__header))
+
+    def __position(self, row, value):
+        '''Get the position of a row and value within the index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value
+
+        :rtype: int
+
+        '''
+        # Rows with the same value are sorted by row
+        start = self.__search(bisect_left, value)
+        end = bisect_right(self.__keys, value, start)
+        return bisect_left(self.__rows, row, start, end)
+
+    def __discard(self, row, value):
+        '''Discard a row from the index.
+
+        :param row: The row index
+        :type row: int
+        :param value: The cell value
+
+        '''
+        if value != '':
+            position = self.__position(row, value)
+            del self.__keys[position]
+            del self.__rows[position]
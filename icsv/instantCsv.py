@@ -1,7 +1,17 @@
-from copy import deepcopy
-from os.path import exists
-
-from icsv.base import Row, Col, Cell
+from itertools import compress
+from os import stat
+
+from icsv.base import Row, Rows, Col, ColumnView, Cell
+from icsv.follow import TailReader
+from icsv.groupBy import GroupBy
+from icsv.index import HashIndex, SortedIndex
+from icsv.mapped import MappedCsv
+from icsv.parallel import parseFile
+from icsv.reader import Reader
+from icsv.schema import HeaderSchema, validateSchema, convertValue, \
+     convertColumn
+from icsv.source import SourceFile
+from icsv.storage import createStorage
 
 
 class icsv:
@@ -15,27 +25,100 @@ class icsv:
     The icsv class provides an interface for easily adding new data to a
     CSV, writing the data to a CSV file, and creating an icsv from a file.
 
+    The data can either be stored by row (the default), where each row is a
+    dictionary mapping headers to values, or by column, where each column
+    is a single list of values. Column storage uses much less memory for
+    CSVs with many columns, and allows fetching columns without scanning
+    every row.
+
+    A schema can be given which maps column headers to the type of the
+    values in that column (str, int, float, bool, datetime.date or
+    datetime.datetime). String values stored in typed columns are converted
+    to the column type. When using column storage, int and float columns
+    are stored in compact arrays.
+
     '''
-    def __init__(self, headers, delimiter=','):
+    def __init__(self, headers, delimiter=',', storage="row", schema=None):
         '''
         :param headers: The list of column headers
         :type headers: list of strings
         :param delimiter: The CSV delimiter
         :type delimiter: string
+        :param storage: The type of storage to use for the data ("row"
+                        or "column")
+        :type storage: string
+        :param schema: The dictionary mapping column headers to column types
+        :type schema: dict
+
+        :raises Exception: If an unknown storage type is given
+        :raises Exception: If the schema contains unknown headers or types
 
         '''
         self.__headers = headers
         self.__delimiter = delimiter
+        self.__storage = storage
+
+        # Maps headers to their position within each row
+        self.__headerSchema = HeaderSchema(headers)
 
-        # List of dictionaries mapping headers to values for each
-        # row in the CSV
-        self.__data = []
+        self.__schema = {} if schema is None else dict(schema)
+        validateSchema(self.__headerSchema, self.__schema)
+
+        # Storage for the values of each row in the CSV
+        self.__data = createStorage(storage, self.__headerSchema)
+        for header, valueType in self.__schema.items():
+            self.__data.setColumn(header, convertColumn([], valueType))
+
+        # Indexes of column values which are kept up to date as the
+        # data changes
+        self.__indexes = []
+
+        # The file the data was loaded from, and the options it was
+        # loaded with
+        self.__source = None
+        self.__sourceOptions = None
+        self.__sourceReader = None
+
+        # The index of the row loaded from an incomplete final line
+        self.__partialRow = None
 
     @classmethod
     def fromFile(cls, filename, headers=None, delimiter=',',
-                 containsHeaders=True):
+                 containsHeaders=True, storage="row", workers=1,
+                 schema=None, cache=None, columns=None, skipRows=0,
+                 maxRows=None, start=None, end=None):
         '''Create an icsv from a given CSV file.
 
+        When ``workers`` is greater than one, the file is split into chunks
+        which are parsed in parallel by a pool of worker processes. The
+        result is identical to parsing the file serially. Compressed files
+        cannot be split, and are always parsed serially.
+
+        Files compressed with gzip, bzip2, or xz are decompressed as they
+        are read (see :class:`icsv.Reader`).
+
+        When ``columns`` is given, only the requested columns are parsed
+        and stored (see :class:`icsv.Reader`).
+
+        A slice of the rows can be loaded with ``skipRows`` and ``maxRows``,
+        and a slice of the file can be loaded with ``start`` and ``end``
+        (see :class:`icsv.Reader`), so that several jobs can each load their
+        own part of a large file::
+
+            size = os.stat(filename).st_size
+            part = icsv.fromFile(filename, start=size // 2, end=size)
+
+        Rows are skipped and limited serially, but byte ranges can also be
+        parsed by several workers.
+
+        When a :class:`icsv.FileCache` is given, the parsed rows are loaded
+        from the cache if the file has not changed since it was cached, and
+        are stored in the cache otherwise.
+
+        Rows appended to the file later on can be loaded with
+        :func:`icsv.icsv.refresh`, unless only a slice of the file
+        was loaded.
+
         :param filename: The path to the CSV file
         :type filename: string
         :param headers: The list of CSV headers. If this is None they will be
@@ -46,48 +129,262 @@ class icsv:
         :param containsHeaders: True if the file list the headers as the first
                                 line, False if it does not
         :type containsHeaders: bool
+        :param storage: The type of storage to use for the data ("row"
+                        or "column")
+        :type storage: string
+        :param workers: The number of worker processes used to parse the file
+        :type workers: int
+        :param schema: The dictionary mapping column headers to column types.
+                       Each typed column is converted in bulk once the
+                       file has been read
+        :type schema: dict
+        :param cache: The cache of parsed files, or None to always parse
+                      the file
+        :type cache: :class:`icsv.FileCache`
+        :param columns: The list of column headers, or column indexes, to
+                        keep in order, or None to keep all of the columns
+        :type columns: list of strings or ints
+        :param skipRows: The number of rows to skip before the first row
+                         which is loaded
+        :type skipRows: int
+        :param maxRows: The maximum number of rows to load, or None to load
+                        all of the remaining rows
+        :type maxRows: int
+        :param start: Only load the lines which start at, or after this byte
+                      offset, or None to start at the first line
+        :type start: int
+        :param end: Only load the lines which start before this byte offset,
+                    or None to end at the last line
+        :type end: int
 
         :raises Exception: If the file does not exist
         :raises Exception: If ``headers`` is None and ``containsHeaders``
                            is False
+        :raises Exception: If an unknown column header, or an invalid column
+                           index is given
+        :raises Exception: If ``skipRows`` or ``maxRows`` is negative
+        :raises Exception: If a byte range is given for a compressed file
+        :raises Exception: If an unknown storage type is given
+        :raises Exception: If the schema contains unknown headers or types
+        :raises Exception: If a value cannot be converted to its column type
 
         '''
-        # CSV file must actually exist
-        if not exists(filename):
-            raise Exception("File does not exist: %s" % filename)
+        reader = Reader(filename, headers, delimiter, containsHeaders,
+                        columns=columns, skipRows=skipRows, maxRows=maxRows,
+                        start=start, end=end)
 
-        # Must be able to determine the headers
-        if headers is None and not containsHeaders:
-            raise Exception("Could not determine headers. If 'headers' is " \
-                                "None, then 'containsHeaders' must be True")
+        # Create the CSV file
+        csv = icsv(reader.headers(), delimiter, storage, schema)
+        csv.__sourceOptions = (headers, delimiter, containsHeaders, storage,
+                               workers, schema, cache, columns)
+
+        # Used to detect changes made to the file while it is loaded
+        info = stat(filename)
+
+        if cache is not None:
+            # The cached rows depend on all of the options that change them
+            key = (reader.headers(), delimiter, containsHeaders,
+                   sorted((header, valueType.__name__)
+                          for header, valueType in csv.__schema.items()))
+            if reader.sliced():
+                key += ((skipRows, maxRows, start, end),)
+
+            columns = cache.load(filename, key)
+            if columns is not None:
+                csv.__data.extendColumns(columns)
+                csv.__trackSource(filename, info, reader)
+                return csv
+
+        # Skipping and limiting rows requires counting them in order
+        parallel = workers > 1 and reader.compression() is None and \
+            skipRows == 0 and maxRows is None
+
+        if parallel:
+            normalize = csv.__headerSchema.normalize
+            rows = parseFile(filename, delimiter, containsHeaders, workers,
+                             reader.positions(), start, end)
+            rows = (normalize(values) for values in rows)
+        else:
+            rows = reader.lists()
 
-        fd = open(filename, 'r')
-        content = fd.read()
-        fd.close()
+        for values in rows:
+            csv.__data.append(values)
 
-        # Split the content into separate rows
-        rows = content.strip().split('\n')
+        # Convert each typed column all at once
+        for header, valueType in csv.__schema.items():
+            values = convertColumn(csv.__data.column(header), valueType)
+            csv.__data.setColumn(header, values)
 
-        # Split each row into separate columns
-        splitRows = [row.strip().split(delimiter) for row in rows]
+        if cache is not None:
+            cache.store(filename, key, [csv.__data.column(header) for
+                                        header in csv.headers()], info)
 
-        data = []
+        csv.__trackSource(filename, info, reader)
+        return csv
 
-        # Grab the headers from the first line in the file
-        if headers is None:
-            headers = splitRows[0].split(delimiter)
+    @classmethod
+    def iterFile(cls, filename, headers=None, delimiter=',',
+                 containsHeaders=True, columns=None, skipRows=0, maxRows=None,
+                 start=None, end=None):
+        '''Lazily iterate over the rows of a given CSV file.
 
-        # Create row dictionaries for all the other data
-        startIndex = 1 if containsHeaders else 0
-        for splitRow in splitRows[startIndex:]:
-            dataMap = dict(zip(headers, splitRow))
-            data.append(dataMap)
+        Unlike :func:`icsv.icsv.fromFile` the file is never loaded into memory
+        as a whole, rows are parsed one at a time as they are requested.
 
-        # Create the CSV file
-        csv = icsv(headers, delimiter)
-        csv.__data = data
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param columns: The list of column headers, or column indexes, to
+                        keep in order, or None to keep all of the columns
+        :type columns: list of strings or ints
+        :param skipRows: The number of rows to skip before the first row
+                         which is read
+        :type skipRows: int
+        :param maxRows: The maximum number of rows to read, or None to read
+                        all of the remaining rows
+        :type maxRows: int
+        :param start: Only read the lines which start at, or after this byte
+                      offset, or None to start at the first line
+        :type start: int
+        :param end: Only read the lines which start before this byte offset,
+                    or None to end at the last line
+        :type end: int
+
+        :rtype: An :class:`icsv.Reader` object
 
-        return csv
+        :raises Exception: If the file does not exist
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+        :raises Exception: If an unknown column header, or an invalid column
+                           index is given
+        :raises Exception: If ``skipRows`` or ``maxRows`` is negative
+        :raises Exception: If a byte range is given for a compressed file
+
+        '''
+        return Reader(filename, headers, delimiter, containsHeaders,
+                      columns=columns, skipRows=skipRows, maxRows=maxRows,
+                      start=start, end=end)
+
+    @classmethod
+    def mapFile(cls, filename, headers=None, delimiter=',',
+                containsHeaders=True, indexFilename=None, encoding=None):
+        '''Open a given CSV file for random access without parsing it.
+
+        The file is memory mapped, and rows are only decoded when they are
+        accessed. See :class:`icsv.MappedCsv`.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param indexFilename: The path to a file used to store the row index,
+                              or None to always build the index in memory
+        :type indexFilename: string
+        :param encoding: The encoding of the file, or None to use the
+                         locale's preferred encoding
+        :type encoding: string
+
+        :rtype: An :class:`icsv.MappedCsv` object
+
+        :raises Exception: If the file does not exist
+        :raises Exception: If the file is compressed
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+
+        '''
+        return MappedCsv(filename, headers, delimiter, containsHeaders,
+                         indexFilename, encoding)
+
+    @classmethod
+    def followFile(cls, filename, headers=None, delimiter=',',
+                   containsHeaders=True, fromStart=True):
+        '''Read the rows appended to a given CSV file while it is being
+        written. See :class:`icsv.TailReader`.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param fromStart: True to read the rows already in the file, False
+                          to only read rows appended from now on
+        :type fromStart: bool
+
+        :rtype: An :class:`icsv.TailReader` object
+
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+
+        '''
+        return TailReader(filename, headers, delimiter, containsHeaders,
+                          fromStart)
+
+    def refresh(self):
+        '''Load the rows appended to the file this CSV was loaded from.
+
+        Only the bytes appended to the file since it was last loaded are
+        read and parsed, and the new rows are added to the end of this CSV.
+        If the file has been rewritten (replaced, truncated, or changed
+        before the end of the previously loaded data) the whole file is
+        loaded again instead.
+
+        A final line which was incomplete when it was loaded is replaced
+        once it has been completed, wherever its row has been moved to by
+        :func:`icsv.icsv.sort`. If its row has been removed, the whole file
+        is loaded again instead.
+
+        :returns: The number of rows added, or the total number of rows if
+                  the whole file was loaded again
+        :rtype: int
+
+        :raises Exception: If this CSV was not loaded from a whole file
+        :raises Exception: If a value cannot be converted to its column type
+
+        '''
+        source = self.__source
+        if source is None:
+            raise Exception("Cannot refresh a CSV which was not loaded " \
+                                "from a whole file")
+
+        if source.rewritten():
+            self.__reload()
+            return self.numRows()
+
+        lines, completesPartial = source.readLines()
+        rows = list(map(self.__sourceReader.parseLine, lines))
+
+        if completesPartial:
+            row = self.__partialRow
+            if row is None:
+                # The row loaded from the incomplete line has been removed
+                self.__reload()
+                return self.numRows()
+
+            for header, value in zip(self.__headers, rows.pop(0)):
+                self.setCell(header, value, row)
+            self.__partialRow = None
+
+        self.addRows(rows)
+
+        return len(rows)
 
     def write(self, filename, useHeaders=True, overwrite=True):
         '''Write the data to the given CSV file.
@@ -147,15 +444,32 @@ class icsv:
         '''
         return self.__headers
 
+    def schema(self):
+        '''Get the dictionary mapping column headers to column types.
+
+        :rtype: dict
+
+        '''
+        return self.__schema
+
+    def storage(self):
+        '''Get the type of storage used for the data of this CSV.
+
+        :rtype: string
+
+        '''
+        return self.__storage
+
     def data(self):
-        '''Get the list of :class:`icsv.Row` objects pertaining to the rows
-        of this CSV.
+        '''Get the sequence of :class:`icsv.Row` objects pertaining to the
+        rows of this CSV.
 
-        :rtype: list of :class:`icsv.Row` objects
+        The sequence is lazy, rows are only created as they are accessed.
+
+        :rtype: An :class:`icsv.Rows` sequence of :class:`icsv.Row` objects
 
         '''
-        # Convert all rows into actual Row objects
-        return [Row(self.__headers, r, self.__delimiter) for r in self.__data]
+        return Rows(self)
 
     def setCell(self, header, value, row=-1):
         '''Set the value of a cell.
@@ -173,8 +487,16 @@ class icsv:
         self.__validateRow(row)
         self.__validateHeader(header)
 
-        row = self.__data[row]
-        row[header] = value
+        if header in self.__schema:
+            value = convertValue(value, self.__schema[header])
+
+        oldValue = self.__data.get(row, header)
+        self.__data.set(row, header, value)
+
+        row = row % self.numRows()
+        for index in self.__indexes:
+            if index.header() == header:
+                index.set(row, oldValue, value)
 
     def addRow(self, items):
         '''Add a row of data to the CSV.
@@ -197,6 +519,61 @@ class icsv:
         else:
             raise Exception("Unknown row type. Expected list or dictionary.")
 
+    def addRows(self, rows):
+        '''Add several rows of data to the CSV at once.
+
+        ``rows`` can be any iterable (such as a list or a generator) of rows,
+        where each row can be a list, tuple, or dictionary of values. The
+        rows are validated before any of them are added, so either all of
+        the rows are added, or none of them are.
+
+        :param rows: The iterable of rows
+        :type rows: iterable of lists, tuples, or dictionaries
+
+        :raises Exception: If a list or tuple row is not equal to the
+                           number of headers
+        :raises Exception: If a dictionary row contains entries for
+                           unknown headers
+        :raises Exception: If a row is not a list, tuple, or dictionary
+
+        '''
+        numCols = self.numCols()
+        toList = self.__headerSchema.toList
+
+        batch = []
+        keys = set()
+        for items in rows:
+            if isinstance(items, (list, tuple)):
+                if len(items) != numCols:
+                    raise Exception("Expected %s items, but got %s" %
+                                    (numCols, len(items)))
+                batch.append(list(items))
+            elif isinstance(items, dict):
+                keys.update(items)
+                batch.append(toList(items))
+            else:
+                raise Exception("Unknown row type. Expected list, tuple, " \
+                                    "or dictionary.")
+
+        # Do not allow invalid headers to be added
+        invalid = [h for h in keys if h not in self.__headerSchema]
+        if len(invalid) > 0:
+            raise Exception("Attempting to add unknown headers: %s" % invalid)
+
+        # Convert values for typed columns
+        for header, valueType in self.__schema.items():
+            position = self.__headerSchema.index(header)
+            for values in batch:
+                values[position] = convertValue(values[position], valueType)
+
+        start = self.numRows()
+        self.__data.extend(batch)
+
+        for index in self.__indexes:
+            header = index.header()
+            for row in range(start, self.numRows()):
+                index.add(row, self.__data.get(row, header))
+
     def removeRow(self, row=-1):
         '''Remove the given row.
 
@@ -207,7 +584,21 @@ class icsv:
 
         '''
         self.__validateRow(row)
-        del self.__data[row]
+
+        row = row % self.numRows()
+        values = [self.__data.get(row, index.header())
+                  for index in self.__indexes]
+
+        self.__data.remove(row)
+
+        for index, value in zip(self.__indexes, values):
+            index.remove(row, value)
+
+        # Keep track of the row loaded from an incomplete final line
+        if self.__partialRow == row:
+            self.__partialRow = None
+        elif self.__partialRow is not None and self.__partialRow > row:
+            self.__partialRow -= 1
 
     def getRow(self, row=-1):
         '''Get the given row.
@@ -219,11 +610,29 @@ class icsv:
 
         '''
         self.__validateRow(row)
-        return Row(self.__headers, self.__data[row], self.__delimiter)
+        return Row(self.__headerSchema, self.__data.rowValues(row),
+                   self.__delimiter)
+
+    def getRows(self, start=0, stop=None):
+        '''Get a slice of the rows.
+
+        :param start: The index of the first row
+        :type start: int
+        :param stop: The index after the last row (the end of the CSV
+                     by default)
+        :type stop: int
+
+        :rtype: list of :class:`icsv.Row` objects
+
+        '''
+        return [self.getRow(i) for i in range(self.numRows())[start:stop]]
 
     def getCol(self, header):
         '''Get the :class:`icsv.Col` object for the given column header.
 
+        The column data is a read only :class:`icsv.ColumnView` of the
+        values, which is not copied.
+
         :param header: The column header
         :type header: string
 
@@ -233,8 +642,7 @@ class icsv:
 
         '''
         self.__validateHeader(header)
-        data = [row.get(header, '') for row in self.__data]
-        return Col(header, data)
+        return Col(header, ColumnView(self.__data.column(header)))
 
     def getCell(self, row, header):
         '''Get the :class:`icsv.Cell` object contained at the given
@@ -254,7 +662,7 @@ class icsv:
         self.__validateRow(row)
         self.__validateHeader(header)
 
-        value = self.__data[row].get(header, '')
+        value = self.__data.get(row, header)
         return Cell(row, header, value)
 
     def getHeaderIndex(self, header):
@@ -268,8 +676,7 @@ class icsv:
         :raises Exception: If an unknown header is given
 
         '''
-        self.__validateHeader(header)
-        return self.__headers.index(header)
+        return self.__headerSchema.index(header)
 
     def getHeader(self, index):
         '''Get the column header for the given column index.
@@ -298,10 +705,140 @@ class icsv:
     # TODO: ability to add new columns
     # TODO: ability to remove columns
 
-    # TODO: ability to re-arrange rows
+    def sort(self, headers, key=None, reverse=False):
+        '''Sort the rows of this CSV by the values of one or more columns.
+
+        The sort is stable. Values in typed columns are compared as their
+        type, and missing values in typed columns are sorted after all
+        other values, in either direction. Indexes are rebuilt once the
+        rows have been sorted.
+
+        To sort a CSV file which is too large to load into memory, see
+        :func:`icsv.sortFile`.
+
+        :param headers: The column header, or list of column headers, to
+                        sort by
+        :type headers: string or list of strings
+        :param key: A function applied to each value before it is compared,
+                    or None
+        :type key: function
+        :param reverse: True to sort in descending order
+        :type reverse: bool
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        from icsv.sort import sortKey
+
+        if isinstance(headers, str):
+            headers = [headers]
+
+        for header in headers:
+            self.__validateHeader(header)
+
+        getKey = sortKey([self.__schema.get(header) for header in headers],
+                         key, reverse=reverse)
+        keys = list(map(getKey, zip(*[self.__data.column(header)
+                                      for header in headers])))
+
+        order = sorted(range(self.numRows()), key=keys.__getitem__,
+                       reverse=reverse)
+        self.__data.reorder(order)
+        self.__rebuildIndexes()
+
+        if self.__partialRow is not None:
+            self.__partialRow = order.index(self.__partialRow)
+
     # TODO: ability to re-arrange columns
 
-    # TODO: ability to search for data
+    def createIndex(self, header):
+        '''Create a hash index for the values of a column.
+
+        The index is kept up to date as rows are added, changed, and removed,
+        and allows :func:`icsv.icsv.find` to find the rows containing a
+        value without scanning the column.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: An :class:`icsv.HashIndex` object
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        self.__validateHeader(header)
+
+        index = self.__getIndex(header, HashIndex)
+        if index is None:
+            index = HashIndex(header, self.__data.column(header))
+            self.__indexes.append(index)
+
+        return index
+
+    def createSortedIndex(self, header):
+        '''Create a sorted index for the values of a column.
+
+        The index is kept up to date as rows are added, changed, and removed,
+        and supports finding rows whose values are within a range, or start
+        with a prefix, without scanning the column::
+
+            index = csv.createSortedIndex("timestamp")
+            rows = index.between(start, end)
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: An :class:`icsv.SortedIndex` object
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        self.__validateHeader(header)
+
+        index = self.__getIndex(header, SortedIndex)
+        if index is None:
+            index = SortedIndex(header, self.__data.column(header),
+                                self.__schema.get(header))
+            self.__indexes.append(index)
+
+        return index
+
+    def dropIndex(self, header):
+        '''Remove all indexes for the values of a column.
+
+        :param header: The column header
+        :type header: string
+
+        '''
+        self.__indexes = [index for index in self.__indexes
+                          if index.header() != header]
+
+    def find(self, header, value):
+        '''Find the rows which contain the given value in a column.
+
+        If the column has been indexed with :func:`icsv.icsv.createIndex`
+        this does not need to scan the column.
+
+        :param header: The column header
+        :type header: string
+        :param value: The cell value
+
+        :returns: The indexes of the rows containing the value
+        :rtype: list of ints
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        self.__validateHeader(header)
+
+        if header in self.__schema:
+            value = convertValue(value, self.__schema[header])
+
+        index = self.__getIndex(header, HashIndex)
+        if index is not None:
+            return index.find(value)
+
+        return self.filterRows(header, lambda cell: cell == value)
 
     def filter(self, fn):
         '''Apply a filter function to the CSV data.
@@ -319,55 +856,288 @@ class icsv:
         '''
         allCells = []
 
-        for rowIdx in range(len(self.__data)):
-            row = self.__data[rowIdx]
-
-            for header in self.__headers:
-                cellValue = row.get(header, '')
-
+        for rowIdx, values in enumerate(self.__data.rows()):
+            for header, cellValue in zip(self.__headers, values):
                 if fn(rowIdx, header, cellValue):
                     cell = Cell(rowIdx, header, cellValue)
                     allCells.append(cell)
 
         return allCells
 
-    def map(self, fn, overwrite=False):
+    def filterRows(self, header, fn):
+        '''Apply a filter function to the values of a single column.
+
+        Unlike :func:`icsv.icsv.filter`, only the values of the given column
+        are passed to the filter function, which must have the following
+        signature::
+
+            filterFn(cellValue)
+
+        :param header: The column header
+        :type header: string
+        :param fn: The filter function
+        :type fn: function(cellValue)
+
+        :returns: The indexes of the rows for which ``fn`` returned True
+        :rtype: list of ints
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        self.__validateHeader(header)
+
+        column = self.__data.column(header)
+        return list(compress(range(len(column)), map(fn, column)))
+
+    def filterCol(self, header, fn):
+        '''Apply a filter function to an entire column at once.
+
+        The filter function is called a single time with a copy of the values
+        in the column, and must return a sequence containing a True or False
+        value for each row. It must have the following signature::
+
+            filterFn(columnValues)
+
+        :param header: The column header
+        :type header: string
+        :param fn: The filter function
+        :type fn: function(columnValues)
+
+        :returns: The indexes of the rows for which ``fn`` returned True
+        :rtype: list of ints
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If ``fn`` does not return a value for each row
+
+        '''
+        self.__validateHeader(header)
+
+        # The function is given a copy, so it cannot change the data
+        column = self.__data.copyColumn(header)
+        selected = list(fn(column))
+        if len(selected) != len(column):
+            raise Exception("Expected %s filter values, but got %s" %
+                            (len(column), len(selected)))
+
+        return list(compress(range(len(column)), selected))
+
+    def map(self, fn, overwrite=False, headers=None):
         '''Map all of the values of the CSV.
 
         The map function must have the following signature::
 
             mapFn(rowIndex, columnHeader, cellValue)
 
+        When ``headers`` is given, the map function is only called for the
+        cells in those columns. The mapped CSV shares the data of all other
+        columns with this CSV, and it is only copied when it is changed.
+        Mapped values in typed columns are converted to the column type.
+
         :param fn: The map function
         :type fn: function(rowIndex, columnHeader, cellValue)
         :param overwrite: True to replace the current icsv data with
                           the mapped data
         :type overwrite: bool
+        :param headers: The list of column headers to map (all columns
+                        by default)
+        :type headers: list of strings
 
         :returns: An :class:`icsv.icsv` object containing the mapped data
         :rtype: An :class:`icsv.icsv` object
 
+        :raises Exception: If an unknown header is given
+        :raises Exception: If a mapped value cannot be converted to its
+                           column type
+
         '''
-        if overwrite:
-            csv = self  # Update this CSV data
-        else:
-            # Create a copy of the current CSV file
-            csv = icsv(self.__headers, self.__delimiter)
-            csv.__data = deepcopy(self.__data)
+        if headers is None:
+            headers = self.__headers
+
+        for header in headers:
+            self.__validateHeader(header)
 
-        for rowIdx in range(len(self.__data)):
-            row = self.__data[rowIdx]
+        columns = {}
+        for header in headers:
+            column = self.__data.column(header)
+            columns[header] = [fn(rowIdx, header, cell)
+                               for rowIdx, cell in enumerate(column)]
 
-            for header in self.__headers:
-                cell = row.get(header, '')
-                newValue = fn(rowIdx, header, cell)
+            if header in self.__schema:
+                columns[header] = convertColumn(columns[header],
+                                                self.__schema[header])
 
-                # Store the new value
-                csv.__data[rowIdx][header] = newValue
+        csv = self.__mapTarget(overwrite)
+        csv.__data.setColumns(columns)
+        csv.__rebuildIndexes()
 
         return csv
 
-    # TODO: ability to merge two icsvs into one -- not sure how this works
+    def mapCol(self, header, fn, overwrite=False):
+        '''Map an entire column of the CSV at once.
+
+        The map function is called a single time with a copy of the values in
+        the column, and must return a sequence containing the new value for
+        each row. It must have the following signature::
+
+            mapFn(columnValues)
+
+        The mapped CSV shares the data of all other columns with this CSV,
+        and it is only copied when it is changed. Mapped values in a typed
+        column are converted to the column type.
+
+        :param header: The column header
+        :type header: string
+        :param fn: The map function
+        :type fn: function(columnValues)
+        :param overwrite: True to replace the current icsv data with
+                          the mapped data
+        :type overwrite: bool
+
+        :returns: An :class:`icsv.icsv` object containing the mapped data
+        :rtype: An :class:`icsv.icsv` object
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If ``fn`` does not return a value for each row
+        :raises Exception: If a mapped value cannot be converted to the
+                           column type
+
+        '''
+        self.__validateHeader(header)
+
+        # The function is given a copy, so it cannot change the data
+        values = fn(self.__data.copyColumn(header))
+        if not hasattr(values, "__len__"):
+            values = list(values)
+
+        if len(values) != self.numRows():
+            raise Exception("Expected %s mapped values, but got %s" %
+                            (self.numRows(), len(values)))
+
+        if header in self.__schema:
+            values = convertColumn(values, self.__schema[header])
+
+        csv = self.__mapTarget(overwrite)
+        csv.__data.setColumn(header, values)
+        csv.__rebuildIndexes()
+
+        return csv
+
+    def groupBy(self, headers):
+        '''Group the rows of this CSV by the values of one or more columns,
+        so that aggregates can be computed for each group::
+
+            totals = csv.groupBy("region").agg({"price": ["sum", "max"]})
+
+        The aggregates are computed in a single pass over the rows, and are
+        returned as a new CSV (see :class:`icsv.GroupBy`). Values in typed
+        columns are aggregated as their type.
+
+        :param headers: The column header, or list of column headers, to
+                        group by
+        :type headers: string or list of strings
+
+        :rtype: An :class:`icsv.GroupBy` object
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        return GroupBy(self.__headers, headers, self.__data.rows,
+                       self.__schema, self.__delimiter, self.__storage)
+
+    def join(self, other, on, how="inner", suffix="_right"):
+        '''Join the rows of this CSV with the rows of another CSV which have
+        the same values in one or more key columns.
+
+        The joined CSV contains all of the columns of this CSV, followed by
+        the columns of the other CSV which are not key columns. Columns of
+        the other CSV whose header is also a header of this CSV have the
+        suffix appended to their header. The joined CSV uses the delimiter
+        and storage of this CSV, and the schemas of both CSVs.
+
+        The join builds a hash table of the rows of the other CSV, so it
+        only reads each CSV once::
+
+            orders = icsv.fromFile("/tmp/orders.csv")
+            customers = icsv.fromFile("/tmp/customers.csv")
+            joined = orders.join(customers, on="customerId", how="left")
+
+        An inner join only contains the rows with a matching key in both
+        CSVs. A left join also contains the rows of this CSV without a
+        matching key, and an outer join also contains the rows of the other
+        CSV without a matching key. The columns from the side without a
+        matching row are left empty. Rows are in the order of this CSV,
+        followed by the unmatched rows of the other CSV. As with NULL values
+        in SQL, keys which contain a missing value (an empty string) never
+        match, so their rows are always unmatched.
+
+        Key values are compared as the type of their key column. A key
+        column which is only typed in one of the CSVs is converted to that
+        type in both CSVs, and is typed in the joined CSV.
+
+        To join CSV files which are too large to load into memory, see
+        :func:`icsv.joinFiles`.
+
+        :param other: The CSV to join with
+        :type other: An :class:`icsv.icsv` object
+        :param on: The column header, or list of column headers, to join on
+        :type on: string or list of strings
+        :param how: The type of join ("inner", "left", or "outer")
+        :type how: string
+        :param suffix: The suffix appended to headers of the other CSV which
+                       are also headers of this CSV
+        :type suffix: string
+
+        :returns: An :class:`icsv.icsv` object containing the joined rows
+        :rtype: An :class:`icsv.icsv` object
+
+        :raises Exception: If an unknown join type is given
+        :raises Exception: If an unknown header is given
+        :raises Exception: If a joined column header is not unique
+        :raises Exception: If a key column has a different type in each CSV
+        :raises Exception: If a key value cannot be converted to its
+                           column type
+
+        '''
+        from icsv.join import validateJoin, joinHeaders, keyTypes, \
+            keyGetter, rowJoiner, hashJoin
+
+        validateJoin(how)
+
+        if isinstance(on, str):
+            on = [on]
+
+        for header in on:
+            self.__validateHeader(header)
+            other.__validateHeader(header)
+
+        headers, rightPositions = joinHeaders(self.__headers, other.__headers,
+                                              on, suffix)
+
+        # Typed columns of the other CSV keep their type
+        schema = dict(self.__schema)
+        for header, position in zip(headers[self.numCols():], rightPositions):
+            valueType = other.__schema.get(other.__headers[position])
+            if valueType is not None:
+                schema[header] = valueType
+
+        leftKeys = [self.__headerSchema.index(header) for header in on]
+        rightKeys = [other.__headerSchema.index(header) for header in on]
+        types = keyTypes(on, self.__schema, other.__schema)
+
+        for header, valueType in zip(on, types):
+            if valueType is not None:
+                schema[header] = valueType
+
+        joinRow = rowJoiner(self.numCols(), leftKeys, rightKeys,
+                            rightPositions, types)
+        rows = hashJoin(self.__data.rows(), other.__data.rows(),
+                        keyGetter(leftKeys, types),
+                        keyGetter(rightKeys, types), how, joinRow)
+
+        csv = icsv(headers, self.__delimiter, self.__storage, schema)
+        csv.__data.extend(list(rows))
+
+        return csv
 
     ##### Private headers
 
@@ -386,8 +1156,7 @@ class icsv:
             raise Exception("Expected %s items, but got %s" % (self.numCols(),
                                                                len(items)))
 
-        itemMap = dict(zip(self.__headers, items))
-        self.__addRowMap(itemMap)
+        self.__addRowValues(list(items))
 
     def __addRowMap(self, itemMap):
         '''Add a new row consisting of a dictionary mapping column headers
@@ -401,11 +1170,112 @@ class icsv:
 
         '''
         # Do not allow invalid headers to be added
-        invalid = [h for h in itemMap if h not in self.__headers]
+        invalid = [h for h in itemMap if h not in self.__headerSchema]
         if len(invalid) > 0:
             raise Exception("Attempting to add unknown headers: %s" % invalid)
-            
-        self.__data.append(itemMap)
+
+        self.__addRowValues(self.__headerSchema.toList(itemMap))
+
+    def __addRowValues(self, values):
+        '''Add a new row consisting of a list of values in order of the
+        column headers.
+
+        :param values: The list of values
+        :type values: list of values
+
+        '''
+        # Convert values for typed columns
+        for header, valueType in self.__schema.items():
+            position = self.__headerSchema.index(header)
+            values[position] = convertValue(values[position], valueType)
+
+        self.__data.append(values)
+
+        row = self.numRows() - 1
+        for index in self.__indexes:
+            index.add(row, self.__data.get(row, index.header()))
+
+    def __getIndex(self, header, indexType):
+        '''Get the index of the given type for a column.
+
+        :param header: The column header
+        :type header: string
+        :param indexType: The index class
+
+        :returns: The index, or None if the column has no such index
+
+        '''
+        for index in self.__indexes:
+            if index.header() == header and isinstance(index, indexType):
+                return index
+
+        return None
+
+    def __trackSource(self, filename, info, reader):
+        '''Keep track of the part of the file which has been loaded.
+
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param info: The result of calling :func:`os.stat` on the file
+                     before it was loaded
+        :type info: :class:`os.stat_result`
+        :param reader: The reader used to parse the file
+        :type reader: :class:`icsv.Reader`
+
+        '''
+        # Appended rows cannot be added to a slice of the file
+        if reader.sliced():
+            return
+
+        containsHeaders = self.__sourceOptions[2]
+        self.__source = SourceFile(filename, info, self.numRows(),
+                                   containsHeaders, reader.compression())
+        self.__sourceReader = reader
+
+        self.__partialRow = None
+        if self.__source.partial() and self.numRows() > 0:
+            self.__partialRow = self.numRows() - 1
+
+    def __reload(self):
+        '''Load the whole source file again.'''
+        csv = icsv.fromFile(self.__source.filename(), *self.__sourceOptions)
+
+        self.__headers = csv.__headers
+        self.__headerSchema = csv.__headerSchema
+        self.__data = csv.__data
+        self.__source = csv.__source
+        self.__sourceReader = csv.__sourceReader
+        self.__partialRow = csv.__partialRow
+
+        # Indexes on columns that no longer exist are dropped
+        self.__indexes = [index for index in self.__indexes
+                          if index.header() in self.__headerSchema]
+        self.__rebuildIndexes()
+
+    def __rebuildIndexes(self):
+        '''Rebuild all of the indexes from the current data.'''
+        for index in self.__indexes:
+            index.rebuild(self.__data.column(index.header()))
+
+    def __mapTarget(self, overwrite):
+        '''Get the CSV where mapped data should be stored.
+
+        :param overwrite: True to store the mapped data in this CSV, False
+                          to store it in a copy of this CSV
+        :type overwrite: bool
+
+        :rtype: An :class:`icsv.icsv` object
+
+        '''
+        if overwrite:
+            return self  # Update this CSV data
+
+        # Create a copy of the current CSV that shares its data
+        csv = icsv(self.__headers, self.__delimiter, self.__storage,
+                   self.__schema)
+        csv.__data = self.__data.copy()
+
+        return csv
 
     def __validateRow(self, row):
         '''Validate the given row index.
@@ -429,7 +1299,7 @@ class icsv:
         :raises Exception: If an unknown header is given
 
         '''
-        if header not in self.__headers:
+        if header not in self.__headerSchema:
             raise Exception("Invalid header: %s" % header)
 
     def __str__(self):
@@ -0,0 +1,445 @@
+from itertools import groupby
+
+from icsv.reader import Reader
+from icsv.schema import HeaderSchema, validateSchema, convertValue
+from icsv.sort import RunBatchSize, sortKey
+from icsv.writer import Writer
+
+
+# The supported types of join
+JoinTypes = ("inner", "left", "outer")
+
+
+def validateJoin(how):
+    '''Make sure that a type of join is known.
+
+    :param how: The type of join ("inner", "left", or "outer")
+    :type how: string
+
+    :raises Exception: If an unknown type of join is given
+
+    '''
+    if how not in JoinTypes:
+        raise Exception("Unknown join type: %s" % how)
+
+
+def joinHeaders(leftHeaders, rightHeaders, on, suffix):
+    '''Get the column headers of the joined rows.
+
+    The joined rows contain all of the left columns, followed by the right
+    columns which are not key columns. Right columns whose header is also a
+    left column header have the suffix appended to their header.
+
+    :param leftHeaders: The list of left column headers
+    :type leftHeaders: list of strings
+    :param rightHeaders: The list of right column headers
+    :type rightHeaders: list of strings
+    :param on: The list of key column headers
+    :type on: list of strings
+    :param suffix: The suffix appended to duplicate right column headers
+    :type suffix: string
+
+    :returns: A tuple containing the list of joined column headers, and the
+              positions of the right columns which are kept
+    :rtype: tuple
+
+    :raises Exception: If a joined column header is not unique
+
+    '''
+    headers = list(leftHeaders)
+    positions = []
+    for position, header in enumerate(rightHeaders):
+        if header in on:
+            continue
+
+        if header in leftHeaders:
+            header += suffix
+        if header in headers:
+            raise Exception("Duplicate header: %s" % header)
+
+        headers.append(header)
+        positions.append(position)
+
+    return headers, positions
+
+
+def keyGetter(positions, types=None):
+    '''Create a function which gets the values of the key columns of a row.
+
+    :param positions: The positions of the key columns
+    :type positions: list of ints
+    :param types: The list of types the key values are converted to, where
+                  None leaves a value unchanged, or None to never convert
+                  the key values
+    :type types: list of types
+
+    :rtype: function
+
+    '''
+    if types is None or all(valueType is None for valueType in types):
+        return lambda values: tuple(values[p] for p in positions)
+
+    return lambda values: tuple(
+        values[p] if valueType is None else convertValue(values[p], valueType)
+        for p, valueType in zip(positions, types))
+
+
+def keyTypes(on, leftSchema, rightSchema):
+    '''Get the types which the key values of both sides of a join are
+    converted to before they are compared.
+
+    A key column which is typed on only one side is converted to that type
+    on both sides.
+
+    :param on: The list of key column headers
+    :type on: list of strings
+    :param leftSchema: The dictionary mapping left column headers to types
+    :type leftSchema: dict
+    :param rightSchema: The dictionary mapping right column headers to types
+    :type rightSchema: dict
+
+    :returns: The list of key column types, where None is an untyped column
+    :rtype: list of types
+
+    :raises Exception: If a key column has a different type on each side
+
+    '''
+    types = []
+    for header in on:
+        leftType = leftSchema.get(header)
+        rightType = rightSchema.get(header)
+
+        # String columns are compared in the same way as untyped columns
+        if leftType is str:
+            leftType = None
+        if rightType is str:
+            rightType = None
+
+        if leftType is not None and rightType is not None and \
+                leftType != rightType:
+            raise Exception("Cannot join column %s of type %s with type %s" %
+                            (header, leftType.__name__, rightType.__name__))
+
+        types.append(rightType if leftType is None else leftType)
+
+    return types
+
+
+def rowJoiner(numLeft, leftKeys, rightKeys, rightPositions, types=None):
+    '''Create a function which joins a left row with a right row.
+
+    Either row may be None, in which case the columns from that side are
+    left empty. The key columns of a row with no left row are filled in
+    from the right row. Key values are converted to the key column types.
+
+    :param numLeft: The number of left columns
+    :type numLeft: int
+    :param leftKeys: The positions of the left key columns
+    :type leftKeys: list of ints
+    :param rightKeys: The positions of the right key columns
+    :type rightKeys: list of ints
+    :param rightPositions: The positions of the right columns which are kept
+    :type rightPositions: list of ints
+    :param types: The list of key column types used to convert key values,
+                  or None to never convert them
+    :type types: list of types
+
+    :rtype: function
+
+    '''
+    numRight = len(rightPositions)
+    leftKey = keyGetter(leftKeys, types)
+    rightKey = keyGetter(rightKeys, types)
+    convertLeft = types is not None and \
+        any(valueType is not None for valueType in types)
+
+    def joinRow(left, right):
+        '''Join a left row with a right row.'''
+        if left is None:
+            values = [''] * numLeft
+            for position, value in zip(leftKeys, rightKey(right)):
+                values[position] = value
+        else:
+            values = list(left)
+            if convertLeft:
+                for position, value in zip(leftKeys, leftKey(left)):
+                    values[position] = value
+
+        if right is None:
+            values.extend([''] * numRight)
+        else:
+            values.extend(right[p] for p in rightPositions)
+
+        return values
+
+    return joinRow
+
+
+def missingKey(key):
+    '''Determine if a key contains a missing value (an empty string).
+
+    Like NULL values in SQL, keys with missing values never match any
+    other key, including each other.
+
+    :param key: The values of the key columns
+    :type key: tuple
+
+    :rtype: bool
+
+    '''
+    return any(isinstance(value, str) and value == '' for value in key)
+
+
+def hashJoin(leftRows, rightRows, leftKey, rightKey, how, joinRow):
+    '''Join two sequences of rows by building a hash table of the right rows.
+
+    The joined rows are in the order of the left rows, and the rows joined
+    to each left row are in the order of the right rows. For an outer join,
+    the right rows which were not joined to any left row follow in order.
+    Rows whose key contains a missing value are never joined.
+
+    :param leftRows: The left rows
+    :type leftRows: iterable of lists
+    :param rightRows: The right rows
+    :type rightRows: iterable of lists
+    :param leftKey: The function which gets the key of a left row
+    :type leftKey: function
+    :param rightKey: The function which gets the key of a right row
+    :type rightKey: function
+    :param how: The type of join ("inner", "left", or "outer")
+    :type how: string
+    :param joinRow: The function which joins a left row with a right row
+    :type joinRow: function
+
+    :rtype: generator of lists
+
+    '''
+    rightRows = list(rightRows)
+
+    table = {}
+    for right in rightRows:
+        key = rightKey(right)
+        if not missingKey(key):
+            table.setdefault(key, []).append(right)
+
+    matched = set()
+    for left in leftRows:
+        key = leftKey(left)
+        matches = table.get(key)
+
+        if matches is None:
+            if how != "inner":
+                yield joinRow(left, None)
+            continue
+
+        matched.add(key)
+        for right in matches:
+            yield joinRow(left, right)
+
+    if how == "outer":
+        for right in rightRows:
+            if rightKey(right) not in matched:
+                yield joinRow(None, right)
+
+
+def mergeJoin(leftRows, rightRows, leftKey, rightKey, how, joinRow,
+              order=tuple):
+    '''Join two sequences of rows which are both sorted by their keys.
+
+    Only the rows which share a single key are held in memory at once.
+    Rows whose key contains a missing value are never joined.
+
+    :param leftRows: The left rows, sorted by their keys
+    :type leftRows: iterable of lists
+    :param rightRows: The right rows, sorted by their keys
+    :type rightRows: iterable of lists
+    :param leftKey: The function which gets the key of a left row
+    :type leftKey: function
+    :param rightKey: The function which gets the key of a right row
+    :type rightKey: function
+    :param how: The type of join ("inner", "left", or "outer")
+    :type how: string
+    :param joinRow: The function which joins a left row with a right row
+    :type joinRow: function
+    :param order: The function which gets the sort key of a key
+    :type order: function
+
+    :rtype: generator of lists
+
+    :raises Exception: If the rows are not sorted by their keys
+
+    '''
+    leftGroups = sortedGroups(leftRows, leftKey, order)
+    rightGroups = sortedGroups(rightRows, rightKey, order)
+
+    left = next(leftGroups, None)
+    right = next(rightGroups, None)
+
+    while left is not None and right is not None:
+        # Compare equal keys first, since missing values are never ordered
+        if left[0] == right[0]:
+            if left[1]:
+                # Missing keys do not match, but are in the same position
+                if how != "inner":
+                    for leftRow in left[2]:
+                        yield joinRow(leftRow, None)
+                if how == "outer":
+                    for rightRow in right[2]:
+                        yield joinRow(None, rightRow)
+            else:
+                for leftRow in left[2]:
+                    for rightRow in right[2]:
+                        yield joinRow(leftRow, rightRow)
+
+            left = next(leftGroups, None)
+            right = next(rightGroups, None)
+        elif left[0] < right[0]:
+            if how != "inner":
+                for leftRow in left[2]:
+                    yield joinRow(leftRow, None)
+
+            left = next(leftGroups, None)
+        else:
+            if how == "outer":
+                for rightRow in right[2]:
+                    yield joinRow(None, rightRow)
+
+            right = next(rightGroups, None)
+
+    while left is not None and how != "inner":
+        for leftRow in left[2]:
+            yield joinRow(leftRow, None)
+        left = next(leftGroups, None)
+
+    while right is not None and how == "outer":
+        for rightRow in right[2]:
+            yield joinRow(None, rightRow)
+        right = next(rightGroups, None)
+
+
+def sortedGroups(rows, key, order=tuple):
+    '''Group consecutive rows which have the same key.
+
+    :param rows: The rows, sorted by their keys
+    :type rows: iterable of lists
+    :param key: The function which gets the key of a row
+    :type key: function
+    :param order: The function which gets the sort key of a key
+    :type order: function
+
+    :returns: A generator of tuples containing the sort key, True if the
+              key contains a missing value, and the list of rows
+    :rtype: generator of tuples
+
+    :raises Exception: If the rows are not sorted by their keys
+
+    '''
+    previous = None
+    for groupKey, group in groupby(rows, key):
+        sortedKey = order(groupKey)
+        if previous is not None and sortedKey < previous:
+            raise Exception("Rows are not sorted by the join columns")
+
+        previous = sortedKey
+        yield sortedKey, missingKey(groupKey), list(group)
+
+
+def joinFiles(leftFilename, rightFilename, outputFilename, on, how="inner",
+              suffix="_right", delimiter=',', containsHeaders=True,
+              leftHeaders=None, rightHeaders=None, schema=None,
+              useHeaders=True, overwrite=True):
+    '''Join the rows of two CSV files which may be too large to fit in
+    memory, and write them to another CSV file.
+
+    Both files must already be sorted by the key columns, for example with
+    :func:`icsv.sortFile`, using the same schema. Rows whose key contains
+    a missing value are never joined. The files are read at
+    the same time, and only the rows which share a single key are held in
+    memory at once. The joined rows are written with an
+    :class:`icsv.Writer`.
+
+    The joined file has the same columns as :func:`icsv.icsv.join`.
+
+    :param leftFilename: The path to the left CSV file
+    :type leftFilename: string
+    :param rightFilename: The path to the right CSV file
+    :type rightFilename: string
+    :param outputFilename: The path to the joined CSV file to write
+    :type outputFilename: string
+    :param on: The column header, or list of column headers, to join on
+    :type on: string or list of strings
+    :param how: The type of join ("inner", "left", or "outer")
+    :type how: string
+    :param suffix: The suffix appended to right column headers which are
+                   also left column headers
+    :type suffix: string
+    :param delimiter: The CSV delimiter
+    :type delimiter: string
+    :param containsHeaders: True if the files list the headers as the first
+                            line, False if they do not
+    :type containsHeaders: bool
+    :param leftHeaders: The list of left CSV headers. If this is None they
+                        will be automatically read from the file
+    :type leftHeaders: list of strings
+    :param rightHeaders: The list of right CSV headers. If this is None they
+                         will be automatically read from the file
+    :type rightHeaders: list of strings
+    :param schema: The dictionary mapping key column headers to the types
+                   used to compare their values
+    :type schema: dict
+    :param useHeaders: True will write the headers to the first line of the
+                       joined CSV file, False will not
+    :type useHeaders: bool
+    :param overwrite: True will overwrite an existing joined CSV file, False
+                      will not
+    :type overwrite: bool
+
+    :raises Exception: If either file does not exist
+    :raises Exception: If an unknown join type is given
+    :raises Exception: If an unknown header is given
+    :raises Exception: If a joined column header is not unique
+    :raises Exception: If the schema contains unknown headers or types
+    :raises Exception: If ``overwrite`` is False, and the joined file
+                       already exists
+    :raises Exception: If either file is not sorted by the key columns
+
+    '''
+    validateJoin(how)
+
+    if isinstance(on, str):
+        on = [on]
+
+    left = Reader(leftFilename, leftHeaders, delimiter, containsHeaders)
+    right = Reader(rightFilename, rightHeaders, delimiter, containsHeaders)
+    leftSchema = HeaderSchema(left.headers())
+    rightSchema = HeaderSchema(right.headers())
+
+    schema = {} if schema is None else schema
+    validateSchema(on, schema)
+
+    leftKeys = [leftSchema.index(header) for header in on]
+    rightKeys = [rightSchema.index(header) for header in on]
+
+    headers, rightPositions = joinHeaders(left.headers(), right.headers(),
+                                          on, suffix)
+    joinRow = rowJoiner(len(leftSchema), leftKeys, rightKeys, rightPositions)
+
+    getKey = sortKey([schema.get(header) for header in on], convert=True)
+    leftKey = keyGetter(leftKeys)
+    rightKey = keyGetter(rightKeys)
+
+    rows = mergeJoin(left.lists(), right.lists(), leftKey, rightKey, how,
+                     joinRow, getKey)
+
+    writer = Writer(outputFilename, headers, delimiter, useHeaders,
+                    overwrite, flushRows=None, keepRows=False)
+    try:
+        batch = []
+        for values in rows:
+            batch.append(values)
+            if len(batch) >= RunBatchSize:
+                writer.writeRows(batch)
+                batch = []
+        writer.writeRows(batch)
+    finally:
+        writer.close()
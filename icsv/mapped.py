@@ -0,0 +1,425 @@
+from array import array
+from locale import getpreferredencoding
+from mmap import mmap, ACCESS_READ
+from os import stat
+from os.path import exists
+from struct import calcsize, pack, unpack
+from sys import byteorder
+
+from icsv.base import Row, Rows, Col, Cell
+from icsv.compression import detectCompression
+from icsv.schema import HeaderSchema
+
+
+class MappedCsv:
+    '''The MappedCsv class provides read only, random access to the rows of
+    a CSV file without parsing the whole file.
+
+    The file is memory mapped, and an index containing the byte offset of
+    the start of each row is built when the file is opened. Rows are only
+    decoded when they are requested, which makes accessing a few rows of a
+    very large file fast and memory efficient.
+
+    The index can optionally be saved to an index file, in which case it
+    will be loaded, rather than rebuilt, the next time the (unchanged) CSV
+    file is opened.
+
+    Lines are decoded with the locale's preferred encoding, as they are by
+    :class:`icsv.Reader`, unless another encoding is given.
+
+    The MappedCsv class exposes the same interface for accessing data
+    as the :class:`icsv.icsv` class.
+
+    '''
+
+    # Identifies an index file, and the format of its header
+    IndexMagic = b"ICSVIDX1"
+    IndexHeader = "<8sQQQQ"
+
+    def __init__(self, filename, headers=None, delimiter=',',
+                 containsHeaders=True, indexFilename=None, encoding=None):
+        '''
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param indexFilename: The path to a file used to store the row index,
+                              or None to always build the index in memory
+        :type indexFilename: string
+        :param encoding: The encoding of the file, or None to use the
+                         locale's preferred encoding
+        :type encoding: string
+
+        :raises Exception: If the file does not exist
+        :raises Exception: If the file is compressed
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+
+        '''
+        # CSV file must actually exist
+        if not exists(filename):
+            raise Exception("File does not exist: %s" % filename)
+
+        # Compressed files cannot be accessed randomly
+        if detectCompression(filename) is not None:
+            raise Exception("Cannot memory map compressed file: %s" %
+                            filename)
+
+        # Must be able to determine the headers
+        if headers is None and not containsHeaders:
+            raise Exception("Could not determine headers. If 'headers' is " \
+                                "None, then 'containsHeaders' must be True")
+
+        self.__filename = filename
+        self.__delimiter = delimiter
+        self.__containsHeaders = containsHeaders
+        self.__encoding = getpreferredencoding(False) if encoding is None \
+            else encoding
+
+        self.__fd = open(filename, 'rb')
+        self.__size = stat(filename).st_size
+
+        # Empty files cannot be mapped
+        self.__map = None
+        if self.__size > 0:
+            self.__map = mmap(self.__fd.fileno(), 0, access=ACCESS_READ)
+
+        self.__offsets = None
+        if indexFilename is not None:
+            self.__offsets = self.__loadIndex(indexFilename)
+
+        if self.__offsets is None:
+            self.__offsets = self.__buildIndex()
+
+            if indexFilename is not None:
+                self.__saveIndex(indexFilename)
+
+        # Grab the headers from the first line in the file
+        if headers is None:
+            headers = self.__readHeaders()
+        self.__headers = headers
+        self.__headerSchema = HeaderSchema(headers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        '''Close the memory mapped CSV file.'''
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+        self.__fd.close()
+
+    def filename(self):
+        '''Get the path to the CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
+    def encoding(self):
+        '''Get the encoding used to decode the CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__encoding
+
+    def numRows(self):
+        '''Get the number of rows in the CSV.
+
+        :rtype: int
+
+        '''
+        return len(self.__offsets)
+
+    def numCols(self):
+        '''Get the number of columns in the CSV.
+
+        :rtype: int
+
+        '''
+        return len(self.__headers)
+
+    def delimiter(self):
+        '''Get the delimiter value for this CSV.
+
+        :rtype: string
+
+        '''
+        return self.__delimiter
+
+    def headers(self):
+        '''Get the list of column headers for this CSV.
+
+        :rtype: list of strings
+
+        '''
+        return self.__headers
+
+    def data(self):
+        '''Get the sequence of :class:`icsv.Row` objects pertaining to the
+        rows of this CSV.
+
+        The sequence is lazy, rows are only decoded as they are accessed.
+
+        :rtype: An :class:`icsv.Rows` sequence of :class:`icsv.Row` objects
+
+        '''
+        return Rows(self)
+
+    def getRow(self, row=-1):
+        '''Get the given row.
+
+        :param row: The row index (last row be default)
+        :type row: int
+
+        :raises Exception: If row is not a valid index
+
+        '''
+        self.__validateRow(row)
+        return Row(self.__headerSchema, self.__readRow(row), self.__delimiter)
+
+    def getRows(self, start=0, stop=None):
+        '''Get a slice of the rows.
+
+        :param start: The index of the first row
+        :type start: int
+        :param stop: The index after the last row (the end of the CSV
+                     by default)
+        :type stop: int
+
+        :rtype: list of :class:`icsv.Row` objects
+
+        '''
+        indexes = range(self.numRows())[start:stop]
+        return [Row(self.__headerSchema, self.__readRow(i), self.__delimiter)
+                for i in indexes]
+
+    def getCol(self, header):
+        '''Get the :class:`icsv.Col` object for the given column header.
+
+        This decodes every row in the file.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: A :class:`icsv.Col` object
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        position = self.getHeaderIndex(header)
+        data = [self.__readRow(i)[position] for i in range(self.numRows())]
+        return Col(header, data)
+
+    def getCell(self, row, header):
+        '''Get the :class:`icsv.Cell` object contained at the given
+        row index and column header.
+
+        :param row: The row index
+        :type row: int
+        :param header: The column header
+        :type header: string
+
+        :rtype: A :class:`icsv.Cell` object
+
+        :raises Exception: If an invalid row index is given
+        :raises Exception: If an unknown header is given
+
+        '''
+        self.__validateRow(row)
+        position = self.getHeaderIndex(header)
+
+        value = self.__readRow(row)[position]
+        return Cell(row, header, value)
+
+    def getHeaderIndex(self, header):
+        '''Get the column index for the given column header.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: int
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        return self.__headerSchema.index(header)
+
+    def getHeader(self, index):
+        '''Get the column header for the given column index.
+
+        :param index: The column index
+        :type index: int
+
+        :rtype: string
+
+        :raises Exception: If an invalid column index is given
+
+        '''
+        if index not in range(len(self.__headers)):
+            raise Exception("Header index out of range: %s" % index)
+
+        return self.__headers[index]
+
+    def getHeaders(self):
+        '''Get the list of headers for this CSV file as a CSV string.
+
+        :rtype: list of strings
+
+        '''
+        return self.__delimiter.join(self.__headers)
+
+    ##### Private functions
+
+    def __iterLines(self):
+        '''Iterate over the non-empty lines of the file as tuples of the
+        line start offset, and the line content.
+
+        '''
+        mm = self.__map
+        pos = 0
+        while pos < self.__size:
+            end = mm.find(b'\n', pos)
+            if end == -1:
+                end = self.__size
+
+            line = mm[pos:end].strip()
+            if len(line) > 0:
+                yield pos, line
+
+            pos = end + 1
+
+    def __buildIndex(self):
+        '''Build the array of row start offsets.
+
+        :rtype: array of ints
+
+        '''
+        lines = self.__iterLines()
+
+        # Skip past the headers line
+        if self.__containsHeaders:
+            next(lines, None)
+
+        return array('Q', (pos for pos, _ in lines))
+
+    def __loadIndex(self, indexFilename):
+        '''Load the array of row start offsets from an index file.
+
+        :param indexFilename: The path to the index file
+        :type indexFilename: string
+
+        :returns: The offsets, or None if the index file does not exist
+                  or does not match the CSV file
+        :rtype: array of ints
+
+        '''
+        if not exists(indexFilename):
+            return None
+
+        headerSize = calcsize(self.IndexHeader)
+        info = stat(self.__filename)
+
+        with open(indexFilename, 'rb') as fd:
+            header = fd.read(headerSize)
+            if len(header) != headerSize:
+                return None
+
+            magic, size, mtime, containsHeaders, count = \
+                unpack(self.IndexHeader, header)
+
+            # The CSV file has changed since the index was created
+            if magic != self.IndexMagic or size != info.st_size or \
+                    mtime != info.st_mtime_ns or \
+                    containsHeaders != int(self.__containsHeaders):
+                return None
+
+            offsets = array('Q')
+            try:
+                offsets.fromfile(fd, count)
+            except EOFError:
+                return None
+
+        if byteorder != "little":
+            offsets.byteswap()
+
+        return offsets
+
+    def __saveIndex(self, indexFilename):
+        '''Save the array of row start offsets to an index file.
+
+        :param indexFilename: The path to the index file
+        :type indexFilename: string
+
+        '''
+        info = stat(self.__filename)
+        header = pack(self.IndexHeader, self.IndexMagic, info.st_size,
+                      info.st_mtime_ns, int(self.__containsHeaders),
+                      len(self.__offsets))
+
+        offsets = array('Q', self.__offsets)
+        if byteorder != "little":
+            offsets.byteswap()
+
+        with open(indexFilename, 'wb') as fd:
+            fd.write(header)
+            offsets.tofile(fd)
+
+    def __readHeaders(self):
+        '''Read the list of column headers from the first line of the file.
+
+        :rtype: list of strings
+
+        '''
+        for _, line in self.__iterLines():
+            return line.decode(self.__encoding).split(self.__delimiter)
+
+        return []
+
+    def __readRow(self, row):
+        '''Decode a single row of the file.
+
+        :param row: The row index
+        :type row: int
+
+        :rtype: list
+
+        '''
+        start = self.__offsets[row]
+        end = self.__map.find(b'\n', start)
+        if end == -1:
+            end = self.__size
+
+        line = self.__map[start:end].decode(self.__encoding).strip()
+        return self.__headerSchema.normalize(line.split(self.__delimiter))
+
+    def __validateRow(self, row):
+        '''Validate the given row index.
+
+        :param row: The row index
+        :type row: int
+
+        :raises Exception: If an invalid row index is given
+
+        '''
+        if (row != -1 or self.numRows() == 0) and \
+                row not in range(self.numRows()):
+            raise Exception("Invalid row: %s" % row)
+
+    def __str__(self):
+        '''Convert the CSV to a string.'''
+        lines = [self.getHeaders()] + self.getRows()
+        return '\n'.join(map(str, lines))
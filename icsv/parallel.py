@@ -0,0 +1,237 @@
+from concurrent.futures import ProcessPoolExecutor
+from locale import getpreferredencoding
+from os import stat
+
+from icsv.reader import splitLine
+
+
+def readLine(fd, limit=-1):
+    '''Read a line from a file opened in binary mode.
+
+    Like a file opened in text mode, a line ends with a newline, a carriage
+    return followed by a newline, or a lone carriage return.
+
+    :param fd: The file, opened in binary mode
+    :type fd: file
+    :param limit: The maximum number of bytes to read, or -1 for no limit
+    :type limit: int
+
+    :returns: The line, including its line ending, or an empty string at
+              the end of the file
+    :rtype: bytes
+
+    '''
+    start = fd.tell()
+    line = fd.readline(limit)
+
+    # The line may contain a lone carriage return which ends it early
+    position = line.find(b'\r')
+    if position == -1 or position == len(line) - 1 or \
+            line[position + 1:position + 2] == b'\n':
+        return line
+
+    fd.seek(start + position + 1)
+    return line[:position + 1]
+
+
+def splitLines(content):
+    '''Split text into lines in the same way as a file opened in
+    text mode.
+
+    :param content: The text
+    :type content: string
+
+    :rtype: list of strings
+
+    '''
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    return content.split('\n')
+
+
+def lineStart(fd, offset, size):
+    '''Get the byte offset of the first line which starts at, or after a
+    byte offset.
+
+    :param fd: The file, opened in binary mode
+    :type fd: file
+    :param offset: The byte offset
+    :type offset: int
+    :param size: The size of the file
+    :type size: int
+
+    :rtype: int
+
+    '''
+    if offset <= 0:
+        return 0
+    elif offset >= size:
+        return size
+
+    # A line starts at the offset if the previous line ends just before it
+    fd.seek(offset - 1)
+    readLine(fd)
+    return fd.tell()
+
+
+def splitFile(filename, numChunks, start=0, end=None):
+    '''Split a file into byte ranges which are aligned to line boundaries.
+
+    :param filename: The path to the file
+    :type filename: string
+    :param numChunks: The maximum number of byte ranges to create
+    :type numChunks: int
+    :param start: The byte offset where the first range starts, which must
+                  be the start of a line
+    :type start: int
+    :param end: The byte offset where the last range ends, which must be the
+                start of a line, or None for the end of the file
+    :type end: int
+
+    :rtype: list of (start, end) tuples
+
+    '''
+    size = stat(filename).st_size if end is None else end
+    chunkSize = max(1, (size - start) // max(1, numChunks))
+
+    ranges = []
+    with open(filename, 'rb') as fd:
+        while start < size:
+            # Move the end of the range to the start of the next line
+            chunkEnd = size
+            if start + chunkSize < size:
+                fd.seek(start + chunkSize)
+                readLine(fd)
+                chunkEnd = min(fd.tell(), size)
+
+            ranges.append((start, chunkEnd))
+            start = chunkEnd
+
+    return ranges
+
+
+def lineRange(filename, containsHeaders, start=None, end=None):
+    '''Get the byte range of the lines of a CSV file which start within a
+    byte range, excluding the headers line.
+
+    :param filename: The path to the CSV file
+    :type filename: string
+    :param containsHeaders: True if the file list the headers as the first
+                            line, False if it does not
+    :type containsHeaders: bool
+    :param start: The first byte offset, or None for the start of the file
+    :type start: int
+    :param end: The byte offset after the range, or None for the end of
+                the file
+    :type end: int
+
+    :returns: The (start, end) tuple, where both offsets are the start of
+              a line
+    :rtype: tuple
+
+    '''
+    size = stat(filename).st_size
+    start = max(0 if start is None else start,
+                dataOffset(filename, containsHeaders))
+    end = size if end is None else end
+
+    with open(filename, 'rb') as fd:
+        start = lineStart(fd, start, size)
+        end = max(start, lineStart(fd, end, size))
+
+    return start, end
+
+
+def dataOffset(filename, containsHeaders):
+    '''Get the byte offset where the rows of a CSV file begin.
+
+    :param filename: The path to the CSV file
+    :type filename: string
+    :param containsHeaders: True if the file list the headers as the first
+                            line, False if it does not
+    :type containsHeaders: bool
+
+    :rtype: int
+
+    '''
+    if not containsHeaders:
+        return 0
+
+    # Skip past the first non-empty line
+    with open(filename, 'rb') as fd:
+        for line in iter(lambda: readLine(fd), b''):
+            if len(line.strip()) > 0:
+                break
+
+        return fd.tell()
+
+
+def parseChunk(args):
+    '''Parse the rows contained within a byte range of a CSV file.
+
+    :param args: A tuple containing the path to the CSV file, the delimiter,
+                 the encoding, the start and end byte offsets, and the
+                 positions of the kept columns (or None)
+    :type args: tuple
+
+    :rtype: list of lists of cell values
+
+    '''
+    filename, delimiter, encoding, start, end, positions = args
+
+    with open(filename, 'rb') as fd:
+        fd.seek(start)
+        content = fd.read(end - start).decode(encoding)
+
+    rows = []
+    for line in splitLines(content):
+        line = line.strip()
+        if len(line) > 0:
+            rows.append(splitLine(line, delimiter, positions))
+
+    return rows
+
+
+def parseFile(filename, delimiter=',', containsHeaders=True, workers=2,
+              positions=None, start=None, end=None):
+    '''Parse the rows of a CSV file across a pool of worker processes.
+
+    The file is split into byte ranges aligned to line boundaries, each of
+    which is parsed by a worker process. The rows are returned in the same
+    order they appear in the file.
+
+    :param filename: The path to the CSV file
+    :type filename: string
+    :param delimiter: The CSV delimiter
+    :type delimiter: string
+    :param containsHeaders: True if the file list the headers as the first
+                            line, False if it does not
+    :type containsHeaders: bool
+    :param workers: The number of worker processes
+    :type workers: int
+    :param positions: The positions of the columns to keep in order, or None
+                      to keep all of the columns
+    :type positions: list of ints
+    :param start: Only parse the lines which start at, or after this byte
+                  offset, or None to start at the first line
+    :type start: int
+    :param end: Only parse the lines which start before this byte offset,
+                or None to end at the last line
+    :type end: int
+
+    :rtype: generator of lists of cell values
+
+    '''
+    # Use several chunks per worker to balance the load
+    start, end = lineRange(filename, containsHeaders, start, end)
+    ranges = splitFile(filename, workers * 4, start, end)
+
+    encoding = getpreferredencoding(False)
+    chunks = [(filename, delimiter, encoding, s, e, positions)
+              for s, e in ranges]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in executor.map(parseChunk, chunks):
+            for values in rows:
+                yield values
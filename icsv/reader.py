@@ -0,0 +1,383 @@
+from itertools import islice
+from locale import getpreferredencoding
+from os.path import exists
+
+from icsv.base import Row
+from icsv.compression import detectCompression, openFile
+from icsv.groupBy import GroupBy
+from icsv.schema import HeaderSchema
+
+
+def splitLine(line, delimiter, positions=None):
+    '''Split a line of a CSV file into its values.
+
+    When only some of the columns are needed, the line is only split up to
+    the last needed column, and only the needed values are returned.
+
+    :param line: The line
+    :type line: string
+    :param delimiter: The CSV delimiter
+    :type delimiter: string
+    :param positions: The positions of the needed columns in order, or None
+                      for all of the columns
+    :type positions: list of ints
+
+    :rtype: list of strings
+
+    '''
+    if positions is None:
+        return line.split(delimiter)
+
+    values = line.split(delimiter, max(positions) + 1)
+    numValues = len(values)
+    return [values[p] if p < numValues else '' for p in positions]
+
+
+class Reader:
+    '''The Reader class provides an interface for lazily reading a CSV file.
+
+    Rows are parsed one at a time from a buffered file handle as the reader
+    is iterated, so the memory used while reading does not depend on the
+    size of the file.
+
+    When ``columns`` is given, only the requested columns are kept. Lines
+    are only split up to the last requested column, and the values of other
+    columns are discarded as each line is parsed.
+
+    A slice of the rows can be read with ``skipRows`` and ``maxRows``, and a
+    slice of the file can be read with ``start`` and ``end``. A line is part
+    of the byte range if it starts at, or after ``start`` and before
+    ``end``, so a file can be split into adjacent byte ranges which are each
+    read by a different job, and every row is read exactly once. The file
+    is read from ``start``, so the lines before it are never read. The
+    headers line is never part of the range. When both are given, the rows
+    are skipped and limited within the byte range.
+
+    Files compressed with gzip, bzip2, or xz are decompressed as they are
+    read. The compression is detected from the file extension (.gz, .bz2,
+    or .xz), or from the first bytes of the file.
+
+    The Reader class shares the same header, delimiter, and containsHeaders
+    semantics as :func:`icsv.icsv.fromFile`.
+
+    '''
+
+    def __init__(self, filename, headers=None, delimiter=',',
+                 containsHeaders=True, bufferSize=65536, columns=None,
+                 skipRows=0, maxRows=None, start=None, end=None):
+        '''
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param headers: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+        :type headers: list of strings
+        :param delimiter: The CSV delimiter
+        :type delimiter: string
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param bufferSize: The size (in bytes) of the file read buffer
+        :type bufferSize: int
+        :param columns: The list of column headers, or column indexes, to
+                        keep in order, or None to keep all of the columns
+        :type columns: list of strings or ints
+        :param skipRows: The number of rows to skip before the first row
+                         which is read
+        :type skipRows: int
+        :param maxRows: The maximum number of rows to read, or None to read
+                        all of the remaining rows
+        :type maxRows: int
+        :param start: Only read the lines which start at, or after this byte
+                      offset, or None to start at the first line
+        :type start: int
+        :param end: Only read the lines which start before this byte offset,
+                    or None to end at the last line
+        :type end: int
+
+        :raises Exception: If the file does not exist
+        :raises Exception: If ``headers`` is None and ``containsHeaders``
+                           is False
+        :raises Exception: If an unknown column header, or an invalid column
+                           index is given
+        :raises Exception: If ``skipRows`` or ``maxRows`` is negative
+        :raises Exception: If a byte range is given for a compressed file
+
+        '''
+        # CSV file must actually exist
+        if not exists(filename):
+            raise Exception("File does not exist: %s" % filename)
+
+        # Must be able to determine the headers
+        if headers is None and not containsHeaders:
+            raise Exception("Could not determine headers. If 'headers' is " \
+                                "None, then 'containsHeaders' must be True")
+
+        self.__filename = filename
+        self.__delimiter = delimiter
+        self.__containsHeaders = containsHeaders
+        self.__bufferSize = bufferSize
+        self.__compression = detectCompression(filename)
+
+        if skipRows < 0 or (maxRows is not None and maxRows < 0):
+            raise Exception("Invalid row range: %s, %s" % (skipRows, maxRows))
+
+        # Compressed files can only be read from the start
+        if self.__compression is not None and \
+                (start is not None or end is not None):
+            raise Exception("Cannot read a byte range of a compressed " \
+                                "file: %s" % filename)
+
+        self.__skipRows = skipRows
+        self.__maxRows = maxRows
+        self.__start = start
+        self.__end = end
+
+        # Grab the headers from the first line in the file
+        if headers is None:
+            headers = self.__readHeaders()
+
+        # Positions of the kept columns within each line
+        self.__positions = None
+        if columns is not None:
+            self.__positions = self.__columnPositions(headers, columns)
+            headers = [headers[p] for p in self.__positions]
+
+        self.__headers = headers
+        self.__headerSchema = HeaderSchema(headers)
+
+    def filename(self):
+        '''Get the path to the CSV file being read.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
+    def compression(self):
+        '''Get the compression of the CSV file ("gz", "bz2", or "xz"), or
+        None if it is not compressed.
+
+        :rtype: string
+
+        '''
+        return self.__compression
+
+    def headers(self):
+        '''Get the list of column headers for this CSV.
+
+        :rtype: list of strings
+
+        '''
+        return self.__headers
+
+    def delimiter(self):
+        '''Get the delimiter value for this CSV.
+
+        :rtype: string
+
+        '''
+        return self.__delimiter
+
+    def positions(self):
+        '''Get the positions of the kept columns within each line of the
+        file, or None if all of the columns are kept.
+
+        :rtype: list of ints
+
+        '''
+        return self.__positions
+
+    def sliced(self):
+        '''Determine if only a slice of the rows, or a byte range of the
+        file is read.
+
+        :rtype: bool
+
+        '''
+        return self.__skipRows > 0 or self.__maxRows is not None or \
+            self.__start is not None or self.__end is not None
+
+    def parseLine(self, line):
+        '''Parse a single (stripped) line of the CSV file into a list of
+        cell values in order of the column headers.
+
+        :param line: The line
+        :type line: string
+
+        :rtype: list
+
+        '''
+        values = splitLine(line, self.__delimiter, self.__positions)
+        return self.__headerSchema.normalize(values)
+
+    def dicts(self):
+        '''Iterate over the rows of the CSV file as dictionaries mapping
+        column headers to cell values.
+
+        :rtype: generator of dicts
+
+        '''
+        headers = self.__headers
+
+        for values in self.__iterValues():
+            yield dict(zip(headers, values))
+
+    def lists(self):
+        '''Iterate over the rows of the CSV file as lists of cell values in
+        order of the column headers.
+
+        :rtype: generator of lists
+
+        '''
+        normalize = self.__headerSchema.normalize
+
+        for values in self.__iterValues():
+            yield normalize(values)
+
+    def groupBy(self, headers, schema=None):
+        '''Group the rows of the CSV file by the values of one or more
+        columns, so that aggregates can be computed for each group.
+
+        The file is read once each time aggregates are computed, and only
+        the aggregates of each group are kept in memory (see
+        :class:`icsv.GroupBy`).
+
+        :param headers: The column header, or list of column headers, to
+                        group by
+        :type headers: string or list of strings
+        :param schema: The dictionary mapping column headers to the types
+                       their values are converted to as they are read
+        :type schema: dict
+
+        :rtype: An :class:`icsv.GroupBy` object
+
+        :raises Exception: If an unknown header is given
+        :raises Exception: If the schema contains unknown headers or types
+
+        '''
+        return GroupBy(self.__headers, headers, self.lists, schema,
+                       self.__delimiter)
+
+    def __iter__(self):
+        '''Iterate over the rows of the CSV file.
+
+        :rtype: generator of :class:`icsv.Row` objects
+
+        '''
+        for values in self.lists():
+            yield Row(self.__headerSchema, values, self.__delimiter)
+
+    ##### Private functions
+
+    def __iterLines(self, fd):
+        '''Iterate over the non-empty lines of an open file.
+
+        :param fd: The open file
+        :type fd: file
+
+        '''
+        for line in fd:
+            line = line.strip()
+            if len(line) > 0:
+                yield line
+
+    def __iterRange(self, fd):
+        '''Iterate over the non-empty lines within the byte range of an
+        open file.
+
+        :param fd: The open file, in binary mode
+        :type fd: file
+
+        '''
+        # Imported here since the parallel module depends on this one
+        from icsv.parallel import lineRange, readLine
+
+        start, end = lineRange(self.__filename, self.__containsHeaders,
+                               self.__start, self.__end)
+        encoding = getpreferredencoding(False)
+
+        fd.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            # Never read past the end of the range
+            line = readLine(fd, remaining)
+            if len(line) == 0:
+                break
+
+            remaining -= len(line)
+            line = line.decode(encoding).strip()
+            if len(line) > 0:
+                yield line
+
+    def __iterValues(self):
+        '''Iterate over the rows of the CSV file as lists of cell values.'''
+        byteRange = self.__start is not None or self.__end is not None
+        if byteRange:
+            fd = open(self.__filename, 'rb', buffering=self.__bufferSize)
+        else:
+            fd = openFile(self.__filename, 'r', self.__compression,
+                          bufferSize=self.__bufferSize)
+        try:
+            if byteRange:
+                lines = self.__iterRange(fd)
+            else:
+                lines = self.__iterLines(fd)
+
+                # Skip past the headers line
+                if self.__containsHeaders:
+                    next(lines, None)
+
+            # Skipped lines are never split
+            if self.__skipRows > 0 or self.__maxRows is not None:
+                stop = None
+                if self.__maxRows is not None:
+                    stop = self.__skipRows + self.__maxRows
+                lines = islice(lines, self.__skipRows, stop)
+
+            delimiter = self.__delimiter
+            positions = self.__positions
+            for line in lines:
+                yield splitLine(line, delimiter, positions)
+        finally:
+            fd.close()
+
+    def __columnPositions(self, headers, columns):
+        '''Get the positions of the requested columns.
+
+        :param headers: The list of all of the column headers
+        :type headers: list of strings
+        :param columns: The list of column headers, or column indexes
+        :type columns: list of strings or ints
+
+        :rtype: list of ints
+
+        :raises Exception: If an unknown column header, or an invalid column
+                           index is given
+
+        '''
+        headerSchema = HeaderSchema(headers)
+
+        positions = []
+        for column in columns:
+            if isinstance(column, int):
+                if column not in range(len(headers)):
+                    raise Exception("Header index out of range: %s" % column)
+                positions.append(column)
+            else:
+                positions.append(headerSchema.index(column))
+
+        return positions
+
+    def __readHeaders(self):
+        '''Read the list of column headers from the first line of the file.
+
+        :rtype: list of strings
+
+        '''
+        fd = openFile(self.__filename, 'r', self.__compression)
+        try:
+            line = next(self.__iterLines(fd), '')
+        finally:
+            fd.close()
+
+        return line.split(self.__delimiter) if len(line) > 0 else []
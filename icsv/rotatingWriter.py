@@ -0,0 +1,396 @@
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir, unlink
+from os.path import basename, dirname, exists, splitext
+from re import escape, match
+from shutil import copyfileobj
+from time import monotonic
+
+from icsv.compression import Compressions, openFile, validateCompression
+from icsv.schema import HeaderSchema
+from icsv.writer import Writer
+
+
+class RotatingWriter:
+    '''The RotatingWriter class provides an interface for writing a never
+    ending stream of rows to a series of CSV files (segments).
+
+    A new segment is started once the current segment contains ``maxRows``
+    rows, ``maxBytes`` characters, or has been open for ``maxInterval``
+    seconds. Limits are checked before each row is written, so a segment
+    is never empty, and only exceeds ``maxBytes`` by at most one row. Every
+    segment starts with the headers line, unless ``useHeaders`` is False.
+
+    Segments are named after ``filename`` with an increasing segment
+    number, for example ``/tmp/export.csv`` is written to
+    ``/tmp/export-00000.csv``, ``/tmp/export-00001.csv``, and so on.
+    Numbering continues after the highest numbered segment which already
+    exists (compressed or not), so restarting a writer never replaces the
+    segments written before.
+
+    Once a segment is finished it can optionally be compressed in a
+    background thread, in which case the uncompressed segment is replaced
+    by, for example, ``/tmp/export-00000.csv.gz``. The ``onSegment``
+    function is called with the path of each finished (and compressed)
+    segment. When compressing, it is called from the background thread.
+    Errors raised while compressing a segment are raised by the next call
+    to :func:`writeRow`, :func:`writeRows`, :func:`rotate`, or
+    :func:`close`.
+
+    The RotatingWriter can be used as a context manager which finishes the
+    last segment on exit::
+
+        with RotatingWriter("/tmp/export.csv", headers,
+                            maxRows=100000) as writer:
+            writer.writeRow([0, 1, 2])
+
+    '''
+
+    def __init__(self, filename, headers, delimiter=',', useHeaders=True,
+                 overwrite=True, maxRows=None, maxBytes=None,
+                 maxInterval=None, compression=None, compressionLevel=None,
+                 onSegment=None, flushRows="auto", bufferSize=65536):
+        '''
+        :param filename: The filename the segment filenames are based on
+        :type filename: string
+        :param headers: The list of column headers for this CSV file
+        :type headers: list of string
+        :param delimiter: The CSV delimiter to use
+        :type delimiter: string
+        :param useHeaders: True will write the headers to the first line of
+                           each segment, False will not
+        :type useHeaders: bool
+        :param overwrite: True will overwrite existing segments (including
+                          compressed segments), False will not
+        :type overwrite: bool
+        :param maxRows: Start a new segment after this many rows, None
+                        to disable
+        :type maxRows: int
+        :param maxBytes: Start a new segment after this many characters,
+                         None to disable
+        :type maxBytes: int
+        :param maxInterval: Start a new segment after this many seconds,
+                            None to disable
+        :type maxInterval: float
+        :param compression: Compress finished segments with "gz", "bz2", or
+                            "xz", None to leave them uncompressed
+        :type compression: string
+        :param compressionLevel: The compression level, or None to use the
+                                 default level of the compression
+        :type compressionLevel: int
+        :param onSegment: Function called with the path of each finished
+                          segment, or None
+        :type onSegment: function
+        :param flushRows: Flush the segment after this many rows have been
+                          written, None to disable. The default ("auto")
+                          flushes every row, unless the segment is written
+                          compressed (see :class:`icsv.Writer`)
+        :type flushRows: int
+        :param bufferSize: The size (in bytes) of the file write buffer
+        :type bufferSize: int
+
+        :raises Exception: If an unknown compression is given
+
+        '''
+        validateCompression(compression)
+
+        self.__filename = filename
+        self.__headers = headers
+        self.__delimiter = delimiter
+        self.__useHeaders = useHeaders
+        self.__overwrite = overwrite
+        self.__headerSchema = HeaderSchema(headers)
+
+        self.__maxRows = maxRows
+        self.__maxBytes = maxBytes
+        self.__maxInterval = maxInterval
+        self.__compression = compression
+        self.__compressionLevel = compressionLevel
+        self.__onSegment = onSegment
+        self.__flushRows = flushRows
+        self.__bufferSize = bufferSize
+
+        # The current segment is started by the first row written to it
+        self.__writer = None
+        self.__segment = self.__nextSegment()
+        self.__segmentRows = 0
+        self.__segmentStart = None
+
+        # Segments are compressed in order on a single thread
+        self.__executor = None
+        self.__futures = []
+        if compression is not None:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def filename(self):
+        '''Get the filename the segment filenames are based on.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
+    def headers(self):
+        '''Get the list of headers for this CSV file.
+
+        :rtype: list of strings
+
+        '''
+        return self.__headers
+
+    def delimiter(self):
+        '''Get the delimiter used for this CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__delimiter
+
+    def segmentFilename(self, segment):
+        '''Get the path of an (uncompressed) segment.
+
+        :param segment: The segment number
+        :type segment: int
+
+        :rtype: string
+
+        '''
+        root, ext = splitext(self.__filename)
+        return "%s-%05d%s" % (root, segment, ext)
+
+    def writeRow(self, items):
+        '''Write a new row of data to the current segment.
+
+        ``items`` can be a list of values, or a dictionary of values.
+
+        :param items: The list, or dictionary of row items
+
+        :raises Exception: If ``items`` is a list and is not equal to the
+                           number of headers
+        :raises Exception: If ``items`` is a dictionary and contains entries
+                           for unknown headers
+        :raises Exception: If ``items`` is not a list or a dictionary
+        :raises Exception: If the writer has been closed
+        :raises Exception: If compressing a segment failed
+
+        '''
+        self.__headerSchema.validate(items)
+        self.__writeRow(items)
+
+    def writeRows(self, rows):
+        '''Write several rows of data, starting new segments as needed.
+
+        ``rows`` can be any iterable of rows, where each row can be a list,
+        tuple, or dictionary of values. All rows are validated before any of
+        them are written.
+
+        :param rows: The iterable of rows
+        :type rows: iterable of lists, tuples, or dictionaries
+
+        :raises Exception: If any of the rows are invalid
+        :raises Exception: If the writer has been closed
+        :raises Exception: If compressing a segment failed
+
+        '''
+        rows = list(rows)
+        for items in rows:
+            self.__headerSchema.validate(items)
+
+        for items in rows:
+            self.__writeRow(items)
+
+    def rotate(self):
+        '''Finish the current segment. The next row written starts a new
+        segment.
+
+        :raises Exception: If compressing a segment failed
+
+        '''
+        self.__checkFutures()
+        self.__rotate()
+
+    def flush(self):
+        '''Flush all buffered rows to the current segment.'''
+        if self.__writer is not None:
+            self.__writer.flush()
+
+    def close(self):
+        '''Finish the last segment, and wait until all segments have been
+        compressed.
+
+        No more rows can be written once the writer has been closed.
+
+        :raises Exception: If compressing a segment failed
+
+        '''
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__rotate()
+
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__checkFutures()
+
+    def closed(self):
+        '''Determine if this writer has been closed.
+
+        :rtype: bool
+
+        '''
+        return self.__closed
+
+    ##### Private functions
+
+    def __rotate(self):
+        '''Finish the current segment.'''
+        writer = self.__writer
+        if writer is None:
+            return
+
+        writer.close()
+        self.__writer = None
+        self.__segment += 1
+
+        if self.__executor is None:
+            self.__finishSegment(writer.filename())
+        else:
+            self.__futures.append(
+                self.__executor.submit(self.__compress, writer.filename()))
+
+    def __writeRow(self, items):
+        '''Write a validated row, starting a new segment if needed.
+
+        :param items: The list, or dictionary of row items
+
+        :raises Exception: If the writer has been closed
+        :raises Exception: If compressing a segment failed
+
+        '''
+        if self.__closed:
+            raise Exception("Cannot write to closed file: %s" %
+                            self.__filename)
+
+        self.__checkFutures()
+
+        if self.__writer is not None and self.__segmentFull():
+            self.__rotate()
+
+        if self.__writer is None:
+            self.__writer = Writer(self.segmentFilename(self.__segment),
+                                   self.__headers, self.__delimiter,
+                                   self.__useHeaders, self.__overwrite,
+                                   flushRows=self.__flushRows,
+                                   bufferSize=self.__bufferSize,
+                                   keepRows=False)
+            self.__segmentRows = 0
+            self.__segmentStart = monotonic()
+
+        self.__writer.writeRow(items)
+        self.__segmentRows += 1
+
+    def __nextSegment(self):
+        '''Get the number of the segment after the highest numbered
+        segment which already exists.
+
+        :rtype: int
+
+        '''
+        root, ext = splitext(self.__filename)
+        extensions = "|".join(escape(extension) for extension, _, _ in
+                              Compressions.values())
+        pattern = r"%s-(\d+)%s(%s)?$" % (escape(basename(root)),
+                                        escape(ext), extensions)
+
+        directory = dirname(root) or "."
+        if not exists(directory):
+            return 0
+
+        segment = 0
+        for name in listdir(directory):
+            found = match(pattern, name)
+            if found is not None:
+                segment = max(segment, int(found.group(1)) + 1)
+
+        return segment
+
+    def __checkFutures(self):
+        '''Forget the segments which have been compressed, and raise the
+        first error raised while compressing them.
+
+        :raises Exception: If compressing a segment failed
+
+        '''
+        done = []
+        pending = []
+        for future in self.__futures:
+            if future.done():
+                done.append(future)
+            else:
+                pending.append(future)
+
+        self.__futures = pending
+        for future in done:
+            future.result()
+
+    def __segmentFull(self):
+        '''Determine if the current segment has reached any of its limits.
+
+        :rtype: bool
+
+        '''
+        if self.__maxRows is not None and \
+                self.__segmentRows >= self.__maxRows:
+            return True
+        elif self.__maxBytes is not None and \
+                self.__writer.bytesWritten() >= self.__maxBytes:
+            return True
+        elif self.__maxInterval is not None and \
+                (monotonic() - self.__segmentStart) >= self.__maxInterval:
+            return True
+
+        return False
+
+    def __compress(self, filename):
+        '''Replace a finished segment with a compressed copy.
+
+        :param filename: The path to the segment
+        :type filename: string
+
+        :raises Exception: If ``overwrite`` is False, and the compressed
+                           segment already exists
+
+        '''
+        extension, _, _ = Compressions[self.__compression]
+        compressed = filename + extension
+
+        # The uncompressed segment is kept, so that no rows are lost
+        if not self.__overwrite and exists(compressed):
+            raise Exception("Filename %s exists, and overwrite is disabled" %
+                            compressed)
+
+        with open(filename, 'rb') as source:
+            with openFile(compressed, 'wb', self.__compression,
+                          self.__compressionLevel) as target:
+                copyfileobj(source, target, self.__bufferSize)
+
+        unlink(filename)
+        self.__finishSegment(compressed)
+
+    def __finishSegment(self, filename):
+        '''Call the segment hook for a finished segment.
+
+        :param filename: The path to the finished segment
+        :type filename: string
+
+        '''
+        if self.__onSegment is not None:
+            self.__onSegment(filename)
@@ -0,0 +1,259 @@
+from array import array
+from datetime import date, datetime
+
+
+def parseBool(value):
+    '''Convert a string to a bool.
+
+    :param value: The string value
+    :type value: string
+
+    :rtype: bool
+
+    :raises ValueError: If the value is not a known bool string
+
+    '''
+    lower = value.strip().lower()
+    if lower in ("true", "t", "yes", "y", "1"):
+        return True
+    elif lower in ("false", "f", "no", "n", "0"):
+        return False
+
+    raise ValueError("Invalid bool: %s" % value)
+
+
+def parseDate(value):
+    '''Convert an ISO 8601 (YYYY-MM-DD) string to a date.
+
+    :param value: The string value
+    :type value: string
+
+    :rtype: datetime.date
+
+    '''
+    return date.fromisoformat(value.strip())
+
+
+def parseDatetime(value):
+    '''Convert an ISO 8601 string to a datetime.
+
+    :param value: The string value
+    :type value: string
+
+    :rtype: datetime.datetime
+
+    '''
+    return datetime.fromisoformat(value.strip())
+
+
+# Map of supported column types to functions which convert strings
+# to that type
+Converters = {
+    str: str,
+    int: int,
+    float: float,
+    bool: parseBool,
+    date: parseDate,
+    datetime: parseDatetime,
+    }
+
+# Map of column types to the array type codes used to store them compactly
+ArrayCodes = {
+    int: 'q',
+    float: 'd',
+    }
+
+
+def validateSchema(headers, schema):
+    '''Validate a schema mapping column headers to column types.
+
+    :param headers: The list of column headers
+    :type headers: list of strings
+    :param schema: The dictionary mapping column headers to types
+    :type schema: dict
+
+    :raises Exception: If the schema contains an unknown header
+    :raises Exception: If the schema contains an unsupported type
+
+    '''
+    invalid = [h for h in schema if h not in headers]
+    if len(invalid) > 0:
+        raise Exception("Schema contains unknown headers: %s" % invalid)
+
+    for header, valueType in schema.items():
+        if valueType not in Converters:
+            raise Exception("Unsupported type for column %s: %s" %
+                            (header, valueType))
+
+
+def convertValue(value, valueType):
+    '''Convert a single cell value to the given column type.
+
+    Values which are not strings, and empty strings (which represent missing
+    values), are returned unchanged.
+
+    :param value: The cell value
+    :param valueType: The column type
+    :type valueType: type
+
+    :raises Exception: If the value cannot be converted
+
+    '''
+    if not isinstance(value, str) or valueType is str or value == '':
+        return value
+
+    try:
+        return Converters[valueType](value)
+    except ValueError:
+        raise Exception("Cannot convert %r to %s" %
+                        (value, valueType.__name__))
+
+
+def convertColumn(values, valueType):
+    '''Convert an entire column of cell values to the given column type.
+
+    Numeric columns without any missing values are returned as a compact
+    :class:`array.array`, all other columns are returned as a list.
+
+    :param values: The list of cell values
+    :type values: list
+    :param valueType: The column type
+    :type valueType: type
+
+    :rtype: list or array
+
+    :raises Exception: If a value cannot be converted
+
+    '''
+    converter = Converters[valueType]
+
+    converted = None
+    if all(type(value) is str for value in values):
+        try:
+            # Fast path when every value is a string
+            converted = list(map(converter, values))
+        except ValueError:
+            pass  # Missing, or invalid values
+
+    if converted is None:
+        converted = [convertValue(value, valueType) for value in values]
+
+    code = ArrayCodes.get(valueType)
+    if code is not None:
+        try:
+            return array(code, converted)
+        except (TypeError, OverflowError):
+            pass  # Missing values, or values that are too large
+
+    return converted
+
+
+class HeaderSchema:
+    '''The HeaderSchema class maps column headers to their position within
+    a row.
+
+    A single HeaderSchema is shared by a CSV and all of its rows, which
+    allows rows to be stored as lists of values rather than dictionaries,
+    and makes looking up a header take constant time.
+
+    '''
+
+    __slots__ = ("__headers", "__positions")
+
+    def __init__(self, headers):
+        '''
+        :param headers: The list of column headers
+        :type headers: list of strings
+
+        '''
+        self.__headers = headers
+        self.__positions = dict((header, position)
+                                for position, header in enumerate(headers))
+
+    def headers(self):
+        '''Get the list of column headers.
+
+        :rtype: list of strings
+
+        '''
+        return self.__headers
+
+    def index(self, header):
+        '''Get the position of a column header.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: int
+
+        :raises Exception: If an unknown header is given
+
+        '''
+        position = self.__positions.get(header)
+        if position is None:
+            raise Exception("Invalid header: %s" % header)
+
+        return position
+
+    def normalize(self, values):
+        '''Get a list of values with exactly one value for each header.
+
+        Missing values are filled in with empty strings, and extra values
+        are discarded.
+
+        :param values: The list of values
+        :type values: list
+
+        :rtype: list
+
+        '''
+        numHeaders = len(self.__headers)
+        if len(values) == numHeaders:
+            return values
+        elif len(values) > numHeaders:
+            return values[:numHeaders]
+
+        return values + [''] * (numHeaders - len(values))
+
+    def toList(self, itemMap):
+        '''Convert a dictionary mapping column headers to values into a list
+        of values in order of the headers.
+
+        :param itemMap: The dictionary mapping column headers to values
+        :type itemMap: dict
+
+        :rtype: list
+
+        '''
+        return [itemMap.get(header, '') for header in self.__headers]
+
+    def validate(self, items):
+        '''Validate a row of items without converting it.
+
+        :param items: The list, tuple, or dictionary of row items
+
+        :raises Exception: If ``items`` is a list or tuple and is not equal
+                           to the number of headers
+        :raises Exception: If ``items`` is a dictionary and contains entries
+                           for unknown headers
+        :raises Exception: If ``items`` is not a list, tuple, or dictionary
+
+        '''
+        if isinstance(items, (list, tuple)):
+            if len(items) != len(self.__headers):
+                raise Exception("Expected %s items, but got %s" %
+                                (len(self.__headers), len(items)))
+        elif isinstance(items, dict):
+            invalid = [h for h in items if h not in self.__positions]
+            if len(invalid) > 0:
+                raise Exception("Attempting to add unknown headers: %s" %
+                                invalid)
+        else:
+            raise Exception("Unknown row type. Expected list, tuple, " \
+                                "or dictionary.")
+
+    def __contains__(self, header):
+        return header in self.__positions
+
+    def __len__(self):
+        return len(self.__headers)
@@ -0,0 +1,318 @@
+from heapq import merge
+from operator import itemgetter
+from pickle import HIGHEST_PROTOCOL, dump, load
+from sys import getsizeof
+from tempfile import TemporaryFile
+
+from icsv.reader import Reader
+from icsv.schema import HeaderSchema, validateSchema, convertValue
+from icsv.writer import Writer
+
+
+# The number of rows written at once when writing rows without a
+# memory limit
+RunBatchSize = 10000
+
+# The largest number of sorted runs merged at once. Each run being merged
+# holds a single batch of rows in memory, which is at most this fraction
+# of the memory limit
+MergeWidth = 64
+
+# The size of a reference to a row held in a list
+ReferenceSize = getsizeof([None]) - getsizeof([])
+
+
+def rowSize(item):
+    '''Estimate the number of bytes of memory used by a row and its
+    sort key, including the overhead of each Python object.
+
+    :param item: The (key, values) tuple of the row
+    :type item: tuple
+
+    :rtype: int
+
+    '''
+    key, values = item
+    return ReferenceSize + getsizeof(item) + getsizeof(key) + \
+        getsizeof(values) + sum(map(getsizeof, key)) + \
+        sum(map(getsizeof, values))
+
+
+def sortKey(types, key=None, convert=False, reverse=False):
+    '''Create a function which gets the sort key for the values of the
+    sorted columns of a row.
+
+    Values in typed columns are compared as their type, and missing values
+    (empty strings) in typed columns are sorted after all other values, in
+    either direction.
+
+    :param types: The list of types of the sorted columns, where None is an
+                  untyped column
+    :type types: list of types
+    :param key: A function applied to each value before it is compared,
+                or None
+    :type key: function
+    :param convert: True to convert the values to the column types
+                    before they are compared
+    :type convert: bool
+    :param reverse: True if the keys are sorted in descending order
+    :type reverse: bool
+
+    :rtype: function
+
+    '''
+    # Missing values are sorted last, and never compared to values
+    missing = (-1, None) if reverse else (1, None)
+
+    def columnKey(valueType):
+        '''Get the sort key function for a single column.'''
+        valueKey = key
+        if convert and valueType not in (None, str):
+            valueKey = lambda value: convertValue(value, valueType)
+            if key is not None:
+                valueKey = lambda value: key(convertValue(value, valueType))
+
+        if valueType in (None, str):
+            return valueKey
+
+        if valueKey is None:
+            return lambda value: missing if value == '' else (0, value)
+
+        return lambda value: missing if value == '' else (0, valueKey(value))
+
+    keys = [columnKey(valueType) for valueType in types]
+    if all(valueKey is None for valueKey in keys):
+        return tuple
+
+    keys = [(lambda value: value) if valueKey is None else valueKey
+            for valueKey in keys]
+    return lambda values: tuple(valueKey(value)
+                                for valueKey, value in zip(keys, values))
+
+
+def sortFile(filename, outputFilename, headers, key=None, reverse=False,
+             delimiter=',', containsHeaders=True, fileHeaders=None,
+             schema=None, memoryLimit=256 * 1024 * 1024, tempDir=None,
+             useHeaders=True, overwrite=True):
+    '''Sort the rows of a CSV file which may be too large to fit in memory,
+    and write them to another CSV file.
+
+    Rows are read in runs which fit within the memory limit. Each run is
+    sorted and written to a temporary file, and then all of the runs are
+    merged into the output file, which is written with an
+    :class:`icsv.Writer`. The sort is stable.
+
+    While the runs are merged, each run only holds a small batch of rows in
+    memory. When there are too many runs to merge within the memory limit,
+    groups of runs are first merged into larger runs.
+
+    The schema is only used to compare values. The output file contains
+    the values exactly as they appear in the input file.
+
+    :param filename: The path to the CSV file to sort
+    :type filename: string
+    :param outputFilename: The path to the sorted CSV file to write
+    :type outputFilename: string
+    :param headers: The column header, or list of column headers, to sort by
+    :type headers: string or list of strings
+    :param key: A function applied to each value before it is compared,
+                or None
+    :type key: function
+    :param reverse: True to sort in descending order
+    :type reverse: bool
+    :param delimiter: The CSV delimiter
+    :type delimiter: string
+    :param containsHeaders: True if the file list the headers as the first
+                            line, False if it does not
+    :type containsHeaders: bool
+    :param fileHeaders: The list of CSV headers. If this is None they will be
+                        automatically read from the file
+    :type fileHeaders: list of strings
+    :param schema: The dictionary mapping column headers to the types used
+                   to compare their values
+    :type schema: dict
+    :param memoryLimit: The approximate number of bytes of memory used by
+                        the rows held in memory at once, including the
+                        overhead of each Python object
+    :type memoryLimit: int
+    :param tempDir: The directory for the temporary files, or None to use
+                    the default temporary directory
+    :type tempDir: string
+    :param useHeaders: True will write the headers to the first line of the
+                       sorted CSV file, False will not
+    :type useHeaders: bool
+    :param overwrite: True will overwrite an existing sorted CSV file, False
+                      will not
+    :type overwrite: bool
+
+    :raises Exception: If the file does not exist
+    :raises Exception: If an unknown header is given
+    :raises Exception: If the schema contains unknown headers or types
+    :raises Exception: If ``overwrite`` is False, and the sorted file
+                       already exists
+
+    '''
+    reader = Reader(filename, fileHeaders, delimiter, containsHeaders)
+    headerSchema = HeaderSchema(reader.headers())
+
+    schema = {} if schema is None else schema
+    validateSchema(headerSchema, schema)
+
+    if isinstance(headers, str):
+        headers = [headers]
+
+    positions = [headerSchema.index(header) for header in headers]
+    getKey = sortKey([schema.get(header) for header in headers], key,
+                     convert=True, reverse=reverse)
+
+    writer = Writer(outputFilename, reader.headers(), delimiter, useHeaders,
+                    overwrite, flushRows=None, keepRows=False)
+
+    # Each batch of rows read from, or written to a run fits within a share
+    # of the memory limit
+    batchSize = max(memoryLimit // MergeWidth, 1)
+
+    runs = []
+    try:
+        run = []
+        runSize = 0
+        totalSize = 0
+        for values in reader.lists():
+            item = (getKey([values[p] for p in positions]), values)
+            run.append(item)
+
+            size = rowSize(item)
+            runSize += size
+            totalSize += size
+            if runSize >= memoryLimit:
+                run.sort(key=itemgetter(0), reverse=reverse)
+                runs.append(writeRun(run, batchRows(batchSize, run, runSize),
+                                     tempDir))
+                run = []
+                runSize = 0
+
+        run.sort(key=itemgetter(0), reverse=reverse)
+
+        if len(runs) == 0:
+            # Every row fit in memory
+            writer.writeRows(values for _, values in run)
+            return
+
+        numRows = len(run) + sum(numRunRows for _, numRunRows in runs)
+        rowsPerBatch = max(batchSize * numRows // totalSize, 1)
+
+        runs.append(writeRun(run, rowsPerBatch, tempDir))
+        run = None
+
+        # Merge consecutive runs in groups (which keeps the sort stable)
+        # until they can all be merged at once
+        while len(runs) > MergeWidth:
+            merged = []
+            for start in range(0, len(runs), MergeWidth):
+                group = runs[start:start + MergeWidth]
+                merged.append(writeRun(mergeRuns(group, reverse),
+                                       rowsPerBatch, tempDir))
+                for fd, _ in group:
+                    fd.close()
+
+            runs = merged
+
+        batch = []
+        for _, values in mergeRuns(runs, reverse):
+            batch.append(values)
+            if len(batch) >= rowsPerBatch:
+                writer.writeRows(batch)
+                batch = []
+        writer.writeRows(batch)
+    finally:
+        writer.close()
+
+        for fd, _ in runs:
+            fd.close()
+
+
+def batchRows(batchSize, rows, size):
+    '''Get the number of rows which fit in a batch.
+
+    :param batchSize: The number of bytes of memory used by a batch
+    :type batchSize: int
+    :param rows: The list of rows
+    :type rows: list
+    :param size: The number of bytes of memory used by the rows
+    :type size: int
+
+    :rtype: int
+
+    '''
+    return max(batchSize * len(rows) // max(size, 1), 1)
+
+
+def writeRun(rows, rowsPerBatch, tempDir):
+    '''Write a sorted run of rows to a temporary file.
+
+    :param rows: The sorted (key, values) tuples
+    :type rows: iterable of tuples
+    :param rowsPerBatch: The number of rows pickled at once
+    :type rowsPerBatch: int
+    :param tempDir: The directory for the temporary file, or None
+    :type tempDir: string
+
+    :returns: A tuple containing the temporary file, and the number of rows
+              written to it
+    :rtype: tuple
+
+    '''
+    fd = TemporaryFile(dir=tempDir)
+
+    numRows = 0
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= rowsPerBatch:
+            dump(batch, fd, HIGHEST_PROTOCOL)
+            numRows += len(batch)
+            batch = []
+
+    if len(batch) > 0:
+        dump(batch, fd, HIGHEST_PROTOCOL)
+        numRows += len(batch)
+
+    fd.seek(0)
+    return fd, numRows
+
+
+def mergeRuns(runs, reverse):
+    '''Merge sorted runs of rows.
+
+    :param runs: The list of (file, number of rows) tuples of the runs
+    :type runs: list of tuples
+    :param reverse: True if the runs are sorted in descending order
+    :type reverse: bool
+
+    :rtype: generator of (key, values) tuples
+
+    '''
+    return merge(*[readRun(fd) for fd, _ in runs], key=itemgetter(0),
+                 reverse=reverse)
+
+
+def readRun(fd):
+    '''Iterate over the rows of a sorted run, loading one batch of rows
+    at a time.
+
+    :param fd: The temporary file containing the run
+    :type fd: file
+
+    :rtype: generator of (key, values) tuples
+
+    '''
+    while True:
+        try:
+            batch = load(fd)
+        except EOFError:
+            return
+
+        # Only the remaining rows of the batch are kept in memory
+        batch.reverse()
+        while len(batch) > 0:
+            yield batch.pop()
@@ -0,0 +1,253 @@
+from locale import getpreferredencoding
+from os import stat
+
+
+class SourceFile:
+    '''The SourceFile class keeps track of the part of a CSV file which has
+    been loaded into an :class:`icsv.icsv`, so that rows appended to the
+    file afterwards can be read without reading the whole file again.
+
+    Only complete lines are ever read. A final line which was incomplete
+    when the file was loaded is read again once it has been completed.
+
+    The file is considered rewritten, rather than appended to, if it has
+    been replaced, has become smaller, or the bytes just before the loaded
+    offset have changed. The file is also considered rewritten once
+    anything is appended to it, if its headers line was missing or
+    incomplete when it was loaded. Compressed files cannot be appended to,
+    so they are considered rewritten whenever their size or modification
+    time changes.
+
+    '''
+
+    # The size (in bytes) of the blocks read when scanning the file
+    BlockSize = 65536
+
+    # The number of bytes before the loaded offset used to detect that the
+    # file has been rewritten
+    FingerprintSize = 64
+
+    def __init__(self, filename, info, numRows, containsHeaders,
+                 compression=None):
+        '''
+        :param filename: The path to the CSV file
+        :type filename: string
+        :param info: The result of calling :func:`os.stat` on the CSV file
+                     before it was loaded
+        :type info: :class:`os.stat_result`
+        :param numRows: The number of rows that were loaded
+        :type numRows: int
+        :param containsHeaders: True if the file list the headers as the first
+                                line, False if it does not
+        :type containsHeaders: bool
+        :param compression: The compression of the file, or None
+        :type compression: string
+
+        '''
+        self.__filename = filename
+        self.__compression = compression
+        self.__encoding = getpreferredencoding(False)
+        self.__info = info
+
+        self.__offset = info.st_size
+        self.__partial = False
+        self.__headersIncomplete = False
+
+        if compression is None:
+            headersLoaded = containsHeaders and \
+                (numRows > 0 or self.__containsLine())
+            numLines = numRows + (1 if headersLoaded else 0)
+
+            self.__offset, self.__partial = self.__loadedOffset(numLines)
+
+            # The headers line was missing, or was the incomplete line
+            self.__headersIncomplete = containsHeaders and \
+                (not headersLoaded or (self.__partial and numRows == 0))
+
+        self.__fingerprint = self.__readFingerprint()
+
+    def filename(self):
+        '''Get the path to the CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
+    def offset(self):
+        '''Get the byte offset of the end of the last complete line that
+        has been loaded.
+
+        :rtype: int
+
+        '''
+        return self.__offset
+
+    def partial(self):
+        '''Determine if the last loaded line was incomplete, and has not
+        been completed yet.
+
+        :rtype: bool
+
+        '''
+        return self.__partial
+
+    def rewritten(self):
+        '''Determine if the file has been rewritten since it was loaded.
+
+        :rtype: bool
+
+        '''
+        try:
+            info = stat(self.__filename)
+        except FileNotFoundError:
+            return True
+
+        if info.st_ino != self.__info.st_ino or info.st_size < self.__offset:
+            return True
+
+        if self.__headersIncomplete and info.st_size != self.__info.st_size:
+            return True
+
+        if self.__compression is not None:
+            return info.st_size != self.__info.st_size or \
+                info.st_mtime_ns != self.__info.st_mtime_ns
+
+        return self.__readFingerprint() != self.__fingerprint
+
+    def readLines(self):
+        '''Read the complete lines appended to the file since it was loaded,
+        or since the lines were last read.
+
+        :returns: A tuple containing the list of non-empty lines, and True if
+                  the first line completes the incomplete final line that
+                  was previously loaded
+        :rtype: tuple
+
+        '''
+        if self.__compression is not None:
+            return [], False
+
+        with open(self.__filename, 'rb') as fd:
+            fd.seek(self.__offset)
+            content = fd.read()
+
+        end = content.rfind(b'\n') + 1
+        lines = [line.strip() for line in
+                 content[:end].decode(self.__encoding).split('\n')]
+        lines = [line for line in lines if len(line) > 0]
+
+        completesPartial = self.__partial and end > 0
+        if completesPartial:
+            self.__partial = False
+
+        self.__offset += end
+        self.__info = stat(self.__filename)
+        self.__fingerprint = self.__readFingerprint()
+
+        return lines, completesPartial
+
+    ##### Private functions
+
+    def __loadedOffset(self, numLines):
+        '''Get the byte offset of the end of the last complete line that
+        was loaded.
+
+        :param numLines: The number of non-empty lines that were loaded
+        :type numLines: int
+
+        :returns: A tuple containing the offset, and True if the last loaded
+                  line was incomplete
+        :rtype: tuple
+
+        '''
+        size = self.__info.st_size
+
+        with open(self.__filename, 'rb') as fd:
+            current = stat(self.__filename)
+            unchanged = current.st_size == size and \
+                current.st_mtime_ns == self.__info.st_mtime_ns
+
+            if unchanged:
+                # The whole file was loaded
+                fd.seek(max(0, size - 1))
+                if size == 0 or fd.read(1) == b'\n':
+                    return size, False
+
+                end = self.__lastLineEnd(fd, size)
+                fd.seek(end)
+                return end, len(fd.read().strip()) > 0
+
+            # The file changed while it was loaded, so find the end of the
+            # last line that was loaded
+            fd.seek(0)
+            offset = 0
+            for line in iter(fd.readline, b''):
+                if numLines == 0:
+                    break
+
+                if len(line.strip()) > 0:
+                    numLines -= 1
+                    if not line.endswith(b'\n'):
+                        return offset, True
+
+                offset += len(line)
+
+            return offset, False
+
+    def __containsLine(self):
+        '''Determine if the loaded part of the file contains a non-empty
+        line.
+
+        :rtype: bool
+
+        '''
+        with open(self.__filename, 'rb') as fd:
+            remaining = self.__info.st_size
+            while remaining > 0:
+                block = fd.read(min(remaining, self.BlockSize))
+                if len(block) == 0:
+                    break
+                elif len(block.strip()) > 0:
+                    return True
+
+                remaining -= len(block)
+
+        return False
+
+    def __lastLineEnd(self, fd, size):
+        '''Get the byte offset of the end of the last complete line.
+
+        :param fd: The open file
+        :type fd: file
+        :param size: The size of the file
+        :type size: int
+
+        :rtype: int
+
+        '''
+        end = size
+        while end > 0:
+            start = max(0, end - self.BlockSize)
+            fd.seek(start)
+            position = fd.read(end - start).rfind(b'\n')
+            if position != -1:
+                return start + position + 1
+
+            end = start
+
+        return 0
+
+    def __readFingerprint(self):
+        '''Read the bytes just before the loaded offset.
+
+        :rtype: bytes
+
+        '''
+        if self.__compression is not None:
+            return b''
+
+        start = max(0, self.__offset - self.FingerprintSize)
+        with open(self.__filename, 'rb') as fd:
+            fd.seek(start)
+            return fd.read(self.__offset - start)
@@ -0,0 +1,526 @@
+from array import array
+from gc import disable, enable, isenabled
+from operator import itemgetter
+
+
+class RowStorage:
+    '''The RowStorage class stores CSV data as a list of rows, where each
+    row is a list of values in order of the column headers.
+
+    This is the default storage used by the :class:`icsv.icsv` class, and is
+    best suited to row oriented access.
+
+    Copies of the storage share their rows, which are only copied when
+    they are changed.
+
+    '''
+
+    def __init__(self, schema):
+        '''
+        :param schema: The schema for the column headers
+        :type schema: :class:`icsv.HeaderSchema`
+
+        '''
+        self.__schema = schema
+        self.__rows = []
+
+        # True if the rows may be shared with another storage
+        self.__shared = False
+
+    def __len__(self):
+        '''Get the number of rows stored.'''
+        return len(self.__rows)
+
+    def append(self, values):
+        '''Append a row to the storage.
+
+        :param values: The list of values in order of the column headers
+        :type values: list
+
+        '''
+        self.__rows.append(values)
+
+    def extend(self, rows):
+        '''Append several rows to the storage.
+
+        :param rows: The list of rows, where each row is a list of values in
+                     order of the column headers
+        :type rows: list of lists
+
+        '''
+        self.__rows.extend(rows)
+
+    def extendColumns(self, columns):
+        '''Append several rows to the storage, given as columns.
+
+        :param columns: The list of columns in order of the column headers,
+                        where each column is a list (or array) of values
+        :type columns: list of lists
+
+        '''
+        # None of the new rows can be freed, so collecting garbage while
+        # they are created only wastes time
+        enabled = isenabled()
+        disable()
+        try:
+            self.__rows.extend(map(list, zip(*columns)))
+        finally:
+            if enabled:
+                enable()
+
+    def remove(self, row):
+        '''Remove a row from the storage.
+
+        :param row: The row index
+        :type row: int
+
+        '''
+        del self.__rows[row]
+
+    def get(self, row, header):
+        '''Get the value of a single cell.
+
+        :param row: The row index
+        :type row: int
+        :param header: The column header
+        :type header: string
+
+        '''
+        return self.__rows[row][self.__schema.index(header)]
+
+    def set(self, row, header, value):
+        '''Set the value of a single cell.
+
+        :param row: The row index
+        :type row: int
+        :param header: The column header
+        :type header: string
+        :param value: The cell value
+
+        '''
+        if self.__shared:
+            self.__rows[row] = list(self.__rows[row])
+
+        self.__rows[row][self.__schema.index(header)] = value
+
+    def rowValues(self, row):
+        '''Get the list of values in a row, in order of the column headers.
+
+        The returned list is the storage for the row itself, it is not
+        copied and must not be changed.
+
+        :param row: The row index
+        :type row: int
+
+        :rtype: list
+
+        '''
+        return self.__rows[row]
+
+    def column(self, header):
+        '''Get the list of values in a column.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list
+
+        '''
+        return list(map(itemgetter(self.__schema.index(header)), self.__rows))
+
+    def copyColumn(self, header):
+        '''Get a copy of the list of values in a column, which is safe
+        to change.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list
+
+        '''
+        return self.column(header)
+
+    def setColumn(self, header, values):
+        '''Replace all of the values in a column.
+
+        :param header: The column header
+        :type header: string
+        :param values: The list of values, one per row
+        :type values: list
+
+        '''
+        self.setColumns({header: values})
+
+    def setColumns(self, columns):
+        '''Replace all of the values in several columns.
+
+        :param columns: The dictionary mapping column headers to the list of
+                        values, one per row
+        :type columns: dict
+
+        '''
+        positions = [self.__schema.index(header) for header in columns]
+        columnValues = list(columns.values())
+
+        for index, values in enumerate(zip(*columnValues)):
+            row = self.__rows[index]
+
+            if self.__shared:
+                # Shared rows are only copied if they are actually changed
+                unchanged = all(row[position] is value
+                                for position, value in zip(positions, values))
+                if unchanged:
+                    continue
+
+                row = list(row)
+                self.__rows[index] = row
+
+            for position, value in zip(positions, values):
+                row[position] = value
+
+    def reorder(self, order):
+        '''Rearrange the rows.
+
+        :param order: The list of current row indexes in their new order
+        :type order: list of ints
+
+        '''
+        rows = self.__rows
+        self.__rows = [rows[row] for row in order]
+
+    def copy(self):
+        '''Create a copy of this storage.
+
+        The copy shares the rows with this storage until they are changed.
+
+        :rtype: :class:`icsv.storage.RowStorage`
+
+        '''
+        storage = RowStorage(self.__schema)
+        storage.__rows = list(self.__rows)
+
+        storage.__shared = True
+        self.__shared = True
+
+        return storage
+
+    def rows(self):
+        '''Iterate over the rows as lists of values in order of the
+        column headers.
+
+        The rows are not copied and must not be changed.
+
+        :rtype: generator of lists
+
+        '''
+        return iter(self.__rows)
+
+
+class ColumnStorage:
+    '''The ColumnStorage class stores CSV data as one contiguous list of
+    values per column header.
+
+    Column headers are not repeated for every row, which greatly reduces the
+    memory used by CSVs with many columns, and an entire column can be
+    fetched without scanning the rows.
+
+    Columns may also be stored as an :class:`array.array`, which is converted
+    back to a list if a value that the array cannot hold is stored.
+
+    Copies of the storage share their columns, which are only copied when
+    they are changed.
+
+    '''
+
+    def __init__(self, schema):
+        '''
+        :param schema: The schema for the column headers
+        :type schema: :class:`icsv.HeaderSchema`
+
+        '''
+        headers = schema.headers()
+
+        self.__schema = schema
+        self.__headers = headers
+        self.__columns = dict((header, []) for header in headers)
+        self.__numRows = 0
+
+        # Headers of the columns that may be shared with another storage
+        self.__shared = set()
+
+    def __len__(self):
+        '''Get the number of rows stored.'''
+        return self.__numRows
+
+    def append(self, values):
+        '''Append a row to the storage.
+
+        :param values: The list of values in order of the column headers
+        :type values: list
+
+        '''
+        for header, value in zip(self.__headers, values):
+            try:
+                self.__own(header).append(value)
+            except (TypeError, OverflowError):
+                self.__toList(header).append(value)
+
+        self.__numRows += 1
+
+    def extend(self, rows):
+        '''Append several rows to the storage.
+
+        :param rows: The list of rows, where each row is a list of values in
+                     order of the column headers
+        :type rows: list of lists
+
+        '''
+        for position, header in enumerate(self.__headers):
+            values = list(map(itemgetter(position), rows))
+
+            column = self.__own(header)
+            if isinstance(column, array):
+                try:
+                    values = array(column.typecode, values)
+                except (TypeError, OverflowError):
+                    column = self.__toList(header)
+
+            column.extend(values)
+
+        self.__numRows += len(rows)
+
+    def extendColumns(self, columns):
+        '''Append several rows to the storage, given as columns.
+
+        Columns are used as they are while the storage is empty, so they must
+        not be changed by the caller afterwards.
+
+        :param columns: The list of columns in order of the column headers,
+                        where each column is a list (or array) of values
+        :type columns: list of lists
+
+        '''
+        numRows = len(columns[0]) if len(columns) > 0 else 0
+        for header, values in zip(self.__headers, columns):
+            column = self.__own(header)
+            if len(column) == 0:
+                self.__columns[header] = values
+                continue
+
+            if isinstance(values, array):
+                values = values.tolist()
+
+            if isinstance(column, array):
+                try:
+                    values = array(column.typecode, values)
+                except (TypeError, OverflowError):
+                    column = self.__toList(header)
+
+            column.extend(values)
+
+        self.__numRows += numRows
+
+    def remove(self, row):
+        '''Remove a row from the storage.
+
+        :param row: The row index
+        :type row: int
+
+        '''
+        for header in self.__headers:
+            del self.__own(header)[row]
+
+        self.__numRows -= 1
+
+    def get(self, row, header):
+        '''Get the value of a single cell.
+
+        :param row: The row index
+        :type row: int
+        :param header: The column header
+        :type header: string
+
+        '''
+        return self.__columns[header][row]
+
+    def set(self, row, header, value):
+        '''Set the value of a single cell.
+
+        :param row: The row index
+        :type row: int
+        :param header: The column header
+        :type header: string
+        :param value: The cell value
+
+        '''
+        try:
+            self.__own(header)[row] = value
+        except (TypeError, OverflowError):
+            self.__toList(header)[row] = value
+
+    def rowValues(self, row):
+        '''Get the list of values in a row, in order of the column headers.
+
+        :param row: The row index
+        :type row: int
+
+        :rtype: list
+
+        '''
+        return [self.__columns[header][row] for header in self.__headers]
+
+    def column(self, header):
+        '''Get the list of values in a column.
+
+        The returned list is the storage for the column itself, it is not
+        copied and must not be changed.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list
+
+        '''
+        return self.__columns[header]
+
+    def copyColumn(self, header):
+        '''Get a copy of the list of values in a column, which is safe
+        to change.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list or array
+
+        '''
+        return self.__columns[header][:]
+
+    def setColumn(self, header, values):
+        '''Replace all of the values in a column.
+
+        :param header: The column header
+        :type header: string
+        :param values: The list (or array) of values, one per row
+        :type values: list
+
+        '''
+        self.__columns[header] = values
+        self.__shared.discard(header)
+
+    def setColumns(self, columns):
+        '''Replace all of the values in several columns.
+
+        :param columns: The dictionary mapping column headers to the list of
+                        values, one per row
+        :type columns: dict
+
+        '''
+        for header, values in columns.items():
+            self.setColumn(header, values)
+
+    def reorder(self, order):
+        '''Rearrange the rows.
+
+        :param order: The list of current row indexes in their new order
+        :type order: list of ints
+
+        '''
+        for header in self.__headers:
+            column = self.__columns[header]
+            values = [column[row] for row in order]
+            if isinstance(column, array):
+                values = array(column.typecode, values)
+
+            # The rearranged column is never shared
+            self.__columns[header] = values
+            self.__shared.discard(header)
+
+    def copy(self):
+        '''Create a copy of this storage.
+
+        The copy shares the columns with this storage until they
+        are changed.
+
+        :rtype: :class:`icsv.storage.ColumnStorage`
+
+        '''
+        storage = ColumnStorage(self.__schema)
+        storage.__columns = dict(self.__columns)
+        storage.__numRows = self.__numRows
+
+        storage.__shared = set(self.__headers)
+        self.__shared = set(self.__headers)
+
+        return storage
+
+    def rows(self):
+        '''Iterate over the rows as lists of values in order of the
+        column headers.
+
+        :rtype: generator of lists
+
+        '''
+        columns = [self.__columns[header] for header in self.__headers]
+        if len(columns) == 0:
+            for _ in range(self.__numRows):
+                yield []
+        else:
+            for values in zip(*columns):
+                yield list(values)
+
+    ##### Private functions
+
+    def __own(self, header):
+        '''Get a column that is safe to change, copying it if it may be
+        shared with another storage.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list or array
+
+        '''
+        if header in self.__shared:
+            self.__columns[header] = self.__columns[header][:]
+            self.__shared.discard(header)
+
+        return self.__columns[header]
+
+    def __toList(self, header):
+        '''Convert the storage for a column to a list.
+
+        :param header: The column header
+        :type header: string
+
+        :rtype: list
+
+        '''
+        column = list(self.__columns[header])
+        self.__columns[header] = column
+        self.__shared.discard(header)
+        return column
+
+
+# Map of storage names to storage classes
+Storages = {
+    "row": RowStorage,
+    "column": ColumnStorage,
+    }
+
+
+def createStorage(storage, schema):
+    '''Create the storage for CSV data.
+
+    :param storage: The name of the storage type ("row" or "column")
+    :type storage: string
+    :param schema: The schema for the column headers
+    :type schema: :class:`icsv.HeaderSchema`
+
+    :raises Exception: If an unknown storage type is given
+
+    '''
+    if storage not in Storages:
+        raise Exception("Unknown storage: %s. Expected one of: %s" %
+                        (storage, sorted(Storages.keys())))
+
+    return Storages[storage](schema)
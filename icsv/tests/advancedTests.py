@@ -48,3 +48,63 @@ class AdvancedTests(TestCase):
 
             # All returned cells should have a value of 1
             self.assertEqual(cells[index].value(), 1)
+
+    def test_filterRows(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["one", "two", "three"], storage=storage)
+            csv.addRow([0, 0, 0])
+            csv.addRow([1, 0, 0])
+            csv.addRow([1, 1, 0])
+            csv.addRow([1, 1, 1])
+
+            calls = []
+
+            def isOne(value):
+                calls.append(value)
+                return value == 1
+
+            # Only the values of the requested column are checked
+            self.assertEqual(csv.filterRows("two", isOne), [2, 3])
+            self.assertEqual(len(calls), csv.numRows())
+
+            self.assertEqual(csv.filterRows("three", lambda v: v == 2), [])
+            self.assertRaises(Exception, csv.filterRows, "four", isOne)
+
+    def test_filterCol(self):
+        csv = icsv(["one", "two"], storage="column")
+        for index in range(10):
+            csv.addRow([index, index % 3])
+
+        rows = csv.filterCol("two", lambda values: [v == 0 for v in values])
+        self.assertEqual(rows, [0, 3, 6, 9])
+
+        # The filter must return a value for each row
+        self.assertRaises(Exception, csv.filterCol, "one",
+                          lambda values: [True])
+
+    def test_sort(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["id", "name"], storage=storage, schema={"id": int})
+            csv.addRows([[10, "b"], [2, "a"], ["", "c"], [2, "c"], [9, "a"]])
+            index = csv.createIndex("name")
+
+            # Typed columns are compared numerically, missing values last
+            csv.sort("id")
+            self.assertEqual(list(csv.getCol("id").data()),
+                             [2, 2, 9, 10, ''])
+            self.assertEqual(csv.getCol("name").data(),
+                             ["a", "c", "a", "b", "c"])
+            self.assertEqual(index.find("a"), [0, 2])
+
+            # Missing values are still last in descending order
+            csv.sort(["name", "id"], reverse=True)
+            self.assertEqual([row.list() for row in csv.data()],
+                             [[2, "c"], ["", "c"], [10, "b"], [9, "a"],
+                              [2, "a"]])
+
+            # The sort is stable
+            csv.sort("name", key=lambda value: value in ["a", "b"])
+            self.assertEqual(csv.getCol("name").data(),
+                             ["c", "c", "b", "a", "a"])
+
+            self.assertRaises(Exception, csv.sort, "unknown")
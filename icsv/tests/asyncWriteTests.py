@@ -0,0 +1,109 @@
+from asyncio import run, gather
+from os import unlink
+from os.path import exists
+
+from unittest import TestCase
+
+from icsv import AsyncWriter
+
+
+class AsyncWriteTests(TestCase):
+    def setUp(self):
+        pass
+
+    def test_writeRow(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        async def write():
+            writer = AsyncWriter(filename, ["a", "b"])
+            self.assertEqual(writer.headers(), ["a", "b"])
+            self.assertEqual(writer.delimiter(), ',')
+
+            await writer.writeRow([0, 1])
+            await writer.writeRow({"b": 3})
+            await writer.flush()
+            self.assertEqual(self.__readFile(filename), ["a,b", "0,1", ",3"])
+
+            await writer.writeRows([i, i + 1] for i in range(3))
+            await writer.aclose()
+            self.assertTrue(writer.closed())
+
+        run(write())
+        self.assertEqual(self.__readFile(filename),
+                         ["a,b", "0,1", ",3", "0,1", "1,2", "2,3"])
+
+    def test_contextManager(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        async def write():
+            async with AsyncWriter(filename, ["a", "b"]) as writer:
+                for index in range(100):
+                    await writer.writeRow([index, index + 1])
+            return writer
+
+        writer = run(write())
+        self.assertTrue(writer.closed())
+        content = self.__readFile(filename)
+        self.assertEqual(len(content), 101)
+        self.assertEqual(content[-1], "99,100")
+
+        # Cannot write once closed
+        self.assertRaises(Exception, run, writer.writeRow([0, 1]))
+
+    def test_backpressure(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        async def produce(writer, start):
+            for index in range(start, start + 500):
+                await writer.writeRow([index, index])
+
+        async def write():
+            async with AsyncWriter(filename, ["a", "b"], maxQueueSize=4,
+                                   batchSize=3) as writer:
+                await gather(*[produce(writer, start)
+                               for start in range(0, 2000, 500)])
+
+        run(write())
+        content = self.__readFile(filename)
+        self.assertEqual(len(content), 2001)
+        self.assertEqual(sorted(int(line.split(',')[0])
+                                for line in content[1:]), list(range(2000)))
+
+    def test_invalidRows(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        async def write():
+            async with AsyncWriter(filename, ["a", "b"]) as writer:
+                await writer.writeRow([0, 1])
+
+                with self.assertRaises(Exception):
+                    await writer.writeRow([0])
+                with self.assertRaises(Exception):
+                    await writer.writeRow({"c": 0})
+
+                # Nothing is queued for invalid batches
+                with self.assertRaises(Exception):
+                    await writer.writeRows([[2, 3], [0]])
+
+        run(write())
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1"])
+
+    ##### Private helper functions
+
+    def __readFile(self, filename):
+        if not exists(filename):
+            raise Exception("File does not exist: %s" % filename)
+
+        fd = open(filename, 'r')
+        content = fd.read()
+        fd.close()
+
+        return content.strip().split('\n')
+
+    def __deleteFile(self, filename):
+        if exists(filename):
+            unlink(filename)
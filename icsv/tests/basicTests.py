@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from icsv import icsv, Row
+from icsv import icsv, Row, Rows, HeaderSchema
 
 
 class BasicTests(TestCase):
@@ -157,3 +157,112 @@ class BasicTests(TestCase):
         self.assertEqual(str(row), "1,2,3")
         self.assertEqual(row.list(), [1, 2, 3])
         self.assertTrue(isinstance(row, Row))
+
+    def test_headerSchema(self):
+        schema = HeaderSchema(["a", "b", "c"])
+        self.assertEqual(len(schema), 3)
+        self.assertEqual(schema.headers(), ["a", "b", "c"])
+        self.assertEqual(schema.index("c"), 2)
+        self.assertTrue("b" in schema)
+        self.assertFalse("d" in schema)
+        self.assertRaises(Exception, schema.index, "d")
+
+        self.assertEqual(schema.toList({"c": 3, "a": 1}), [1, '', 3])
+        self.assertEqual(schema.normalize([1]), [1, '', ''])
+        self.assertEqual(schema.normalize([1, 2, 3, 4]), [1, 2, 3])
+
+    def test_rowFromSchema(self):
+        schema = HeaderSchema(["a", "b", "c"])
+
+        # Rows can be created from a list or a dictionary
+        row = Row(schema, [1, 2, 3], '/')
+        self.assertEqual(row["b"], 2)
+        self.assertEqual(row.getCell("c"), 3)
+        self.assertEqual(row.dict(), {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(str(row), "1/2/3")
+        self.assertEqual(row.numCols(), 3)
+        self.assertRaises(Exception, row.getCell, "d")
+
+        row = Row(["a", "b", "c"], {"b": 2})
+        self.assertEqual(row.list(), ['', 2, ''])
+        self.assertEqual(str(row), ",2,")
+
+        # Rows of a CSV share the same schema
+        csv = icsv(["a", "b"])
+        csv.addRow([1, 2])
+        csv.addRow({"b": 4})
+        self.assertEqual(csv.getHeaderIndex("b"), 1)
+        self.assertRaises(Exception, csv.getHeaderIndex, "c")
+        self.assertEqual(csv.getRow(1).list(), ['', 4])
+        self.assertEqual(csv.getRow(1)["b"], 4)
+
+    def test_lazyData(self):
+        csv = icsv(["a", "b"])
+        for index in range(10):
+            csv.addRow([index, index * 2])
+
+        data = csv.data()
+        self.assertTrue(isinstance(data, Rows))
+        self.assertEqual(len(data), 10)
+        self.assertEqual(data[3].list(), [3, 6])
+        self.assertEqual(data[-1].list(), [9, 18])
+        self.assertRaises(IndexError, data.__getitem__, 10)
+        self.assertEqual([row["a"] for row in data], list(range(10)))
+
+        # Slices are also lazy
+        part = data[2:8:2]
+        self.assertTrue(isinstance(part, Rows))
+        self.assertEqual([row["b"] for row in part], [4, 8, 12])
+        self.assertEqual(part[-1]["a"], 6)
+
+        # The sequence is a view of the CSV
+        csv.addRow([10, 20])
+        self.assertEqual(len(data), 11)
+
+    def test_rowMapping(self):
+        csv = icsv(["a", "b"])
+        csv.addRow([1, 2])
+
+        mapping = csv.getRow().dict()
+        self.assertEqual(mapping, {"a": 1, "b": 2})
+        self.assertEqual(len(mapping), 2)
+        self.assertEqual(list(mapping.keys()), ["a", "b"])
+        self.assertEqual(mapping.get("c", 3), 3)
+        self.assertRaises(KeyError, mapping.__getitem__, "c")
+
+        def setItem():
+            mapping["a"] = 5
+        self.assertRaises(TypeError, setItem)
+
+        # The mapping is a view of the row
+        csv.setCell("a", 5)
+        self.assertEqual(mapping["a"], 5)
+        self.assertEqual(dict(mapping), {"a": 5, "b": 2})
+
+    def test_addRows(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["a", "b", "c"], storage=storage)
+            csv.createIndex("a")
+
+            csv.addRows([[1, 2, 3], (4, 5, 6), {"c": 9, "a": 7}])
+            self.assertEqual(csv.numRows(), 3)
+            self.assertEqual(str(csv), "a,b,c\n1,2,3\n4,5,6\n7,,9")
+            self.assertEqual(csv.find("a", 7), [2])
+
+            # Generators can be added
+            csv.addRows([i, i, i] for i in range(3))
+            self.assertEqual(csv.numRows(), 6)
+            self.assertEqual(csv.getCol("a").data(), [1, 4, 7, 0, 1, 2])
+            self.assertEqual(csv.find("a", 1), [0, 4])
+
+            # Invalid batches are not added at all
+            self.assertRaises(Exception, csv.addRows, [[1, 2, 3], [1, 2]])
+            self.assertRaises(Exception, csv.addRows, [[1, 2, 3], {"d": 1}])
+            self.assertRaises(Exception, csv.addRows, [[1, 2, 3], 1])
+            self.assertEqual(csv.numRows(), 6)
+
+    def test_addRowsTyped(self):
+        csv = icsv(["a", "b"], storage="column", schema={"a": int})
+        csv.addRows([["1", "x"], ["2", "y"]])
+        csv.addRows([{"b": "z"}])
+        self.assertEqual(list(csv.getCol("a").data()), [1, 2, ''])
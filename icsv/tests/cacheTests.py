@@ -0,0 +1,160 @@
+from datetime import date, datetime
+from os import listdir, stat, utime
+from os.path import exists, join
+from pickle import dumps
+from shutil import rmtree
+from struct import calcsize
+
+from unittest import TestCase
+
+from icsv import icsv, FileCache
+
+
+class CacheTests(TestCase):
+    def setUp(self):
+        self.__directory = "/tmp/icsvCacheTests"
+        if exists(self.__directory):
+            rmtree(self.__directory)
+
+    def tearDown(self):
+        rmtree(self.__directory)
+
+    def test_fromFile(self):
+        filename = "/tmp/testCsv.csv"
+        self.__writeFile(filename, ["a,b", "0,1", "2,3"])
+
+        cache = FileCache(self.__directory)
+        self.assertEqual(cache.size(), 0)
+
+        for storage in ["row", "column"]:
+            csv = icsv.fromFile(filename, storage=storage, cache=cache)
+            self.assertEqual(csv.getRow(1).list(), ["2", "3"])
+            self.assertTrue(cache.size() > 0)
+
+        # The cached columns are loaded rather than parsing the file
+        self.assertEqual(cache.load(filename, self.__key(["a", "b"])),
+                         [["0", "2"], ["1", "3"]])
+
+        # Changed files are parsed again
+        self.__writeFile(filename, ["a,b", "0,1", "2,3", "4,5"])
+        self.assertEqual(cache.load(filename, self.__key(["a", "b"])), None)
+
+        csv = icsv.fromFile(filename, cache=cache)
+        self.assertEqual(csv.numRows(), 3)
+        self.assertEqual(icsv.fromFile(filename, cache=cache).numRows(), 3)
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+    def test_typedColumns(self):
+        filename = "/tmp/testCsv.csv"
+        self.__writeFile(filename, ["a,b", "0,1.5", "2,"])
+
+        cache = FileCache(self.__directory)
+        for _ in range(2):
+            for storage in ["row", "column"]:
+                csv = icsv.fromFile(filename, storage=storage, cache=cache,
+                                    schema={"a": int, "b": float})
+                self.assertEqual(list(csv.getCol("a").data()), [0, 2])
+                self.assertEqual(csv.getCol("b").data(), [1.5, ''])
+
+        # The untyped rows are cached separately
+        csv = icsv.fromFile(filename, cache=cache)
+        self.assertEqual(csv.getCol("a").data(), ["0", "2"])
+        self.assertEqual(len(listdir(self.__directory)), 2)
+
+    def test_cacheFormat(self):
+        filename = "/tmp/testCsv.csv"
+        self.__writeFile(filename, ["a,b,c,d,e",
+                                    "2020-01-02,2020-01-02T03:04:05,t,1,x",
+                                    ",,,,", "2020-01-03,,f,2,y\0z"])
+
+        schema = {"a": date, "b": datetime, "c": bool, "d": int}
+        cache = FileCache(self.__directory)
+        self.assertEqual(stat(self.__directory).st_mode & 0o777, 0o700)
+
+        for _ in range(2):
+            for storage in ["row", "column"]:
+                csv = icsv.fromFile(filename, cache=cache, schema=schema,
+                                    storage=storage)
+                self.assertEqual(csv.getRow(0).list(),
+                                 [date(2020, 1, 2),
+                                  datetime(2020, 1, 2, 3, 4, 5), True, 1,
+                                  "x"])
+                self.assertEqual(csv.getRow(1).list(), ['', '', '', '', ''])
+                self.assertEqual(csv.getRow(2).list(),
+                                 [date(2020, 1, 3), '', False, 2, "y\0z"])
+
+        key = ["a", "b", "c", "d", "e"], ',', True, \
+            [("a", "date"), ("b", "datetime"), ("c", "bool"), ("d", "int")]
+        self.assertEqual(cache.load(filename, key)[3], [1, '', 2])
+
+        # Cache files which are not in the cache format are ignored, and
+        # never unpickled
+        cacheFilename = join(self.__directory, listdir(self.__directory)[0])
+        with open(cacheFilename, 'rb') as fd:
+            header = fd.read(calcsize(FileCache.CacheHeader))
+        with open(cacheFilename, 'wb') as fd:
+            fd.write(header + dumps([["x"]]))
+
+        self.assertEqual(cache.load(filename, key), None)
+        self.assertEqual(icsv.fromFile(filename, cache=cache,
+                                       schema=schema).numRows(), 3)
+
+    def test_numberColumns(self):
+        filename = "/tmp/testCsv.csv"
+        self.__writeFile(filename, ["a,b"] + ["%d,%d.25" % (i, i)
+                                              for i in range(1000)])
+
+        cache = FileCache(self.__directory)
+        schema = {"a": int, "b": float}
+        icsv.fromFile(filename, storage="column", cache=cache, schema=schema)
+
+        # Numbers are stored as arrays, rather than as strings
+        key = ["a", "b"], ',', True, [("a", "int"), ("b", "float")]
+        a, b = cache.load(filename, key)
+        self.assertEqual((a.typecode, b.typecode), ('q', 'd'))
+
+        csv = icsv.fromFile(filename, storage="column", cache=cache,
+                            schema=schema)
+        self.assertEqual(csv.getCol("a").data()[999], 999)
+        self.assertEqual(csv.getCol("b").data()[-1], 999.25)
+
+    def test_eviction(self):
+        cache = FileCache(self.__directory, maxSize=1500)
+        self.assertEqual(cache.maxSize(), 1500)
+        self.assertEqual(cache.directory(), self.__directory)
+
+        filenames = ["/tmp/testCsv%d.csv" % i for i in range(3)]
+        for filename in filenames:
+            self.__writeFile(filename, ["a"] + ["%05d" % i
+                                                for i in range(100)])
+
+        icsv.fromFile(filenames[0], cache=cache)
+        icsv.fromFile(filenames[1], cache=cache)
+        self.__age(2)
+
+        # Using the first file makes the second the least recently used
+        self.assertTrue(cache.load(filenames[0], self.__key(["a"])))
+        icsv.fromFile(filenames[2], cache=cache)
+
+        self.assertTrue(cache.size() <= 1500)
+        self.assertTrue(cache.load(filenames[0], self.__key(["a"])))
+        self.assertEqual(cache.load(filenames[1], self.__key(["a"])), None)
+        self.assertTrue(cache.load(filenames[2], self.__key(["a"])))
+
+    ##### Private helper functions
+
+    def __key(self, headers):
+        return (headers, ',', True, [])
+
+    def __age(self, seconds):
+        '''Make all of the cache files look older.'''
+        for name in listdir(self.__directory):
+            path = join(self.__directory, name)
+            utime(path, ns=(0, 10 ** 9 * seconds))
+
+    def __writeFile(self, filename, lines):
+        fd = open(filename, 'w')
+        fd.write('\n'.join(lines) + '\n')
+        fd.close()
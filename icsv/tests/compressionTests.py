@@ -0,0 +1,112 @@
+import bz2
+import gzip
+import lzma
+from os import unlink
+from os.path import exists, getsize
+
+from unittest import TestCase
+
+from icsv import icsv, Reader, Writer, MappedCsv
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        pass
+
+    def test_readCompressed(self):
+        content = "a,b\n0,1\n2,3\n"
+
+        for module, extension in [(gzip, ".gz"), (bz2, ".bz2"),
+                                  (lzma, ".xz")]:
+            filename = "/tmp/testCsv.csv" + extension
+            with module.open(filename, 'wt') as fd:
+                fd.write(content)
+
+            reader = Reader(filename)
+            self.assertEqual(reader.compression(), extension[1:])
+            self.assertEqual(reader.headers(), ["a", "b"])
+            self.assertEqual(list(reader.lists()), [["0", "1"], ["2", "3"]])
+
+            for workers in [1, 2]:
+                csv = icsv.fromFile(filename, workers=workers)
+                self.assertEqual(csv.numRows(), 2)
+                self.assertEqual(csv.getCell(1, "b").value(), "3")
+
+            # Compressed files cannot be memory mapped
+            self.assertRaises(Exception, MappedCsv, filename)
+            unlink(filename)
+
+    def test_detectMagic(self):
+        filename = "/tmp/testCsv.csv"
+        with gzip.open(filename, 'wt') as fd:
+            fd.write("a,b\n0,1\n")
+
+        reader = Reader(filename)
+        self.assertEqual(reader.compression(), "gz")
+        self.assertEqual(list(reader.lists()), [["0", "1"]])
+        unlink(filename)
+
+        with open(filename, 'w') as fd:
+            fd.write("a,b\n0,1\n")
+        self.assertEqual(Reader(filename).compression(), None)
+
+    def test_writeCompressed(self):
+        for extension in [".gz", ".bz2", ".xz"]:
+            filename = "/tmp/test.csv" + extension
+            self.__deleteFile(filename)
+
+            with Writer(filename, ["a", "b"], flushRows=None) as writer:
+                writer.writeRow([0, 1])
+                writer.writeRows([i, i] for i in range(1000))
+
+            csv = icsv.fromFile(filename)
+            self.assertEqual(csv.numRows(), 1001)
+            self.assertEqual(csv.getRow(0).list(), ["0", "1"])
+            self.assertEqual(csv.getRow().list(), ["999", "999"])
+            unlink(filename)
+
+        # The compression can be given explicitly
+        filename = "/tmp/test.csv"
+        with Writer(filename, ["a"], compression="bz2",
+                    compressionLevel=1) as writer:
+            writer.writeRow([0])
+        self.assertEqual(Reader(filename).compression(), "bz2")
+
+        self.assertRaises(Exception, Writer, filename, ["a"],
+                          compression="zip")
+
+    def test_flushRows(self):
+        filename = "/tmp/test.csv.gz"
+        sizes = []
+        for flushRows in ["auto", None, 1]:
+            self.__deleteFile(filename)
+            with Writer(filename, ["a", "b"], flushRows=flushRows) as writer:
+                for i in range(2000):
+                    writer.writeRow([i, "value %d" % i])
+            sizes.append(getsize(filename))
+
+        # Compressed files are not flushed after every row by default
+        self.assertEqual(sizes[0], sizes[1])
+        self.assertTrue(sizes[2] > 2 * sizes[0])
+        unlink(filename)
+
+    def test_compressionLevel(self):
+        csv = icsv(["a", "b"])
+        csv.addRows([i % 7, "value %d" % (i % 13)] for i in range(10000))
+
+        sizes = []
+        for level in [1, 9]:
+            filename = "/tmp/test.csv.gz"
+            Writer.fromCsv(filename, csv, compressionLevel=level).close()
+            sizes.append(getsize(filename))
+
+            self.assertEqual(str(icsv.fromFile(filename)), str(csv))
+
+        self.assertTrue(sizes[1] <= sizes[0])
+        unlink(filename)
+
+    ##### Private helper functions
+
+    def __deleteFile(self, filename):
+        if exists(filename):
+            unlink(filename)
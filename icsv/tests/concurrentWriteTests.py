@@ -0,0 +1,92 @@
+from os import unlink
+from os.path import exists
+from threading import Thread
+
+from unittest import TestCase
+
+from icsv import ConcurrentWriter
+
+
+class ConcurrentWriteTests(TestCase):
+    def setUp(self):
+        pass
+
+    def test_writeRow(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = ConcurrentWriter(filename, ["a", "b"])
+        self.assertEqual(writer.filename(), filename)
+        self.assertEqual(writer.headers(), ["a", "b"])
+        self.assertEqual(writer.delimiter(), ',')
+
+        writer.writeRow([0, 1])
+        writer.writeRow({"b": 3})
+        writer.flush()
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1", ",3"])
+
+        writer.writeRows([i, i + 1] for i in range(3))
+        writer.close()
+        self.assertTrue(writer.closed())
+        self.assertEqual(self.__readFile(filename),
+                         ["a,b", "0,1", ",3", "0,1", "1,2", "2,3"])
+
+        # Cannot write once closed
+        self.assertRaises(Exception, writer.writeRow, [0, 1])
+
+    def test_manyThreads(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        def produce(writer, thread):
+            for index in range(1000):
+                writer.writeRow([thread, index])
+
+        with ConcurrentWriter(filename, ["thread", "index"],
+                              maxQueueSize=16, batchSize=10) as writer:
+            threads = [Thread(target=produce, args=(writer, thread))
+                       for thread in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        content = self.__readFile(filename)
+        self.assertEqual(content[0], "thread,index")
+        self.assertEqual(len(content), 8001)
+
+        # Every row is written, and rows from each thread are in order
+        rows = [list(map(int, line.split(','))) for line in content[1:]]
+        for thread in range(8):
+            self.assertEqual([index for t, index in rows if t == thread],
+                             list(range(1000)))
+
+    def test_invalidRows(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        with ConcurrentWriter(filename, ["a", "b"]) as writer:
+            writer.writeRow([0, 1])
+            self.assertRaises(Exception, writer.writeRow, [0])
+            self.assertRaises(Exception, writer.writeRow, {"c": 0})
+
+            # Nothing is queued for invalid batches
+            self.assertRaises(Exception, writer.writeRows, [[2, 3], [0]])
+
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1"])
+
+    ##### Private helper functions
+
+    def __readFile(self, filename):
+        if not exists(filename):
+            raise Exception("File does not exist: %s" % filename)
+
+        fd = open(filename, 'r')
+        content = fd.read()
+        fd.close()
+
+        return content.strip().split('\n')
+
+    def __deleteFile(self, filename):
+        if exists(filename):
+            unlink(filename)
@@ -0,0 +1,125 @@
+from os import rename, unlink
+from os.path import exists
+
+from unittest import TestCase
+
+from icsv import icsv, TailReader
+
+
+class FollowTests(TestCase):
+    def setUp(self):
+        self.__filename = "/tmp/testFollow.csv"
+        for filename in [self.__filename, self.__filename + ".1"]:
+            if exists(filename):
+                unlink(filename)
+
+    def test_poll(self):
+        with TailReader(self.__filename) as reader:
+            # The file does not exist yet
+            self.assertEqual(reader.poll(), [])
+            self.assertEqual(reader.headers(), None)
+
+            self.__append("a,b\n0,1\n")
+            self.assertEqual(self.__lists(reader.poll()), [["0", "1"]])
+            self.assertEqual(reader.headers(), ["a", "b"])
+            self.assertEqual(reader.offset(), 8)
+            self.assertEqual(reader.poll(), [])
+
+            # Partial lines are kept until they are complete
+            self.__append("2,")
+            self.assertEqual(reader.poll(), [])
+            self.__append("3\n\n4\n5,6")
+            self.assertEqual(self.__lists(reader.poll()),
+                             [["2", "3"], ["4", ""]])
+            self.__append("\n")
+            self.assertEqual(self.__lists(reader.poll()), [["5", "6"]])
+
+    def test_readSize(self):
+        self.__append("a,b\n" + "".join("%d,%d\n" % (i, i) for i in range(10)))
+
+        with TailReader(self.__filename) as reader:
+            # Each poll only reads a few bytes of the file
+            reader.ReadSize = 8
+            self.assertEqual(self.__lists(reader.poll()), [["0", "0"]])
+            self.assertEqual(self.__lists(reader.poll()),
+                             [["1", "1"], ["2", "2"]])
+            self.assertEqual(reader.offset(), 16)
+
+            # Lines longer than the read size are still read
+            self.__append("10,%s\n" % ("x" * 20))
+
+            rows = []
+            for _ in range(10):
+                rows.extend(self.__lists(reader.poll()))
+            self.assertEqual([row[0] for row in rows],
+                             [str(i) for i in range(3, 11)])
+
+            # A rotated file is only read once the old file has been read
+            self.__append("11,11\n12,12\n")
+            rename(self.__filename, self.__filename + ".1")
+            self.__append("a,b\n13,13\n")
+
+            rows = []
+            for _ in range(5):
+                rows.extend(self.__lists(reader.poll()))
+            self.assertEqual([row[0] for row in rows], ["11", "12", "13"])
+
+    def test_truncate(self):
+        self.__append("a,b\n0,1\n2,3\n")
+
+        with icsv.followFile(self.__filename) as reader:
+            self.assertEqual(len(reader.poll()), 2)
+
+            fd = open(self.__filename, 'w')
+            fd.write("a,b\n4,5\n")
+            fd.close()
+            self.assertEqual(self.__lists(reader.poll()), [["4", "5"]])
+
+    def test_rotate(self):
+        self.__append("a,b\n0,1\n")
+
+        with TailReader(self.__filename) as reader:
+            self.assertEqual(len(reader.poll()), 1)
+
+            # The rest of the old file is read before the new file
+            self.__append("2,3\n")
+            rename(self.__filename, self.__filename + ".1")
+            self.__append("a,b\n4,5\n")
+
+            self.assertEqual(self.__lists(reader.poll()),
+                             [["2", "3"], ["4", "5"]])
+            self.__append("6,7\n")
+            self.assertEqual(self.__lists(reader.poll()), [["6", "7"]])
+
+    def test_fromEnd(self):
+        self.__append("a,b\n0,1\n2,")
+
+        reader = TailReader(self.__filename, fromStart=False)
+        self.assertEqual(reader.poll(), [])
+        self.assertEqual(reader.headers(), ["a", "b"])
+
+        self.__append("3\n")
+        self.assertEqual(self.__lists(reader.poll()), [["2", "3"]])
+        reader.close()
+
+        # Explicit headers skip the headers line
+        reader = TailReader(self.__filename, headers=["x", "y"])
+        self.assertEqual(reader.poll()[0].dict()["y"], "1")
+        reader.close()
+
+    def test_follow(self):
+        self.__append("a,b\n0,1\n2,3\n")
+
+        with TailReader(self.__filename, pollInterval=0.01) as reader:
+            rows = list(reader.follow(timeout=0.05))
+            self.assertEqual(self.__lists(rows), [["0", "1"], ["2", "3"]])
+
+    ##### Private helper functions
+
+    def __append(self, content):
+        fd = open(self.__filename, 'a')
+        fd.write(content)
+        fd.close()
+
+    def __lists(self, rows):
+        return [row.list() for row in rows]
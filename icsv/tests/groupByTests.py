@@ -0,0 +1,75 @@
+from os import unlink
+from os.path import exists
+
+from unittest import TestCase
+
+from icsv import icsv
+
+
+class GroupByTests(TestCase):
+    CsvFile = "/tmp/testGroupBy.csv"
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        if exists(self.CsvFile):
+            unlink(self.CsvFile)
+
+    def test_groupBy(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["region", "price", "name"], storage=storage,
+                       schema={"price": int})
+            csv.addRows([["b", "3", "x"], ["a", "1", "y"], ["b", "", "z"],
+                         ["b", "5", "w"], ["c", "", "v"]])
+
+            result = csv.groupBy("region").agg({
+                "price": ["count", "sum", "min", "max", "mean"],
+                "name": "max",
+                })
+            self.assertEqual(result.storage(), storage)
+            self.assertEqual(result.headers(),
+                             ["region", "count(price)", "sum(price)",
+                              "min(price)", "max(price)", "mean(price)",
+                              "max(name)"])
+            self.assertEqual(result.schema(),
+                             {"count(price)": int, "sum(price)": int,
+                              "min(price)": int, "max(price)": int,
+                              "mean(price)": float})
+
+            # Groups are in order of appearance, and missing values ignored
+            self.assertEqual([row.list() for row in result.data()],
+                             [["b", 2, 8, 3, 5, 4.0, "z"],
+                              ["a", 1, 1, 1, 1, 1.0, "y"],
+                              ["c", 0, "", "", "", "", "v"]])
+
+        # Untyped values are added together as numbers
+        result = csv.groupBy(["region", "name"]).agg({"price": "sum"})
+        self.assertEqual(result.numRows(), 5)
+        self.assertEqual(result.getRow(0).list(), ["b", "x", 3])
+
+        self.assertRaises(Exception, csv.groupBy, "unknown")
+        self.assertRaises(Exception, csv.groupBy("region").agg,
+                          {"price": "median"})
+        self.assertRaises(Exception, csv.groupBy("region").agg,
+                          {"name": "sum"})
+
+    def test_groupByReader(self):
+        fd = open(self.CsvFile, 'w')
+        fd.write("region,price\nb,1.5\na,2\nb,3\n\nb,\n")
+        fd.close()
+
+        reader = icsv.iterFile(self.CsvFile)
+        groups = reader.groupBy("region")
+        self.assertEqual(groups.keys(), ["region"])
+
+        result = groups.agg({"price": ["sum", "mean", "max"]})
+        self.assertEqual(result.schema(),
+                         {"sum(price)": float, "mean(price)": float})
+        self.assertEqual([row.list() for row in result.data()],
+                         [["b", 4.5, 2.25, "3"], ["a", 2.0, 2.0, "2"]])
+
+        # Values are compared as their type
+        result = reader.groupBy("region", schema={"price": float}).agg(
+            {"price": "max"})
+        self.assertEqual(result.getCol("max(price)").data()[0], 3.0)
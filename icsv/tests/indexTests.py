@@ -0,0 +1,140 @@
+from unittest import TestCase
+
+from icsv import icsv, HashIndex, SortedIndex
+
+
+class IndexTests(TestCase):
+    def setUp(self):
+        pass
+
+    def __createCsv(self, storage="row", schema=None):
+        csv = icsv(["id", "name"], storage=storage, schema=schema)
+        csv.addRow([1, "one"])
+        csv.addRow([2, "two"])
+        csv.addRow([3, "one"])
+        csv.addRow([4, "three"])
+        return csv
+
+    def test_find(self):
+        for storage in ["row", "column"]:
+            csv = self.__createCsv(storage)
+
+            # Without an index the column is scanned
+            self.assertEqual(csv.find("name", "one"), [0, 2])
+
+            index = csv.createIndex("name")
+            self.assertTrue(isinstance(index, HashIndex))
+            self.assertTrue(csv.createIndex("name") is index)
+
+            self.assertEqual(csv.find("name", "one"), [0, 2])
+            self.assertEqual(csv.find("name", "two"), [1])
+            self.assertEqual(csv.find("name", "four"), [])
+            self.assertEqual(sorted(index.values()), ["one", "three", "two"])
+
+            self.assertRaises(Exception, csv.find, "unknown", "one")
+            self.assertRaises(Exception, csv.createIndex, "unknown")
+
+    def test_maintained(self):
+        for storage in ["row", "column"]:
+            csv = self.__createCsv(storage)
+            csv.createIndex("name")
+            csv.createIndex("id")
+
+            csv.addRow({"id": 5, "name": "two"})
+            self.assertEqual(csv.find("name", "two"), [1, 4])
+
+            csv.setCell("name", "two", 0)
+            csv.setCell("name", "four")
+            self.assertEqual(csv.find("name", "two"), [0, 1])
+            self.assertEqual(csv.find("name", "one"), [2])
+            self.assertEqual(csv.find("name", "four"), [4])
+
+            csv.removeRow(1)
+            self.assertEqual(csv.find("name", "two"), [0])
+            self.assertEqual(csv.find("name", "one"), [1])
+            self.assertEqual(csv.find("id", 4), [2])
+            self.assertEqual(csv.find("id", 2), [])
+
+            csv.removeRow()
+            self.assertEqual(csv.find("name", "four"), [])
+
+            csv.map(lambda r, h, v: v * 10, overwrite=True, headers=["id"])
+            self.assertEqual(csv.find("id", 30), [1])
+
+            # Indexes do not change the results
+            for name in ["one", "two", "three", "four"]:
+                indexed = csv.find("name", name)
+                csv.dropIndex("name")
+                self.assertEqual(csv.find("name", name), indexed)
+                csv.createIndex("name")
+
+    def test_typedFind(self):
+        csv = self.__createCsv("column", {"id": int})
+        csv.createIndex("id")
+        self.assertEqual(csv.find("id", 3), [2])
+        self.assertEqual(csv.find("id", "3"), [2])
+
+    def test_sortedIndex(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["id", "name"], storage=storage, schema={"id": int})
+            for id, name in [(5, "bob"), (1, "alice"), (3, "albert"),
+                             (4, "carol"), (2, "bobby")]:
+                csv.addRow([id, name])
+
+            ids = csv.createSortedIndex("id")
+            names = csv.createSortedIndex("name")
+            self.assertTrue(isinstance(ids, SortedIndex))
+            self.assertTrue(csv.createSortedIndex("id") is ids)
+
+            # Results are in order of value
+            self.assertEqual(ids.between(2, 4), [4, 2, 3])
+            self.assertEqual(ids.between("2", "4"), [4, 2, 3])
+            self.assertEqual(ids.lessThan(3), [1, 4])
+            self.assertEqual(ids.lessThan(3, inclusive=True), [1, 4, 2])
+            self.assertEqual(ids.greaterThan(4), [0])
+            self.assertEqual(ids.greaterThan(4, inclusive=True), [3, 0])
+            self.assertEqual(names.prefix("al"), [2, 1])
+            self.assertEqual(names.prefix("bob"), [0, 4])
+            self.assertEqual(names.prefix("z"), [])
+
+            # Hash and sorted indexes can exist on the same column
+            csv.createIndex("id")
+            self.assertEqual(csv.find("id", 3), [2])
+
+            csv.addRow([6, "albus"])
+            csv.setCell("id", 0, 0)
+            self.assertEqual(ids.lessThan(2), [0, 1])
+            self.assertEqual(names.prefix("al"), [2, 5, 1])
+
+            csv.removeRow(1)
+            self.assertEqual(ids.lessThan(3), [0, 3])
+            self.assertEqual(ids.greaterThan(3), [2, 4])
+            self.assertEqual(names.prefix("al"), [1, 4])
+
+            # Missing values are not indexed
+            csv.addRow({"name": "dave"})
+            self.assertEqual(ids.greaterThan(5), [4])
+            self.assertEqual(csv.find("id", 3), [1])
+
+            csv.dropIndex("id")
+            self.assertEqual(csv.find("id", 3), [1])
+
+    def test_sortedIndexErrors(self):
+        csv = icsv(["id", "name"], schema={"id": int})
+        csv.addRows([[5, "bob"], [1, "alice"]])
+
+        ids = csv.createSortedIndex("id")
+        self.assertRaises(Exception, ids.prefix, "5")
+        self.assertRaises(Exception, ids.lessThan, None)
+        self.assertRaises(Exception, csv.createSortedIndex("name").prefix, 1)
+
+        # Untyped values which cannot be compared are not indexed
+        csv = icsv(["id"])
+        csv.addRow([1])
+        csv.addRow(["2"])
+        self.assertRaises(Exception, csv.createSortedIndex, "id")
+
+        csv.removeRow(1)
+        self.assertRaises(Exception, csv.createSortedIndex("id").prefix, "1")
+        self.assertRaises(Exception, csv.createSortedIndex("id").lessThan,
+                          "1")
@@ -0,0 +1,147 @@
+from os import unlink
+from os.path import exists
+
+from unittest import TestCase
+
+from icsv import icsv, joinFiles
+
+
+class JoinTests(TestCase):
+    LeftFile = "/tmp/testJoinLeft.csv"
+    RightFile = "/tmp/testJoinRight.csv"
+    OutputFile = "/tmp/testJoinOutput.csv"
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        for filename in [self.LeftFile, self.RightFile, self.OutputFile]:
+            if exists(filename):
+                unlink(filename)
+
+    def test_join(self):
+        for storage in ["row", "column"]:
+            left = icsv(["id", "name"], storage=storage, schema={"id": int})
+            left.addRows([[1, "a"], [2, "b"], [3, "c"], [2, "d"]])
+
+            right = icsv(["id", "name", "size"])
+            right.addRows([["2", "x", "10"], ["4", "y", "20"],
+                           ["2", "z", "30"]])
+
+            joined = left.join(right, "id")
+            self.assertEqual(joined.headers(),
+                             ["id", "name", "name_right", "size"])
+            self.assertEqual(joined.storage(), storage)
+            self.assertEqual(self.__rows(joined),
+                             [[2, "b", "x", "10"], [2, "b", "z", "30"],
+                              [2, "d", "x", "10"], [2, "d", "z", "30"]])
+
+            joined = left.join(right, ["id"], how="left")
+            self.assertEqual(self.__rows(joined)[0], [1, "a", "", ""])
+            self.assertEqual(joined.numRows(), 6)
+
+            # Unmatched right rows follow, with the key filled in
+            joined = left.join(right, "id", how="outer", suffix="2")
+            self.assertEqual(joined.getHeader(2), "name2")
+            self.assertEqual(joined.numRows(), 7)
+            self.assertEqual(self.__rows(joined)[-1], [4, "", "y", "20"])
+            self.assertEqual(joined.find("id", "4"), [6])
+
+        self.assertRaises(Exception, left.join, right, "id", how="cross")
+        self.assertRaises(Exception, left.join, right, "size")
+
+    def test_joinKeyTypes(self):
+        typed = icsv(["k", "x"], schema={"k": int})
+        typed.addRows([["1", "a"], ["2", "b"]])
+
+        untyped = icsv(["k", "y"])
+        untyped.addRows([["2", "p"], ["3", "q"]])
+
+        # Either side may be typed, the keys are compared as ints
+        joined = untyped.join(typed, "k", how="outer")
+        self.assertEqual(self.__rows(joined),
+                         [[2, "p", "b"], [3, "q", ""], [1, "", "a"]])
+        self.assertEqual(joined.find("k", "3"), [1])
+
+        joined = typed.join(untyped, "k")
+        self.assertEqual(self.__rows(joined), [[2, "b", "p"]])
+
+        floats = icsv(["k"], schema={"k": float})
+        self.assertRaises(Exception, typed.join, floats, "k")
+
+    def test_joinMultipleKeys(self):
+        left = icsv(["a", "b", "x"])
+        left.addRows([["1", "1", "p"], ["1", "2", "q"]])
+
+        right = icsv(["b", "a", "y"])
+        right.addRows([["2", "1", "r"], ["1", "2", "s"]])
+
+        joined = left.join(right, ["a", "b"], how="outer")
+        self.assertEqual(self.__rows(joined),
+                         [["1", "1", "p", ""], ["1", "2", "q", "r"],
+                          ["2", "1", "", "s"]])
+
+    def test_joinMissingKeys(self):
+        left = icsv(["id", "x"], schema={"id": int})
+        left.addRows([["", "a"], ["1", "b"], ["", "c"]])
+
+        right = icsv(["id", "y"])
+        right.addRows([["", "p"], ["1", "q"], ["", "r"]])
+
+        # Missing keys never match each other
+        joined = left.join(right, "id")
+        self.assertEqual(self.__rows(joined), [[1, "b", "q"]])
+
+        joined = left.join(right, "id", how="outer")
+        self.assertEqual(self.__rows(joined),
+                         [["", "a", ""], [1, "b", "q"], ["", "c", ""],
+                          ["", "", "p"], ["", "", "r"]])
+
+        for schema in [{"id": int}, None]:
+            self.__writeFile(self.LeftFile, ["id,x", "1,b", ",a", ",c"]
+                             if schema else ["id,x", ",a", ",c", "1,b"])
+            self.__writeFile(self.RightFile, ["id,y", "1,q", ",p"]
+                             if schema else ["id,y", ",p", "1,q"])
+
+            joinFiles(self.LeftFile, self.RightFile, self.OutputFile, "id",
+                      schema=schema)
+            self.assertEqual(self.__rows(icsv.fromFile(self.OutputFile)),
+                             [["1", "b", "q"]])
+
+            joinFiles(self.LeftFile, self.RightFile, self.OutputFile, "id",
+                      how="outer", schema=schema)
+            self.assertEqual(icsv.fromFile(self.OutputFile).numRows(), 4)
+
+    def test_joinFiles(self):
+        # Both files are sorted with the same schema, with missing values last
+        self.__writeFile(self.LeftFile, ["id,name", "1,a", "1,b", "3,c",
+                                         "10,d", ",e"])
+        self.__writeFile(self.RightFile, ["id,size", "1,z", "2,y", "10,x"])
+        schema = {"id": int}
+
+        joinFiles(self.LeftFile, self.RightFile, self.OutputFile, "id",
+                  how="outer", schema=schema)
+        csv = icsv.fromFile(self.OutputFile)
+        self.assertEqual(csv.headers(), ["id", "name", "size"])
+        self.assertEqual(self.__rows(csv),
+                         [["1", "a", "z"], ["1", "b", "z"], ["2", "", "y"],
+                          ["3", "c", ""], ["10", "d", "x"], ["", "e", ""]])
+
+        joinFiles(self.LeftFile, self.RightFile, self.OutputFile, "id",
+                  schema=schema)
+        csv = icsv.fromFile(self.OutputFile)
+        self.assertEqual(csv.getCol("name").data(), ["a", "b", "d"])
+
+        # Compared as strings, the files are not sorted
+        self.assertRaises(Exception, joinFiles, self.LeftFile,
+                          self.RightFile, self.OutputFile, "id")
+
+    ##### Private helper functions
+
+    def __rows(self, csv):
+        return [row.list() for row in csv.data()]
+
+    def __writeFile(self, filename, lines):
+        fd = open(filename, 'w')
+        fd.write('\n'.join(lines) + '\n')
+        fd.close()
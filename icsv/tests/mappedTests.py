@@ -0,0 +1,93 @@
+from locale import getpreferredencoding
+from os import unlink
+from os.path import exists
+
+from unittest import TestCase
+
+from icsv import icsv, MappedCsv, Row
+
+
+class MappedTests(TestCase):
+    CsvFile = "/tmp/testCsv.csv"
+    IndexFile = "/tmp/testCsv.csv.idx"
+
+    def setUp(self):
+        self.csv = icsv(["a", "b", "c"])
+        for index in range(50):
+            self.csv.addRow([index, index * 2, "row %s" % index])
+        self.csv.write(self.CsvFile).close()
+
+        if exists(self.IndexFile):
+            unlink(self.IndexFile)
+
+    def test_mapFile(self):
+        with icsv.mapFile(self.CsvFile) as mapped:
+            self.assertTrue(isinstance(mapped, MappedCsv))
+            self.assertEqual(mapped.headers(), ["a", "b", "c"])
+            self.assertEqual(mapped.numRows(), 50)
+            self.assertEqual(mapped.numCols(), 3)
+
+            row = mapped.getRow(10)
+            self.assertTrue(isinstance(row, Row))
+            self.assertEqual(row.list(), ["10", "20", "row 10"])
+            self.assertEqual(mapped.getRow().list(), ["49", "98", "row 49"])
+            self.assertEqual(mapped.getCell(3, "c").value(), "row 3")
+
+            self.assertRaises(Exception, mapped.getRow, 50)
+            self.assertRaises(Exception, mapped.getCell, 0, "unknown")
+
+    def test_getRows(self):
+        with icsv.mapFile(self.CsvFile) as mapped:
+            rows = mapped.getRows(5, 8)
+            self.assertEqual([r["a"] for r in rows], ["5", "6", "7"])
+            self.assertEqual(len(mapped.getRows(45)), 5)
+
+            # Matches the fully parsed file
+            csv = icsv.fromFile(self.CsvFile)
+            self.assertEqual(str(mapped), str(csv))
+            self.assertEqual(mapped.getCol("b").data(),
+                             csv.getCol("b").data())
+            self.assertEqual([r.list() for r in csv.getRows(5, 8)],
+                             [r.list() for r in rows])
+
+    def test_indexFile(self):
+        with icsv.mapFile(self.CsvFile,
+                          indexFilename=self.IndexFile) as mapped:
+            self.assertEqual(mapped.numRows(), 50)
+        self.assertTrue(exists(self.IndexFile))
+
+        # Loaded from the index
+        with icsv.mapFile(self.CsvFile,
+                          indexFilename=self.IndexFile) as mapped:
+            self.assertEqual(mapped.numRows(), 50)
+            self.assertEqual(mapped.getRow(20)["b"], "40")
+
+        # The index is rebuilt when the file changes
+        self.csv.addRow([50, 100, "row 50"])
+        self.csv.write(self.CsvFile).close()
+
+        with icsv.mapFile(self.CsvFile,
+                          indexFilename=self.IndexFile) as mapped:
+            self.assertEqual(mapped.numRows(), 51)
+            self.assertEqual(mapped.getRow()["c"], "row 50")
+
+    def test_emptyFile(self):
+        fd = open(self.CsvFile, 'w')
+        fd.close()
+
+        with icsv.mapFile(self.CsvFile, ["a"]) as mapped:
+            self.assertEqual(mapped.numRows(), 0)
+            self.assertRaises(Exception, mapped.getRow)
+
+    def test_encoding(self):
+        fd = open(self.CsvFile, 'wb')
+        fd.write("a,b\ndéjà,1\n".encode('latin-1'))
+        fd.close()
+
+        with icsv.mapFile(self.CsvFile, encoding='latin-1') as mapped:
+            self.assertEqual(mapped.encoding(), 'latin-1')
+            self.assertEqual(mapped.getRow(0).list(), ["déjà", "1"])
+
+        # The locale's encoding is used by default, as it is when parsing
+        with icsv.mapFile(self.CsvFile, ["a", "b"]) as mapped:
+            self.assertEqual(mapped.encoding(), getpreferredencoding(False))
@@ -49,6 +49,260 @@ class ReadTests(TestCase):
         self.assertEqual(data0["Header 2"], "1")
         self.assertEqual(data0["Header 3"], "2")
 
+    def test_readHeaders(self):
+        lines = [
+            "0,1,2",
+            "3,4,5",
+            ]
+        self.__writeFile(lines)
+
+        csv = icsv.fromFile(self.CsvFile)
+        self.assertEqual(csv.headers(), self.Headers)
+        self.assertEqual(csv.numRows(), 2)
+        self.assertEqual(csv.getRow().list(), ["3", "4", "5"])
+
+    def test_iterFile(self):
+        lines = [
+            "0,1,2",
+            "3,4,5",
+            "6,7,8",
+            ]
+        self.__writeFile(lines)
+
+        reader = icsv.iterFile(self.CsvFile)
+        self.assertEqual(reader.headers(), self.Headers)
+        self.assertEqual(reader.delimiter(), ",")
+
+        rows = list(reader)
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(isinstance(rows[0], Row))
+        self.assertEqual(str(rows[0]), lines[0])
+        self.assertEqual(rows[2]["Header 3"], "8")
+
+        # Rows match those read into memory
+        csv = icsv.fromFile(self.CsvFile)
+        self.assertEqual([r.list() for r in reader],
+                         [r.list() for r in csv.data()])
+
+    def test_iterFileWithoutHeaders(self):
+        lines = [
+            "0/1/2",
+            "3/4/5",
+            ]
+        self.__writeFile(lines, includeHeaders=False, delimiter='/')
+
+        self.assertRaises(Exception, icsv.iterFile, self.CsvFile, None, '/',
+                          False)
+
+        reader = icsv.iterFile(self.CsvFile, self.Headers, '/', False)
+        rows = [row.list() for row in reader]
+        self.assertEqual(rows, [["0", "1", "2"], ["3", "4", "5"]])
+
+    def test_parallelRead(self):
+        lines = ["%s,%s,row %s" % (i, i * 2, i) for i in range(1000)]
+        lines.insert(500, "")
+        self.__writeFile(lines)
+
+        serial = icsv.fromFile(self.CsvFile)
+        self.assertEqual(serial.numRows(), 1000)
+
+        for workers in [2, 3, 8]:
+            csv = icsv.fromFile(self.CsvFile, workers=workers)
+            self.assertEqual(csv.headers(), serial.headers())
+            self.assertEqual(csv.numRows(), serial.numRows())
+            self.assertEqual(str(csv), str(serial))
+
+        # Without headers in the file
+        self.__writeFile(lines, includeHeaders=False)
+        csv = icsv.fromFile(self.CsvFile, self.Headers, containsHeaders=False,
+                            workers=2)
+        self.assertEqual(str(csv), str(serial))
+
+    def test_parallelLineEndings(self):
+        rows = [[str(i), str(i * 2), "row %d" % i] for i in range(100)]
+        for newline in ["\r", "\r\n", None]:
+            endings = [newline or ["\n", "\r", "\r\n"][i % 3]
+                       for i in range(101)]
+            lines = [",".join(self.Headers)] + [",".join(row) for row in rows]
+
+            fd = open(self.CsvFile, 'w', newline='')
+            fd.write("".join(map("".join, zip(lines, endings))))
+            fd.close()
+
+            # Every line ending of the serial reader is also used in parallel
+            for workers in [1, 2, 3]:
+                csv = icsv.fromFile(self.CsvFile, workers=workers)
+                self.assertEqual([row.list() for row in csv.data()], rows)
+
+            csv = icsv.fromFile(self.CsvFile, start=10, end=30)
+            self.assertEqual(csv.getRow(0).list(), ["0", "0", "row 0"])
+
+    def test_columns(self):
+        self.__writeFile(["0,1,2", "3,4", "5,6,7,8"])
+
+        reader = icsv.iterFile(self.CsvFile, columns=["Header 3", 0])
+        self.assertEqual(reader.headers(), ["Header 3", "Header 1"])
+        self.assertEqual(list(reader.lists()),
+                         [["2", "0"], ["", "3"], ["7", "5"]])
+        self.assertEqual(list(reader.dicts())[0],
+                         {"Header 3": "2", "Header 1": "0"})
+
+        for workers in [1, 2]:
+            csv = icsv.fromFile(self.CsvFile, columns=["Header 2"],
+                                workers=workers, schema={"Header 2": int})
+            self.assertEqual(csv.headers(), ["Header 2"])
+            self.assertEqual(list(csv.getCol("Header 2").data()), [1, 4, 6])
+
+        # Appended rows are projected in the same way
+        csv = icsv.fromFile(self.CsvFile, columns=[2, 1])
+        self.__appendFile("9,10,11\n")
+        self.assertEqual(csv.refresh(), 1)
+        self.assertEqual(csv.getRow().list(), ["11", "10"])
+
+        self.assertRaises(Exception, icsv.fromFile, self.CsvFile,
+                          columns=["unknown"])
+        self.assertRaises(Exception, icsv.fromFile, self.CsvFile,
+                          columns=[3])
+
+    def test_rowRange(self):
+        lines = ["%d,%d,%d" % (i, i, i) for i in range(10)]
+        self.__writeFile(lines)
+
+        csv = icsv.fromFile(self.CsvFile, skipRows=2, maxRows=3)
+        self.assertEqual(list(csv.getCol("Header 1").data()),
+                         ["2", "3", "4"])
+
+        reader = icsv.iterFile(self.CsvFile, skipRows=8)
+        self.assertEqual([values[0] for values in reader.lists()],
+                         ["8", "9"])
+
+        # Adjacent byte ranges read every row exactly once
+        size = len(",".join(self.Headers)) + 1 + \
+            sum(len(line) + 1 for line in lines)
+        for workers in [1, 2]:
+            values = []
+            for start in range(0, size, 7):
+                csv = icsv.fromFile(self.CsvFile, start=start, end=start + 7,
+                                    workers=workers)
+                values.extend(csv.getCol("Header 1").data())
+            self.assertEqual(values, [str(i) for i in range(10)])
+
+        # A range starting within the headers line excludes it
+        csv = icsv.fromFile(self.CsvFile, start=1, end=size, maxRows=1)
+        self.assertEqual(csv.getRow(0).list(), ["0", "0", "0"])
+
+        # Rows are skipped within the byte range
+        csv = icsv.fromFile(self.CsvFile, ["a", "b", "c"],
+                            containsHeaders=False, start=1, skipRows=1)
+        self.assertEqual(csv.numRows(), 9)
+        self.assertEqual(csv.getRow(0).list(), ["1", "1", "1"])
+
+        # Slices cannot be refreshed
+        self.assertRaises(Exception, csv.refresh)
+
+        self.assertRaises(Exception, icsv.fromFile, self.CsvFile,
+                          skipRows=-1)
+        self.assertRaises(Exception, icsv.fromFile, self.CsvFile,
+                          maxRows=-1)
+
+    def test_refresh(self):
+        for storage in ["row", "column"]:
+            self.__writeFile(["0,1,2"])
+            csv = icsv.fromFile(self.CsvFile, storage=storage,
+                                schema={"Header 1": int})
+            index = csv.createIndex("Header 1")
+            self.assertEqual(csv.refresh(), 0)
+
+            # Only appended rows are added
+            self.__appendFile("3,4,5\n\n6,7")
+            self.assertEqual(csv.refresh(), 1)
+            self.assertEqual(csv.getRow().list(), [3, "4", "5"])
+
+            # The incomplete line is replaced once it is complete
+            self.__appendFile(",8\n9,10,11\n")
+            self.assertEqual(csv.refresh(), 2)
+            self.assertEqual(csv.numRows(), 4)
+            self.assertEqual(csv.getRow(2).list(), [6, "7", "8"])
+            self.assertEqual(index.find(6), [2])
+
+            # Rewritten files are loaded again
+            self.__writeFile(["1,1,1", "2,2,2"])
+            self.assertEqual(csv.refresh(), 2)
+            self.assertEqual(csv.getCol("Header 1").data()[1], 2)
+            self.assertEqual(index.find(2), [1])
+
+            self.__writeFile(["5,5,5"])
+            self.assertEqual(csv.refresh(), 1)
+            self.assertEqual(csv.getRow(0).list(), [5, "5", "5"])
+
+        self.assertRaises(Exception, icsv(self.Headers).refresh)
+
+    def test_refreshChanged(self):
+        # Rows added after loading are kept
+        fd = open(self.CsvFile, 'w')
+        fd.write("a,b\n1,2\n3,")
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile)
+        csv.addRow(["u", "u"])
+        self.__appendFile("4\n5,6\n")
+        self.assertEqual(csv.refresh(), 1)
+        self.assertEqual([row.list() for row in csv.data()],
+                         [["1", "2"], ["3", "4"], ["u", "u"], ["5", "6"]])
+
+        # The incomplete row is replaced wherever it was sorted to
+        fd = open(self.CsvFile, 'w')
+        fd.write("a,b\n9,1\n1,")
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile)
+        csv.sort("a")
+        self.__appendFile("2\n")
+        self.assertEqual(csv.refresh(), 0)
+        self.assertEqual([row.list() for row in csv.data()],
+                         [["1", "2"], ["9", "1"]])
+
+        # The file is loaded again once the incomplete row is removed
+        fd = open(self.CsvFile, 'w')
+        fd.write("a,b\n9,1\n1,")
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile)
+        csv.removeRow()
+        self.__appendFile("2\n")
+        self.assertEqual(csv.refresh(), 2)
+        self.assertEqual(csv.getRow().list(), ["1", "2"])
+
+    def test_refreshIncomplete(self):
+        # The file has not been written yet
+        fd = open(self.CsvFile, 'w')
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile)
+        self.assertEqual(csv.headers(), [])
+
+        self.__appendFile("a,")
+        self.assertEqual(csv.refresh(), 0)
+        self.__appendFile("b\n0,1\n")
+        self.assertEqual(csv.refresh(), 1)
+        self.assertEqual(csv.headers(), ["a", "b"])
+
+        # An incomplete headers line is loaded again
+        fd = open(self.CsvFile, 'w')
+        fd.write("x,")
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile)
+        self.assertEqual(csv.headers(), ["x", ""])
+
+        self.__appendFile("y\n0,1\n")
+        self.assertEqual(csv.refresh(), 1)
+        self.assertEqual(csv.headers(), ["x", "y"])
+        self.assertEqual(csv.getRow().list(), ["0", "1"])
+
+        # Explicit headers skip the headers line once it is written
+        fd = open(self.CsvFile, 'w')
+        fd.close()
+        csv = icsv.fromFile(self.CsvFile, headers=["x", "y"])
+        self.__appendFile("x,y\n0,1\n")
+        self.assertEqual(csv.refresh(), 1)
+        self.assertEqual(csv.getRow().list(), ["0", "1"])
+
     def __writeFile(self, lines, includeHeaders=True, delimiter=','):
         fd = open(self.CsvFile, 'w')
 
@@ -58,3 +312,8 @@ class ReadTests(TestCase):
         for line in lines:
             fd.write("%s\n" % line)
         fd.close()
+
+    def __appendFile(self, content):
+        fd = open(self.CsvFile, 'a')
+        fd.write(content)
+        fd.close()
@@ -0,0 +1,149 @@
+from glob import glob
+from gzip import open as gzipOpen
+from os import unlink
+from os.path import exists
+from time import sleep
+
+from unittest import TestCase
+
+from icsv import RotatingWriter
+
+
+class RotatingWriteTests(TestCase):
+    def setUp(self):
+        self.__deleteSegments()
+
+    def tearDown(self):
+        self.__deleteSegments()
+
+    def test_maxRows(self):
+        segments = []
+        with RotatingWriter("/tmp/rotating.csv", ["a", "b"], maxRows=2,
+                            onSegment=segments.append) as writer:
+            self.assertEqual(writer.headers(), ["a", "b"])
+            self.assertEqual(writer.delimiter(), ',')
+            self.assertEqual(writer.segmentFilename(3),
+                             "/tmp/rotating-00003.csv")
+
+            writer.writeRow([0, 1])
+            writer.writeRows([[i, i + 1] for i in range(1, 5)])
+
+        self.assertTrue(writer.closed())
+        self.assertRaises(Exception, writer.writeRow, [0, 1])
+
+        self.assertEqual(segments, ["/tmp/rotating-00000.csv",
+                                    "/tmp/rotating-00001.csv",
+                                    "/tmp/rotating-00002.csv"])
+        self.assertEqual(self.__readFile(segments[0]), ["a,b", "0,1", "1,2"])
+        self.assertEqual(self.__readFile(segments[1]), ["a,b", "2,3", "3,4"])
+        self.assertEqual(self.__readFile(segments[2]), ["a,b", "4,5"])
+
+    def test_maxBytes(self):
+        segments = []
+        with RotatingWriter("/tmp/rotating.csv", ["a", "b"], maxBytes=10,
+                            useHeaders=False,
+                            onSegment=segments.append) as writer:
+            writer.writeRows([[i, i] for i in range(100, 110)])
+
+        # Each row is 8 characters, so two rows fill a segment
+        self.assertEqual(len(segments), 5)
+        self.assertEqual(self.__readFile(segments[0]), ["100,100", "101,101"])
+
+    def test_maxInterval(self):
+        segments = []
+        with RotatingWriter("/tmp/rotating.csv", ["a"], maxInterval=0.05,
+                            onSegment=segments.append) as writer:
+            writer.writeRow([0])
+            writer.writeRow([1])
+            sleep(0.1)
+            writer.writeRow([2])
+
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(self.__readFile(segments[1]), ["a", "2"])
+
+    def test_compression(self):
+        segments = []
+        with RotatingWriter("/tmp/rotating.csv", ["a", "b"], maxRows=2,
+                            compression="gz",
+                            onSegment=segments.append) as writer:
+            writer.writeRows([[i, i + 1] for i in range(3)])
+
+        self.assertEqual(segments, ["/tmp/rotating-00000.csv.gz",
+                                    "/tmp/rotating-00001.csv.gz"])
+        self.assertFalse(exists("/tmp/rotating-00000.csv"))
+
+        with gzipOpen(segments[1], 'rt') as fd:
+            self.assertEqual(fd.read(), "a,b\n2,3\n")
+
+        self.assertRaises(Exception, RotatingWriter, "/tmp/rotating.csv",
+                          ["a"], compression="zip")
+
+    def test_restart(self):
+        for compression in [None, "gz"]:
+            self.__deleteSegments()
+
+            for run in range(2):
+                with RotatingWriter("/tmp/rotating.csv", ["a"], maxRows=2,
+                                    compression=compression,
+                                    overwrite=False) as writer:
+                    writer.writeRows([[run], [run], [run]])
+
+            # The second run continues after the segments of the first
+            extension = ".gz" if compression else ""
+            segments = sorted(glob("/tmp/rotating-*"))
+            self.assertEqual(segments, ["/tmp/rotating-%05d.csv%s" %
+                                        (i, extension) for i in range(4)])
+
+        self.__deleteSegments()
+        self.__writeFile("/tmp/rotating-00007.csv.gz", "")
+        with RotatingWriter("/tmp/rotating.csv", ["a"]) as writer:
+            self.assertEqual(writer.segmentFilename(0),
+                             "/tmp/rotating-00000.csv")
+            writer.writeRow([0])
+        self.assertTrue(exists("/tmp/rotating-00008.csv"))
+
+    def test_compressionOverwrite(self):
+        writer = RotatingWriter("/tmp/rotating.csv", ["a"], maxRows=1,
+                                compression="gz", overwrite=False)
+        writer.writeRow([0])
+
+        # Created after the writer looked for existing segments
+        self.__writeFile("/tmp/rotating-00000.csv.gz", "old")
+        writer.writeRow([1])
+
+        # The error is raised by the next write, once compression has failed
+        raised = False
+        for _ in range(100):
+            try:
+                writer.writeRow([2])
+            except Exception:
+                raised = True
+                break
+            sleep(0.01)
+
+        self.assertTrue(raised)
+        writer.close()
+
+        # Neither the existing file nor the uncompressed rows are lost
+        self.assertEqual(self.__readFile("/tmp/rotating-00000.csv.gz"),
+                         ["old"])
+        self.assertEqual(self.__readFile("/tmp/rotating-00000.csv"),
+                         ["a", "0"])
+
+    ##### Private helper functions
+
+    def __writeFile(self, filename, content):
+        fd = open(filename, 'w')
+        fd.write(content)
+        fd.close()
+
+    def __readFile(self, filename):
+        fd = open(filename, 'r')
+        content = fd.read()
+        fd.close()
+
+        return content.strip().split('\n')
+
+    def __deleteSegments(self):
+        for filename in glob("/tmp/rotating-*"):
+            unlink(filename)
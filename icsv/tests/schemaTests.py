@@ -0,0 +1,92 @@
+from array import array
+from datetime import date
+
+from unittest import TestCase
+
+from icsv import icsv
+
+
+class SchemaTests(TestCase):
+    CsvFile = "/tmp/testCsv.csv"
+    Schema = {
+        "id": int,
+        "price": float,
+        "active": bool,
+        "day": date,
+        }
+
+    def setUp(self):
+        fd = open(self.CsvFile, 'w')
+        fd.write("id,name,price,active,day\n")
+        fd.write("1,one,1.5,true,2013-09-12\n")
+        fd.write("2,two,2.25,false,2013-09-13\n")
+        fd.write("3,three,3,yes,2013-09-14\n")
+        fd.close()
+
+    def test_invalidSchema(self):
+        self.assertRaises(Exception, icsv, ["a"], ',', "row", {"b": int})
+        self.assertRaises(Exception, icsv, ["a"], ',', "row", {"a": list})
+
+    def test_fromFile(self):
+        for storage in ["row", "column"]:
+            csv = icsv.fromFile(self.CsvFile, storage=storage,
+                                schema=self.Schema)
+            self.assertEqual(csv.schema(), self.Schema)
+
+            self.assertEqual(list(csv.getCol("id").data()), [1, 2, 3])
+            self.assertEqual(list(csv.getCol("price").data()),
+                             [1.5, 2.25, 3.0])
+            self.assertEqual(csv.getCol("active").data(),
+                             [True, False, True])
+            self.assertEqual(csv.getCol("name").data(),
+                             ["one", "two", "three"])
+            self.assertEqual(csv.getCell(1, "day").value(),
+                             date(2013, 9, 13))
+
+            # Typed values can be filtered without parsing
+            cells = csv.filter(lambda r, h, v: h == "price" and v > 2)
+            self.assertEqual([c.row() for c in cells], [1, 2])
+
+        # Numeric columns are stored in arrays
+        csv = icsv.fromFile(self.CsvFile, storage="column",
+                            schema=self.Schema)
+        self.assertTrue(isinstance(csv.getCol("id").data()[:], array))
+        self.assertTrue(isinstance(csv.getCol("price").data()[:], array))
+
+    def test_invalidValue(self):
+        self.assertRaises(Exception, icsv.fromFile, self.CsvFile,
+                          schema={"name": int})
+
+    def test_map(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["id", "name"], storage=storage, schema={"id": int})
+            csv.addRows([["3", "a"], ["1", "b"]])
+
+            # Mapped values are converted to the column type
+            mapped = csv.map(lambda r, h, v: str(v * 10), headers=["id"])
+            self.assertEqual(list(mapped.getCol("id").data()), [30, 10])
+            mapped.createSortedIndex("id")
+
+            mapped = csv.mapCol("id", lambda values: [str(v) for v in values])
+            mapped.sort("id")
+            self.assertEqual(list(mapped.getCol("id").data()), [1, 3])
+
+            self.assertRaises(Exception, csv.mapCol, "id",
+                              lambda values: ["x", "y"])
+
+    def test_addRow(self):
+        for storage in ["row", "column"]:
+            csv = icsv(["id", "price"], storage=storage,
+                       schema={"id": int, "price": float})
+            csv.addRow(["1", "2.5"])
+            csv.addRow([2, 3.5])
+            csv.addRow({"id": "3"})
+            self.assertEqual(list(csv.getCol("id").data()), [1, 2, 3])
+            self.assertEqual(list(csv.getCol("price").data()),
+                             [2.5, 3.5, ''])
+
+            csv.setCell("price", "4.5")
+            self.assertEqual(csv.getCell(2, "price").value(), 4.5)
+            self.assertEqual(str(csv.getRow()), "3,4.5")
+
+            self.assertRaises(Exception, csv.setCell, "id", "abc")
@@ -0,0 +1,85 @@
+from os import unlink
+from os.path import exists
+from random import Random
+from tracemalloc import get_traced_memory, start, stop
+
+from unittest import TestCase
+
+from icsv import icsv, sortFile
+
+
+class SortTests(TestCase):
+    InputFile = "/tmp/testSortInput.csv"
+    OutputFile = "/tmp/testSortOutput.csv"
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        for filename in [self.InputFile, self.OutputFile]:
+            if exists(filename):
+                unlink(filename)
+
+    def test_sortFile(self):
+        random = Random(42)
+        rows = [[random.randint(0, 100), "row %d" % index]
+                for index in range(2000)]
+        self.__writeFile(["id,name"] + ["%s,%s" % tuple(row) for row in rows])
+
+        expected = sorted(rows, key=lambda row: row[0])
+
+        # Small memory limits create many runs which are merged
+        for memoryLimit in [10 ** 9, 1000]:
+            sortFile(self.InputFile, self.OutputFile, "id",
+                     schema={"id": int}, memoryLimit=memoryLimit)
+
+            csv = icsv.fromFile(self.OutputFile, schema={"id": int})
+            self.assertEqual([row.list() for row in csv.data()], expected)
+
+        # Descending order, comparing strings
+        sortFile(self.InputFile, self.OutputFile, ["id", "name"],
+                 reverse=True, memoryLimit=1000)
+        csv = icsv.fromFile(self.OutputFile)
+        expected = sorted(([str(i), n] for i, n in rows), reverse=True)
+        self.assertEqual([row.list() for row in csv.data()], expected)
+
+    def test_missingValues(self):
+        self.__writeFile(["a,b", "3,x", ",y", "1,z", "2.5,w"])
+
+        sortFile(self.InputFile, self.OutputFile, "a", schema={"a": float},
+                 memoryLimit=4)
+        csv = icsv.fromFile(self.OutputFile)
+        self.assertEqual(csv.getCol("b").data(), ["z", "w", "x", "y"])
+
+        sortFile(self.InputFile, self.OutputFile, "a", schema={"a": float},
+                 reverse=True, memoryLimit=4)
+        csv = icsv.fromFile(self.OutputFile)
+        self.assertEqual(csv.getCol("b").data(), ["x", "w", "z", "y"])
+
+        self.assertRaises(Exception, sortFile, self.InputFile,
+                          self.OutputFile, "c")
+
+    def test_memoryLimit(self):
+        self.__writeFile(["id,name"] + ["%d,row %d" % ((i * 7919) % 20000, i)
+                                        for i in range(20000)])
+
+        # Several runs are merged, without using much more than the limit
+        start()
+        try:
+            sortFile(self.InputFile, self.OutputFile, "id",
+                     schema={"id": int}, memoryLimit=1024 * 1024)
+            _, peak = get_traced_memory()
+        finally:
+            stop()
+
+        self.assertTrue(peak < 2 * 1024 * 1024)
+
+        csv = icsv.fromFile(self.OutputFile, schema={"id": int})
+        self.assertEqual(list(csv.getCol("id").data()), list(range(20000)))
+
+    ##### Private helper functions
+
+    def __writeFile(self, lines):
+        fd = open(self.InputFile, 'w')
+        fd.write('\n'.join(lines) + '\n')
+        fd.close()
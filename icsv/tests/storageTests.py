@@ -0,0 +1,178 @@
+from unittest import TestCase
+
+from icsv import icsv, Row, Writer
+
+
+class StorageTests(TestCase):
+    Storages = ["row", "column"]
+
+    def setUp(self):
+        pass
+
+    def test_invalidStorage(self):
+        self.assertRaises(Exception, icsv, ["a"], ',', "unknown")
+
+    def test_addRow(self):
+        for storage in self.Storages:
+            csv = icsv(["a", "b", "c"], storage=storage)
+            self.assertEqual(csv.storage(), storage)
+
+            csv.addRow([1, 2, 3])
+            csv.addRow({"c": 6, "a": 4})
+            self.assertEqual(csv.numRows(), 2)
+
+            self.assertEqual(csv.getRow(0).list(), [1, 2, 3])
+            self.assertEqual(csv.getRow().list(), [4, '', 6])
+            self.assertEqual(str(csv.getRow()), "4,,6")
+            self.assertEqual(csv.getRow()["a"], 4)
+            self.assertTrue(isinstance(csv.data()[0], Row))
+
+            self.assertEqual(csv.getCol("a").data(), [1, 4])
+            self.assertEqual(csv.getCol("b").data(), [2, ''])
+            self.assertEqual(csv.getCell(1, "c").value(), 6)
+
+    def test_setCellRemoveRow(self):
+        for storage in self.Storages:
+            csv = icsv(["a", "b"], storage=storage)
+            csv.addRow([1, 2])
+            csv.addRow([3, 4])
+            csv.addRow([5, 6])
+
+            csv.setCell("b", 10)
+            csv.setCell("a", 7, 0)
+            self.assertEqual(csv.getCol("a").data(), [7, 3, 5])
+            self.assertEqual(csv.getCol("b").data(), [2, 4, 10])
+
+            csv.removeRow(1)
+            self.assertEqual(csv.numRows(), 2)
+            self.assertEqual(csv.getCol("a").data(), [7, 5])
+            self.assertEqual(str(csv), "a,b\n7,2\n5,10")
+
+            csv.removeRow()
+            csv.removeRow()
+            self.assertEqual(csv.numRows(), 0)
+            self.assertRaises(Exception, csv.removeRow)
+
+    def test_filterMap(self):
+        for storage in self.Storages:
+            csv = icsv(["a", "b"], storage=storage)
+            csv.addRow([1, 2])
+            csv.addRow([3, 4])
+
+            cells = csv.filter(lambda r, h, v: v > 1)
+            self.assertEqual([(c.row(), c.header()) for c in cells],
+                             [(0, "b"), (1, "a"), (1, "b")])
+
+            mapped = csv.map(lambda r, h, v: v * 10)
+            self.assertEqual(mapped.storage(), storage)
+            self.assertEqual(mapped.getCol("a").data(), [10, 30])
+            self.assertEqual(csv.getCol("a").data(), [1, 3])
+
+            csv.map(lambda r, h, v: v + r, overwrite=True)
+            self.assertEqual(csv.getCol("b").data(), [2, 5])
+
+    def test_mapHeaders(self):
+        for storage in self.Storages:
+            csv = icsv(["a", "b", "c"], storage=storage)
+            csv.addRow([1, 2, 3])
+            csv.addRow([4, 5, 6])
+
+            calls = []
+
+            def double(r, h, v):
+                calls.append(h)
+                return v * 2
+
+            # Only the requested columns are mapped
+            mapped = csv.map(double, headers=["b"])
+            self.assertEqual(calls, ["b", "b"])
+            self.assertEqual(mapped.getCol("b").data(), [4, 10])
+            self.assertEqual(mapped.getCol("a").data(), [1, 4])
+            self.assertEqual(csv.getCol("b").data(), [2, 5])
+
+            # Changing either CSV does not change the other
+            mapped.setCell("a", 7, 0)
+            csv.setCell("c", 8, 1)
+            mapped.addRow([0, 0, 0])
+            csv.removeRow(0)
+            self.assertEqual(str(mapped), "a,b,c\n7,4,3\n4,10,6\n0,0,0")
+            self.assertEqual(str(csv), "a,b,c\n4,5,8")
+
+            csv.map(double, overwrite=True, headers=["a", "c"])
+            self.assertEqual(str(csv), "a,b,c\n8,5,16")
+
+            self.assertRaises(Exception, csv.map, double, False, ["d"])
+
+    def test_mapCol(self):
+        for storage in self.Storages:
+            csv = icsv(["a", "b"], storage=storage)
+            csv.addRow([1, 2])
+            csv.addRow([3, 4])
+
+            mapped = csv.mapCol("a", lambda values: [v + 1 for v in values])
+            self.assertEqual(mapped.getCol("a").data(), [2, 4])
+            self.assertEqual(csv.getCol("a").data(), [1, 3])
+
+            mapped = csv.mapCol("b", lambda values: map(str, values))
+            self.assertEqual(mapped.getCol("b").data(), ["2", "4"])
+
+            csv.mapCol("b", lambda values: [0, 0], overwrite=True)
+            self.assertEqual(csv.getCol("b").data(), [0, 0])
+
+            self.assertRaises(Exception, csv.mapCol, "a",
+                              lambda values: [0])
+
+    def test_getColView(self):
+        for storage in self.Storages:
+            csv = icsv(["a"], storage=storage)
+            csv.addRows([[1], [2]])
+
+            # The column data is a read only view of the values
+            data = csv.getCol("a").data()
+            self.assertFalse(hasattr(data, "append"))
+            self.assertFalse(hasattr(data, "__setitem__"))
+            self.assertEqual(data, [1, 2])
+            self.assertEqual(data[-1], 2)
+            self.assertEqual(list(data), [1, 2])
+            self.assertNotEqual(data, [1, 3])
+            self.assertEqual(csv.numRows(), 2)
+
+            # Slices are copies of the values
+            data[:].append(3)
+            self.assertEqual(data, [1, 2])
+
+    def test_mapColCopy(self):
+        def change(values):
+            values[0] = 100
+            return values
+
+        for storage in self.Storages:
+            csv = icsv(["a"], storage=storage, schema={"a": int})
+            csv.addRows([[1], [2]])
+
+            # Functions which change their argument do not change the CSV
+            mapped = csv.mapCol("a", change)
+            csv.filterCol("a", lambda values: change(values) and [1, 1])
+            self.assertEqual(list(mapped.getCol("a").data()), [100, 2])
+            self.assertEqual(list(csv.getCol("a").data()), [1, 2])
+
+    def test_fromFile(self):
+        filename = "/tmp/testCsv.csv"
+
+        csv = icsv(["a", "b", "c"])
+        csv.addRow([1, 2, 3])
+        csv.addRow([4, 5, 6])
+        csv.write(filename).close()
+
+        rows = icsv.fromFile(filename)
+        cols = icsv.fromFile(filename, storage="column")
+        self.assertEqual(cols.storage(), "column")
+        self.assertEqual(cols.numRows(), rows.numRows())
+
+        for header in rows.headers():
+            self.assertEqual(cols.getCol(header).data(),
+                             rows.getCol(header).data())
+
+        # Writing column storage produces the same file
+        Writer.fromCsv(filename, cols).close()
+        self.assertEqual(str(icsv.fromFile(filename)), str(rows))
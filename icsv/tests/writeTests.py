@@ -110,6 +110,110 @@ class WriteTests(TestCase):
             ]
         self.__verifyFileLines(filename, expectedLines)
 
+    def test_flushRows(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = Writer(filename, ["a", "b"], flushRows=2)
+        writer.writeRow([0, 1])
+
+        # Nothing has been flushed yet
+        self.assertEqual(self.__readFile(filename), [""])
+
+        writer.writeRow([2, 3])
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1", "2,3"])
+
+        writer.writeRow([4, 5])
+        self.assertEqual(len(self.__readFile(filename)), 3)
+
+        writer.flush()
+        self.assertEqual(len(self.__readFile(filename)), 4)
+        writer.close()
+
+    def test_flushBytes(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = Writer(filename, ["a", "b"], flushRows=None, flushBytes=12)
+        writer.writeRow([0, 1])
+        self.assertEqual(self.__readFile(filename), [""])
+
+        # Headers and two rows is 12 bytes
+        writer.writeRow([2, 3])
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1", "2,3"])
+        writer.close()
+
+    def test_flushInterval(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = Writer(filename, ["a", "b"], flushRows=None,
+                        flushInterval=0)
+        writer.writeRow([0, 1])
+        self.assertEqual(self.__readFile(filename), ["a,b", "0,1"])
+        writer.close()
+
+    def test_contextManager(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        with Writer(filename, ["a", "b"], flushRows=None) as writer:
+            for index in range(100):
+                writer.writeRow([index, index + 1])
+            self.assertFalse(writer.closed())
+
+        self.assertTrue(writer.closed())
+        content = self.__readFile(filename)
+        self.assertEqual(len(content), 101)
+        self.assertEqual(content[-1], "99,100")
+
+        # Cannot write once closed
+        self.assertRaises(Exception, writer.writeRow, [0, 1])
+
+    def test_writeRows(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = Writer(filename, ["a", "b"])
+        writer.writeRows([[0, 1], (2, 3), {"b": 5}])
+        self.assertEqual(self.__readFile(filename),
+                         ["a,b", "0,1", "2,3", ",5"])
+
+        writer.writeRows([i, i + 1] for i in range(3))
+        writer.writeRow([7, 8])
+        self.assertEqual(self.__readFile(filename)[-4:],
+                         ["0,1", "1,2", "2,3", "7,8"])
+
+        # Nothing is written for invalid batches
+        self.assertRaises(Exception, writer.writeRows, [[0, 1], [0]])
+        self.assertEqual(len(self.__readFile(filename)), 8)
+        writer.close()
+
+    def test_fromCsvBatches(self):
+        filename = "/tmp/test.csv"
+        csv = icsv(["a", "b"])
+        csv.addRows([i, i * 2] for i in range(25000))
+
+        Writer.fromCsv(filename, csv).close()
+        content = self.__readFile(filename)
+        self.assertEqual(len(content), 25001)
+        self.assertEqual(content[-1], "24999,49998")
+
+    def test_keepRows(self):
+        filename = "/tmp/test.csv"
+        self.__deleteFile(filename)
+
+        writer = Writer(filename, ["a", "b"], keepRows=False)
+        writer.writeRow([0, 1])
+        writer.writeRows([i, i + 1] for i in range(1, 3))
+        self.assertEqual(self.__readFile(filename),
+                         ["a,b", "0,1", "1,2", "2,3"])
+
+        # Written rows are no longer kept in memory
+        self.assertEqual(str(writer), "a,b")
+        self.assertEqual(writer.filename(), filename)
+        writer.close()
+
     ##### Private helper functions
 
     def __verifyFileLines(self, filename, expectedLines):
@@ -1,6 +1,9 @@
 from copy import deepcopy
 from os.path import exists
+from time import monotonic
 
+from icsv.compression import compressionFromFilename, openFile, \
+    validateCompression
 from icsv.instantCsv import icsv
 
 
@@ -13,10 +16,34 @@ class Writer:
     The Writer class provides a wrapper to the :class:`icsv.icsv` class which
     will immediately write new rows to the CSV file.
 
+    Rows can be written one at a time with :func:`icsv.Writer.writeRow`, or
+    in batches with :func:`icsv.Writer.writeRows`, which validates and
+    writes the entire batch at once.
+
+    A single buffered file handle is held open for the lifetime of the
+    writer. The buffered data is flushed to the file according to the
+    ``flushRows``, ``flushBytes``, and ``flushInterval`` policies, whenever
+    :func:`icsv.Writer.flush` is called, and when the writer is closed. The
+    Writer can also be used as a context manager which closes the file
+    on exit::
+
+        with Writer("/tmp/test.csv", headers, flushRows=None) as writer:
+            writer.writeRow([0, 1, 2])
+
+    Files whose names end with .gz, .bz2, or .xz are compressed with gzip,
+    bzip2, or xz as they are written. Every flush of a compressed file ends
+    the current compressed block, so by default compressed files are not
+    flushed after every row.
+
     '''
 
+    # Maximum number of rows formatted into a single write
+    BatchSize = 10000
+
     def __init__(self, filename, headers, delimiter=',',
-                 useHeaders=True, overwrite=True):
+                 useHeaders=True, overwrite=True, flushRows="auto",
+                 flushBytes=None, flushInterval=None, bufferSize=65536,
+                 keepRows=True, compression=None, compressionLevel=None):
         '''
         :param filename: The filename for the CSV file to write
         :type filename: string
@@ -29,11 +56,41 @@ class Writer:
         :type useHeaders: bool
         :param overwrite: True will overwrite existing files, False will not
         :type overwrite: bool
+        :param flushRows: Flush the file after this many rows have been
+                          written, None to disable. The default ("auto")
+                          flushes every row of an uncompressed file so that
+                          it is immediately visible in the file, and is
+                          disabled for compressed files
+        :type flushRows: int
+        :param flushBytes: Flush the file after this many bytes have been
+                           written, None to disable
+        :type flushBytes: int
+        :param flushInterval: Flush the file when this many seconds have passed
+                              since the last flush, None to disable
+        :type flushInterval: float
+        :param bufferSize: The size (in bytes) of the file write buffer
+        :type bufferSize: int
+        :param keepRows: True keeps all written rows in memory, False
+                         discards rows once they have been written, which
+                         keeps the memory used by long running writers
+                         constant
+        :type keepRows: bool
+        :param compression: The compression to use ("gz", "bz2", or "xz"),
+                            or None to determine it from the file extension
+        :type compression: string
+        :param compressionLevel: The compression level, or None to use the
+                                 default level of the compression
+        :type compressionLevel: int
 
         :raises Exception: If ``overwrite`` is False, and the file already
                            exists
+        :raises Exception: If an unknown compression is given
 
         '''
+        # The file is opened on the first write
+        self.__fd = None
+        self.__closed = False
+
         self.__filename = filename
         self.__csv = icsv(headers, delimiter)
         self.__useHeaders = useHeaders
@@ -43,10 +100,35 @@ class Writer:
             raise Exception("Filename %s exists, and overwrite is disabled" %
                             filename)
 
+        self.__flushBytes = flushBytes
+        self.__flushInterval = flushInterval
+        self.__bufferSize = bufferSize
+        self.__keepRows = keepRows
+
+        if compression is None:
+            compression = compressionFromFilename(filename)
+        validateCompression(compression)
+
+        self.__compression = compression
+        self.__compressionLevel = compressionLevel
+
+        if flushRows == "auto":
+            flushRows = 1 if compression is None else None
+        self.__flushRows = flushRows
+
+        # Total amount of text written to the file
+        self.__bytesWritten = 0
+
+        # Amount of data written since the last flush
+        self.__pendingRows = 0
+        self.__pendingBytes = 0
+        self.__lastFlush = monotonic()
+
         self.__firstWrite = True
 
     @classmethod
-    def fromCsv(cls, filename, csv, useHeaders=True, overwrite=True):
+    def fromCsv(cls, filename, csv, useHeaders=True, overwrite=True,
+                compressionLevel=None):
         '''Write the data to the given CSV file.
 
         :param filename: The path to the CSV filename
@@ -57,21 +139,44 @@ class Writer:
         :param overwrite: True to overwrite existing files, False will
                           result in an Exception
         :type overwrite: bool
+        :param compressionLevel: The compression level used for compressed
+                                 files, or None to use the default level
+        :type compressionLevel: int
 
         :raises Exception: If ``overwrite`` is False, and the file already
                            exists
 
         '''
         writer = Writer(filename, csv.headers(), csv.delimiter(), useHeaders,
-                        overwrite)
+                        overwrite, compressionLevel=compressionLevel)
         writer.__csv = csv
 
-        # Write the current CSV rows to the file
-        for index in range(csv.numRows()):
-            writer.__writeRow(index)
+        # Write the current CSV rows to the file, and flush them all at once
+        numRows = csv.numRows()
+        for start in range(0, numRows, cls.BatchSize):
+            writer.__writeRows(start, min(start + cls.BatchSize, numRows))
+        writer.flush()
 
         return writer
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __del__(self):
+        # Make sure buffered rows are written if the writer is never closed
+        self.close()
+
+    def filename(self):
+        '''Get the path to the CSV file.
+
+        :rtype: string
+
+        '''
+        return self.__filename
+
     def headers(self):
         '''Get the list of headers for this CSV file.
 
@@ -111,41 +216,147 @@ class Writer:
 
         '''
         self.__csv.addRow(items)
-        self.__writeRow()
+
+        numRows = self.__csv.numRows()
+        self.__writeRows(numRows - 1, numRows)
+        self.__discardRows()
+        self.__applyFlushPolicy()
+
+    def writeRows(self, rows):
+        '''Write several rows of data to the CSV at once.
+
+        ``rows`` can be any iterable (such as a list or a generator) of rows,
+        where each row can be a list, tuple, or dictionary of values. The
+        rows are validated before any of them are written, and are then
+        written to the file in large batches.
+
+        :param rows: The iterable of rows
+        :type rows: iterable of lists, tuples, or dictionaries
+
+        :raises Exception: If a list or tuple row is not equal to the
+                           number of headers
+        :raises Exception: If a dictionary row contains entries for
+                           unknown headers
+        :raises Exception: If a row is not a list, tuple, or dictionary
+
+        '''
+        start = self.__csv.numRows()
+        self.__csv.addRows(rows)
+        numRows = self.__csv.numRows()
+
+        for batchStart in range(start, numRows, self.BatchSize):
+            self.__writeRows(batchStart,
+                             min(batchStart + self.BatchSize, numRows))
+            self.__applyFlushPolicy()
+
+        self.__discardRows()
+
+    def bytesWritten(self):
+        '''Get the number of characters written to the CSV file, including
+        the headers line.
+
+        :rtype: int
+
+        '''
+        return self.__bytesWritten
+
+    def flush(self):
+        '''Flush all buffered rows to the CSV file.'''
+        if self.__fd is not None:
+            self.__fd.flush()
+
+        self.__pendingRows = 0
+        self.__pendingBytes = 0
+        self.__lastFlush = monotonic()
+
+    def close(self):
+        '''Flush all buffered rows and close the CSV file.
+
+        No more rows can be written once the writer has been closed.
+
+        '''
+        if self.__fd is not None:
+            self.__fd.close()
+            self.__fd = None
+
+        self.__closed = True
+
+    def closed(self):
+        '''Determine if this writer has been closed.
+
+        :rtype: bool
+
+        '''
+        return self.__closed
 
     ##### Private functions
 
-    def __writeRow(self, index=-1):
-        '''Write the given row to the CSV file.
+    def __writeRows(self, start, stop):
+        '''Write a range of rows to the CSV file with a single write.
 
-        :param index: The row index
-        :type index: int
+        :param start: The index of the first row
+        :type start: int
+        :param stop: The index after the last row
+        :type stop: int
 
         '''
+        lines = []
+
         # Write the headers if this is the first time
         if self.__firstWrite and self.__useHeaders:
-            headers = self.__csv.getHeaders()
-            self.__writeRowToFile(headers)
+            lines.append(self.__csv.getHeaders())
+
+        lines.extend(map(str, self.__csv.data()[start:stop]))
+        lines.append('')
 
-        # Write the most recent row to the file
-        row = self.__csv.getRow(index)
-        self.__writeRowToFile(row)
+        self.__writeToFile('\n'.join(lines))
+        self.__pendingRows += stop - start
 
-    def __writeRowToFile(self, row):
-        '''Write the given :class:`icsv.Row` to the CSV file.
+    def __writeToFile(self, text):
+        '''Write text to the CSV file.
 
-        :param row: The row
-        :type row: A :class:`icsv.Row` object
+        :param text: The text
+        :type text: string
+
+        :raises Exception: If the writer has been closed
 
         '''
-        mode = 'w' if self.__firstWrite and self.__overwrite else 'a'        
-        fd = open(self.__filename, mode)
-        fd.write("%s\n" % str(row))
-        fd.close()
+        if self.__closed:
+            raise Exception("Cannot write to closed file: %s" %
+                            self.__filename)
+
+        if self.__fd is None:
+            mode = 'w' if self.__overwrite else 'a'
+            self.__fd = openFile(self.__filename, mode, self.__compression,
+                                 self.__compressionLevel, self.__bufferSize)
+
+        self.__fd.write(text)
+        self.__bytesWritten += len(text)
+        self.__pendingBytes += len(text)
 
         # The file has been writen to at least once
         self.__firstWrite = False
 
+    def __discardRows(self):
+        '''Discard the rows that have been written, unless they are being
+        kept in memory.
+
+        '''
+        if not self.__keepRows:
+            self.__csv = icsv(self.__csv.headers(), self.__csv.delimiter())
+
+    def __applyFlushPolicy(self):
+        '''Flush the CSV file if any of the flush policies have been met.'''
+        if self.__flushRows is not None and \
+                self.__pendingRows >= self.__flushRows:
+            self.flush()
+        elif self.__flushBytes is not None and \
+                self.__pendingBytes >= self.__flushBytes:
+            self.flush()
+        elif self.__flushInterval is not None and \
+                (monotonic() - self.__lastFlush) >= self.__flushInterval:
+            self.flush()
+
     def __str__(self):
         '''Convert the CSV data to a string.'''
         return str(self.__csv)